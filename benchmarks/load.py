@@ -0,0 +1,578 @@
+"""
+Load-test the frame endpoints and report throughput and latency percentiles.
+
+A fixed number of concurrent workers send a weighted mix of requests
+(GET /frames/{frame_id}, POST /frames/by-depth, POST /frames/by-ids and
+GET /frames/count) back to back for a set duration. Depth ranges and color
+maps are drawn from configurable distributions.
+
+The target is either a running server (--url) or main.app in-process over
+httpx's ASGI transport. In-process runs use a throwaway SQLite database
+seeded with synthetic frames (needs aiosqlite), or --database-url, e.g. a
+local PostgreSQL database. Throughput, latency percentiles and histograms,
+payload sizes and error rates per endpoint are written as JSON. Given a
+baseline from an earlier run, endpoints whose throughput fell or whose p95
+latency rose by more than the tolerance are reported and the exit code is 1.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+
+sys.path.append(str(Path(__file__).parent.parent))
+from benchmarks.synthetic import synthetic_frames
+from src.core.metrics import LATENCY_BUCKETS
+
+DEFAULT_OUTPUT = Path(__file__).parent / "load-results.json"
+API_PREFIX = "/api/v1"
+SEED_CHUNK_SIZE = 10000
+ENDPOINTS = ("by_id", "by_depth", "by_ids", "count")
+PERCENTILES = (50, 90, 95, 99)
+
+# (endpoint, method, path, httpx request keyword arguments)
+Request = Tuple[str, str, str, dict]
+Distribution = Callable[[random.Random], float]
+
+
+@dataclass
+class Sample:
+    """Outcome of one request."""
+
+    endpoint: str
+    started: float
+    seconds: float
+    status: str
+    size: int
+
+
+@dataclass
+class Dataset:
+    """Frames of the target, as reported by GET /frames/count."""
+
+    frames: int
+    first_depth: float
+    last_depth: float
+
+    @property
+    def depth_step(self) -> float:
+        """Average depth between neighboring frames."""
+        return (self.last_depth - self.first_depth) / max(self.frames - 1, 1)
+
+
+def parse_mix(spec: str) -> Dict[str, float]:
+    """
+    Parse a request mix such as ``by_id=3,by_depth=1``.
+
+    Args:
+        spec: Comma-separated endpoint=weight pairs
+
+    Returns:
+        Dict[str, float]: Weight per endpoint
+    """
+    mix = {}
+    for part in spec.split(","):
+        endpoint, _, weight = part.partition("=")
+        if endpoint not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(
+                f"Unknown endpoint {endpoint!r}, expected one of {', '.join(ENDPOINTS)}"
+            )
+        mix[endpoint] = float(weight or 1)
+    return mix
+
+
+def parse_distribution(spec: str) -> Distribution:
+    """
+    Parse a distribution of frames per range.
+
+    Args:
+        spec: ``fixed:N``, ``uniform:LOW:HIGH`` or ``lognormal:MEDIAN:SIGMA``
+
+    Returns:
+        Distribution: Draws a value from a random generator
+    """
+    kind, *params = spec.split(":")
+    try:
+        values = [float(param) for param in params]
+        if kind == "fixed" and len(values) == 1:
+            return lambda rng: values[0]
+        if kind == "uniform" and len(values) == 2:
+            return lambda rng: rng.uniform(*values)
+        if kind == "lognormal" and len(values) == 2:
+            median, sigma = values
+            return lambda rng: rng.lognormvariate(np.log(median), sigma)
+    except ValueError:
+        pass
+    raise argparse.ArgumentTypeError(
+        f"Invalid distribution {spec!r}, expected fixed:N, uniform:LOW:HIGH "
+        "or lognormal:MEDIAN:SIGMA"
+    )
+
+
+class Scenario:
+    """Draws the requests of a run from the configured mix and distributions."""
+
+    def __init__(self, args: argparse.Namespace, dataset: Dataset):
+        self.args = args
+        self.dataset = dataset
+        self.endpoints = list(args.mix)
+        self.weights = list(args.mix.values())
+        self.headers = {"accept": args.accept}
+        self.id_range = args.ids or (1, dataset.frames)
+        self.span = parse_distribution(args.span)
+        # A small pool of ranges stands in for many clients viewing the same logs
+        rng = random.Random(args.seed)
+        self.ranges = [self._random_range(rng) for _ in range(args.distinct_ranges)]
+
+    def _random_range(self, rng: random.Random) -> Tuple[float, float, str]:
+        """Depth range of a drawn number of frames at a uniform start."""
+        step = self.dataset.depth_step
+        span = max(self.span(rng), 1.0) * step
+        depth_min = rng.uniform(
+            self.dataset.first_depth, max(self.dataset.last_depth - span, 0.0)
+        )
+        return depth_min, depth_min + span, rng.choice(self.args.color_maps)
+
+    def _range(self, rng: random.Random) -> Tuple[float, float, str]:
+        if self.ranges:
+            return rng.choice(self.ranges)
+        return self._random_range(rng)
+
+    def next(self, rng: random.Random) -> Request:
+        """Draw the next request."""
+        endpoint = rng.choices(self.endpoints, self.weights)[0]
+        if endpoint == "by_id":
+            frame_id = rng.randint(*self.id_range)
+            return endpoint, "GET", f"/frames/{frame_id}", {"headers": self.headers}
+        if endpoint == "by_ids":
+            count = min(self.args.batch_ids, self.id_range[1] - self.id_range[0] + 1)
+            ids = rng.sample(range(self.id_range[0], self.id_range[1] + 1), count)
+            body = {"ids": ids, "color_map": rng.choice(self.args.color_maps)}
+            return endpoint, "POST", "/frames/by-ids", {"json": body}
+
+        depth_min, depth_max, color_map = self._range(rng)
+        if endpoint == "count":
+            params = {"depth_min": depth_min, "depth_max": depth_max}
+            return endpoint, "GET", "/frames/count", {"params": params}
+        body = {"depth_min": depth_min, "depth_max": depth_max, "color_map": color_map}
+        if self.args.page_size:
+            body["limit"] = self.args.page_size
+        return (
+            endpoint,
+            "POST",
+            "/frames/by-depth",
+            {
+                "json": body,
+                "headers": self.headers,
+            },
+        )
+
+
+async def discover_dataset(client: httpx.AsyncClient) -> Dataset:
+    """Read the frame count and depth bounds of the target."""
+    response = await client.get(
+        f"{API_PREFIX}/frames/count",
+        params={"depth_min": -sys.float_info.max, "depth_max": sys.float_info.max},
+    )
+    response.raise_for_status()
+    estimate = response.json()
+    if not estimate["frames"]:
+        raise SystemExit("The target holds no frames; seed it with --seed-rows")
+    return Dataset(
+        frames=estimate["frames"],
+        first_depth=estimate["first_depth"],
+        last_depth=estimate["last_depth"],
+    )
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    rng: random.Random,
+    deadline: float,
+    budget: List[int],
+    samples: List[Sample],
+) -> None:
+    """Send requests back to back until the deadline or the request budget."""
+    while time.perf_counter() < deadline and budget[0] != 0:
+        budget[0] -= 1
+        endpoint, method, path, kwargs = scenario.next(rng)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, API_PREFIX + path, **kwargs)
+            status, size = str(response.status_code), len(response.content)
+        except httpx.HTTPError as e:
+            status, size = type(e).__name__, 0
+        samples.append(
+            Sample(endpoint, started, time.perf_counter() - started, status, size)
+        )
+
+
+async def run_load(client: httpx.AsyncClient, args: argparse.Namespace) -> dict:
+    """
+    Run the load test against a client and summarize it.
+
+    Args:
+        client: Client of the target
+        args: Parsed command line
+
+    Returns:
+        dict: Summary per endpoint and over all requests
+    """
+    dataset = await discover_dataset(client)
+    scenario = Scenario(args, dataset)
+    samples: List[Sample] = []
+    start = time.perf_counter()
+    measure_from = start + args.warmup
+    deadline = measure_from + args.duration
+    # Shared by the workers; -1 means no limit
+    budget = [args.requests or -1]
+    await asyncio.gather(
+        *(
+            worker(
+                client,
+                scenario,
+                random.Random(args.seed + i),
+                deadline,
+                budget,
+                samples,
+            )
+            for i in range(args.concurrency)
+        )
+    )
+    end = time.perf_counter()
+
+    measured = [sample for sample in samples if sample.started >= measure_from]
+    seconds = end - max(measure_from, start)
+    return {
+        "dataset": vars(dataset),
+        "seconds": seconds,
+        "warmup_requests": len(samples) - len(measured),
+        "endpoints": {
+            endpoint: summarize(
+                [sample for sample in measured if sample.endpoint == endpoint],
+                seconds,
+            )
+            for endpoint in args.mix
+        },
+        "all": summarize(measured, seconds),
+    }
+
+
+def summarize(samples: List[Sample], seconds: float) -> dict:
+    """
+    Throughput, latency and payload statistics of a set of requests.
+
+    Args:
+        samples: Requests to summarize
+        seconds: Measured wall-clock time
+
+    Returns:
+        dict: JSON-ready statistics; errors are responses other than 2xx and
+        304, and transport failures
+    """
+    statuses = Counter(sample.status for sample in samples)
+    errors = sum(
+        count
+        for status, count in statuses.items()
+        if not (status.startswith("2") or status == "304")
+    )
+    latencies = np.array([sample.seconds for sample in samples])
+    sizes = np.array([sample.size for sample in samples])
+    summary = {
+        "requests": len(samples),
+        "requests_per_s": len(samples) / seconds if seconds else 0.0,
+        "errors": errors,
+        "error_rate": errors / len(samples) if samples else 0.0,
+        "status": dict(sorted(statuses.items())),
+    }
+    if not samples:
+        return summary
+
+    counts = np.bincount(
+        np.searchsorted(LATENCY_BUCKETS, latencies, side="left"),
+        minlength=len(LATENCY_BUCKETS) + 1,
+    )
+    summary["latency_s"] = {
+        "mean": float(latencies.mean()),
+        **{
+            f"p{q}": float(value)
+            for q, value in zip(PERCENTILES, np.percentile(latencies, PERCENTILES))
+        },
+        "max": float(latencies.max()),
+    }
+    summary["latency_histogram"] = [
+        {"le": bound, "count": int(count)}
+        for bound, count in zip((*LATENCY_BUCKETS, "+Inf"), counts)
+    ]
+    summary["payload_bytes"] = {
+        "mean": float(sizes.mean()),
+        "p50": float(np.percentile(sizes, 50)),
+        "p95": float(np.percentile(sizes, 95)),
+        "max": int(sizes.max()),
+        "total": int(sizes.sum()),
+    }
+    summary["bytes_per_s"] = float(sizes.sum() / seconds) if seconds else 0.0
+    return summary
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> List[str]:
+    """
+    Compare throughput and p95 latency per endpoint against a baseline run.
+
+    Args:
+        report: Report of this run
+        baseline: Report of an earlier run
+        tolerance: Allowed change, e.g. 0.2 for 20%
+
+    Returns:
+        List[str]: One message per regressed endpoint
+    """
+    regressions = []
+    previous = baseline["results"]["endpoints"]
+    for endpoint, summary in report["results"]["endpoints"].items():
+        before = previous.get(endpoint)
+        if not before or "latency_s" not in before or "latency_s" not in summary:
+            continue
+        throughput = summary["requests_per_s"] / before["requests_per_s"]
+        p95 = summary["latency_s"]["p95"] / before["latency_s"]["p95"]
+        summary["baseline"] = {"throughput_ratio": throughput, "p95_ratio": p95}
+        if throughput < 1 - tolerance or p95 > 1 + tolerance:
+            regressions.append(
+                f"{endpoint}: {throughput:.2f}x the baseline requests/s, "
+                f"{p95:.2f}x its p95 latency"
+            )
+    return regressions
+
+
+def print_summary(results: dict) -> None:
+    """Print one line per endpoint and one for all requests."""
+    rows = {**results["endpoints"], "all": results["all"]}
+    for endpoint, summary in rows.items():
+        latency = summary.get("latency_s", {})
+        print(
+            f"{endpoint:<9} {summary['requests']:>7} req "
+            f"{summary['requests_per_s']:>9.1f} req/s "
+            f"p50={latency.get('p50', 0) * 1000:8.2f}ms "
+            f"p95={latency.get('p95', 0) * 1000:8.2f}ms "
+            f"p99={latency.get('p99', 0) * 1000:8.2f}ms "
+            f"errors={summary['error_rate']:.2%}"
+        )
+
+
+async def seed_database(rows: int, width: int) -> None:
+    """Create missing tables and append ``rows`` synthetic frames."""
+    from src.config.database import async_session, engine
+    from src.infrastructure.database.repositories import SQLAlchemyImageRepository
+    from src.infrastructure.database.schema import create_schema
+
+    async with engine.begin() as connection:
+        await connection.run_sync(create_schema)
+    depths, pixels = synthetic_frames(rows, width)
+    async with async_session() as session:
+        repository = SQLAlchemyImageRepository(session)
+        for start in range(0, rows, SEED_CHUNK_SIZE):
+            end = start + SEED_CHUNK_SIZE
+            await repository.copy_frames(depths[start:end], pixels[start:end])
+        await session.commit()
+
+
+async def run_in_process(args: argparse.Namespace) -> dict:
+    """Run the load test against main.app, started as uvicorn would."""
+    import logging
+
+    from main import app
+
+    # The app logs every request at INFO level
+    logging.getLogger().setLevel(logging.WARNING)
+    if args.seed_rows:
+        await seed_database(args.seed_rows, args.width)
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app),
+            base_url="http://load-test",
+            timeout=args.timeout,
+        ) as client:
+            return await run_load(client, args)
+
+
+async def run_remote(args: argparse.Namespace) -> dict:
+    """Run the load test against a running server."""
+    async with httpx.AsyncClient(
+        base_url=args.url,
+        timeout=args.timeout,
+        limits=httpx.Limits(max_connections=args.concurrency),
+    ) as client:
+        return await run_load(client, args)
+
+
+def git_commit() -> Optional[str]:
+    """Commit of the working tree, so reports can be matched to commits."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def settings_snapshot() -> dict:
+    """Settings of the in-process app that shape its performance."""
+    from src.config.settings import get_settings
+
+    settings = get_settings()
+    return {
+        name: getattr(settings, name)
+        for name in (
+            "FRAME_STORE_BACKEND",
+            "PROCESSING_BACKEND",
+            "PIXEL_DTYPE",
+            "PIXEL_CODEC",
+            "FRAME_CACHE_MAX_BYTES",
+            "MATERIALIZED_COLOR_MAPS",
+            "COALESCE_REQUESTS",
+        )
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="Base URL of a running server")
+    target.add_argument(
+        "--database-url",
+        help="Database of the in-process app (default: a seeded throwaway SQLite)",
+    )
+    parser.add_argument(
+        "--seed-rows",
+        type=int,
+        help="Synthetic frames to append before the run "
+        "(default: 10000 for the throwaway database, none otherwise)",
+    )
+    parser.add_argument("--width", type=int, default=150, help="Seeded frame width")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds")
+    parser.add_argument(
+        "--requests", type=int, help="Stop after this many requests, warmup included"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=1.0, help="Unmeasured seconds first"
+    )
+    parser.add_argument(
+        "--mix",
+        type=parse_mix,
+        default=parse_mix("by_id=3,by_depth=1"),
+        help="Weighted endpoints, e.g. by_id=3,by_depth=1,by_ids=1,count=1",
+    )
+    parser.add_argument(
+        "--span",
+        default="lognormal:100:1",
+        help="Frames per depth range: fixed:N, uniform:LOW:HIGH or "
+        "lognormal:MEDIAN:SIGMA (default lognormal:100:1)",
+    )
+    parser.add_argument(
+        "--distinct-ranges",
+        type=int,
+        default=0,
+        help="Draw ranges from a pool of this many, 0 for a new one per request",
+    )
+    parser.add_argument("--color-maps", nargs="+", default=["viridis"])
+    parser.add_argument(
+        "--accept", default="application/json", help="Accept of by-id and by-depth"
+    )
+    parser.add_argument("--page-size", type=int, help="by-depth limit")
+    parser.add_argument("--batch-ids", type=int, default=50, help="IDs per by-ids")
+    parser.add_argument(
+        "--ids",
+        type=int,
+        nargs=2,
+        metavar=("LOW", "HIGH"),
+        help="Frame ID range (default: 1 to the frame count)",
+    )
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=0, help="Random seed")
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, help="Report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+    try:
+        parse_distribution(args.span)
+    except argparse.ArgumentTypeError as e:
+        parser.error(str(e))
+
+    work_dir = None
+    if args.url:
+        database = None
+    else:
+        if args.database_url:
+            os.environ["DATABASE_URL"] = args.database_url
+        else:
+            # Never DATABASE_URL by accident: the run appends frames
+            work_dir = Path(tempfile.mkdtemp(prefix="frames-load-"))
+            os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{work_dir / 'load.db'}"
+            args.seed_rows = args.seed_rows or 10000
+        # Without SQL echo skewing the timings
+        os.environ["DEBUG"] = "false"
+        from sqlalchemy.engine import make_url
+
+        database = make_url(os.environ["DATABASE_URL"]).render_as_string(
+            hide_password=True
+        )
+
+    try:
+        if args.url:
+            results = asyncio.run(run_remote(args))
+        else:
+            results = asyncio.run(run_in_process(args))
+    finally:
+        if work_dir is not None:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+    config = {
+        key: value
+        for key, value in vars(args).items()
+        if key not in ("output", "baseline")
+    }
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "machine": platform.platform(),
+        "target": args.url or "in-process",
+        "database": database,
+        "settings": None if args.url else settings_snapshot(),
+        "config": config,
+        "results": results,
+        "regressions": [],
+    }
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        report["regressions"] = compare(report, baseline, args.tolerance)
+    args.output.write_text(json.dumps(report, indent=2))
+
+    print_summary(results)
+    for message in report["regressions"]:
+        print(f"REGRESSION {message}")
+    return 1 if report["regressions"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
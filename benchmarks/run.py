@@ -0,0 +1,358 @@
+"""
+Benchmark the hot stages of frame ingest and retrieval on synthetic data.
+
+Every selected stage is timed in isolation for each rows x width combination
+and the results are written as JSON. Given a baseline from an earlier run,
+median times are compared and the exit code is 1 when a stage got slower
+than the tolerance allows. Route stages need the aiosqlite package.
+"""
+import argparse
+import asyncio
+import functools
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.append(str(Path(__file__).parent.parent))
+# Route stages run against a throwaway SQLite database, never DATABASE_URL,
+# and without SQL echo skewing the timings
+WORK_DIR = Path(tempfile.mkdtemp(prefix="frames-bench-"))
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{WORK_DIR / 'bench.db'}"
+os.environ["DEBUG"] = "false"
+
+import numpy as np
+
+from benchmarks.synthetic import DEPTH_START, DEPTH_STEP, synthetic_frames, write_csv
+from src.api.renderers import frames_to_json
+from src.config.settings import get_settings
+from src.domain.entities.image import FrameBatch, ImageFrame
+from src.domain.services.color_map import COLOR_MAPS, CustomColorMap
+from src.infrastructure.database.repositories import SQLAlchemyImageRepository
+from src.infrastructure.services.frame_cache import ColoredFrame, frame_cache
+from src.infrastructure.services.image_processor import ImageProcessor
+
+DEFAULT_OUTPUT = Path(__file__).parent / "results.json"
+SOURCE_WIDTH = 200
+SEED_CHUNK_SIZE = 10000
+BY_ID_REQUESTS = 100
+
+Bench = Tuple[Callable[[], object], int]
+StoredRow = namedtuple("StoredRow", "id depth pixel_data dtype width codec")
+
+# One loop for every async stage, as database connections are bound to it
+loop = asyncio.new_event_loop()
+
+
+def bench_process_csv(rows: int, width: int) -> Bench:
+    """Parse a CSV and resample it to ``width`` with ImageProcessor."""
+    path = write_csv(WORK_DIR / f"frames-{rows}.csv", rows, SOURCE_WIDTH)
+    return (
+        lambda: loop.run_until_complete(ImageProcessor.process_csv(str(path), width)),
+        rows,
+    )
+
+
+def bench_frame_resize(rows: int, width: int) -> Bench:
+    """Resize frame by frame with ImageFrame.resize."""
+    depths, pixels = synthetic_frames(rows, SOURCE_WIDTH)
+    frames = [ImageFrame(depth=d, pixel_data=p) for d, p in zip(depths, pixels)]
+    return lambda: [frame.resize(width) for frame in frames], rows
+
+
+def bench_batch_resize(rows: int, width: int) -> Bench:
+    """Resize all frames at once with FrameBatch.resize."""
+    depths, pixels = synthetic_frames(rows, SOURCE_WIDTH)
+    batch = FrameBatch(depths=depths, pixels=pixels)
+    return lambda: batch.resize(width), rows
+
+
+def bench_encode(rows: int, width: int) -> Bench:
+    """Encode pixel blobs as the repository does when saving frames."""
+    repository = SQLAlchemyImageRepository(session=None)
+    _, pixels = synthetic_frames(rows, width)
+    return lambda: [repository._encode(row) for row in pixels], rows
+
+
+def bench_decode(rows: int, width: int) -> Bench:
+    """Decode stored rows into frames as the repository does when reading."""
+    repository = SQLAlchemyImageRepository(session=None)
+    depths, pixels = synthetic_frames(rows, width)
+    stored = [
+        StoredRow(id=i, depth=depth, **_stored_columns(repository._encode(row)))
+        for i, (depth, row) in enumerate(zip(depths, pixels))
+    ]
+    return lambda: [repository._to_frame(row) for row in stored], rows
+
+
+def bench_decode_batch(rows: int, width: int) -> Bench:
+    """Decode stored rows into one batch as the repository's range reads do."""
+    repository = SQLAlchemyImageRepository(session=None)
+    depths, pixels = synthetic_frames(rows, width)
+    stored = [
+        StoredRow(id=i, depth=depth, **_stored_columns(repository._encode(row)))
+        for i, (depth, row) in enumerate(zip(depths, pixels))
+    ]
+    return lambda: repository._to_batch(stored), rows
+
+
+def _stored_columns(encoded: dict) -> dict:
+    return {key: encoded[key] for key in ("pixel_data", "dtype", "width", "codec")}
+
+
+def bench_color_map(color_map: str, rows: int, width: int) -> Bench:
+    """Color-map a stacked (rows, width) matrix with CustomColorMap.apply."""
+    _, pixels = synthetic_frames(rows, width)
+    mapper = CustomColorMap(color_map)
+    return lambda: mapper.apply(pixels), rows
+
+
+def bench_serialize_json(rows: int, width: int) -> Bench:
+    """Serialize color-mapped frames through ImageResponse to JSON."""
+    depths, pixels = synthetic_frames(rows, width)
+    rgb = CustomColorMap().apply(pixels)
+    frames = [ColoredFrame(i, d, r) for i, (d, r) in enumerate(zip(depths, rgb))]
+    return lambda: frames_to_json(frames), rows
+
+
+async def _seed_database(rows: int, width: int) -> None:
+    """Recreate the benchmark database holding ``rows`` synthetic frames."""
+    from src.config.database import async_session, engine
+    from src.infrastructure.database.models import Base
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    depths, pixels = synthetic_frames(rows, width)
+    async with async_session() as session:
+        repository = SQLAlchemyImageRepository(session)
+        for start in range(0, rows, SEED_CHUNK_SIZE):
+            end = start + SEED_CHUNK_SIZE
+            await repository.copy_frames(depths[start:end], pixels[start:end])
+        await session.commit()
+    frame_cache.clear()
+
+
+@functools.lru_cache(maxsize=1)
+def _client(rows: int, width: int):
+    """HTTP client for the in-process app over a database of this size."""
+    import httpx
+
+    from main import app
+
+    # The app configures INFO logging of every request on import
+    logging.getLogger().setLevel(logging.WARNING)
+    loop.run_until_complete(_seed_database(rows, width))
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app), base_url="http://benchmark"
+    )
+
+
+def _by_depth_request(rows: int, width: int) -> Callable[[], object]:
+    client = _client(rows, width)
+    body = {
+        "depth_min": DEPTH_START,
+        "depth_max": DEPTH_START + rows * DEPTH_STEP,
+        "color_map": "viridis",
+    }
+
+    def request():
+        response = loop.run_until_complete(
+            client.post("/api/v1/frames/by-depth", json=body)
+        )
+        response.raise_for_status()
+
+    return request
+
+
+def bench_route_by_depth(rows: int, width: int) -> Bench:
+    """First page of POST /frames/by-depth as JSON, frame cache cleared."""
+    request = _by_depth_request(rows, width)
+
+    def uncached():
+        frame_cache.clear()
+        request()
+
+    return uncached, min(rows, get_settings().MAX_PAGE_SIZE)
+
+
+def bench_route_by_depth_cached(rows: int, width: int) -> Bench:
+    """First page of POST /frames/by-depth as JSON, served from the cache."""
+    request = _by_depth_request(rows, width)
+    request()
+    return request, min(rows, get_settings().MAX_PAGE_SIZE)
+
+
+def bench_route_by_id(rows: int, width: int) -> Bench:
+    """Sequential GET /frames/{frame_id} requests, frame cache cleared."""
+    client = _client(rows, width)
+    frame_ids = np.linspace(1, rows, BY_ID_REQUESTS, dtype=int)
+
+    async def requests():
+        frame_cache.clear()
+        for frame_id in frame_ids:
+            response = await client.get(f"/api/v1/frames/{frame_id}")
+            response.raise_for_status()
+
+    return lambda: loop.run_until_complete(requests()), len(frame_ids)
+
+
+STAGES: Dict[str, Callable[[int, int], Bench]] = {
+    "process_csv": bench_process_csv,
+    "frame_resize": bench_frame_resize,
+    "batch_resize": bench_batch_resize,
+    "encode": bench_encode,
+    "decode": bench_decode,
+    "decode_batch": bench_decode_batch,
+    **{
+        f"color_map:{name}": functools.partial(bench_color_map, name)
+        for name in COLOR_MAPS
+    },
+    "serialize_json": bench_serialize_json,
+    "route_by_depth": bench_route_by_depth,
+    "route_by_depth_cached": bench_route_by_depth_cached,
+    "route_by_id": bench_route_by_id,
+}
+
+
+def measure(func: Callable[[], object], repeat: int, warmup: int) -> List[float]:
+    """Run ``func`` and return the wall-clock seconds of each timed run."""
+    for _ in range(warmup):
+        func()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmarks(args: argparse.Namespace) -> List[dict]:
+    """Time every selected stage for every rows x width combination."""
+    stages = [
+        name
+        for name in STAGES
+        if not args.stages or any(name.startswith(p) for p in args.stages)
+    ]
+    results = []
+    for rows in args.rows:
+        for width in args.widths:
+            for name in stages:
+                func, units = STAGES[name](rows, width)
+                timings = measure(func, args.repeat, args.warmup)
+                median = statistics.median(timings)
+                results.append(
+                    {
+                        "stage": name,
+                        "rows": rows,
+                        "width": width,
+                        "units": units,
+                        "median_s": median,
+                        "min_s": min(timings),
+                        "units_per_s": units / median if median else None,
+                    }
+                )
+                print(
+                    f"{name:<28} rows={rows:<8} width={width:<5} "
+                    f"median={median * 1000:10.2f}ms "
+                    f"({units / median:,.0f} units/s)"
+                )
+    return results
+
+
+def compare(results: List[dict], baseline: dict, tolerance: float) -> List[str]:
+    """
+    Compare median times against a baseline run.
+
+    Args:
+        results: Results of this run
+        baseline: Report of an earlier run
+        tolerance: Allowed slowdown, e.g. 0.2 for 20%
+
+    Returns:
+        List[str]: One message per regressed stage
+    """
+    previous = {
+        (row["stage"], row["rows"], row["width"]): row["median_s"]
+        for row in baseline["results"]
+    }
+    regressions = []
+    for row in results:
+        before = previous.get((row["stage"], row["rows"], row["width"]))
+        if before is None:
+            continue
+        ratio = row["median_s"] / before
+        row["baseline_median_s"] = before
+        row["ratio"] = ratio
+        if ratio > 1 + tolerance:
+            regressions.append(
+                f"{row['stage']} rows={row['rows']} width={row['width']}: "
+                f"{ratio:.2f}x the baseline median"
+            )
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--widths", type=int, nargs="+", default=[150, 300])
+    parser.add_argument(
+        "--stages", nargs="+", help="Stage name prefixes, all stages by default"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=DEFAULT_OUTPUT)
+    parser.add_argument("--baseline", type=Path, help="Report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument(
+        "--save-baseline", type=Path, help="Also write this run as a baseline"
+    )
+    args = parser.parse_args()
+
+    try:
+        results = run_benchmarks(args)
+        regressions = []
+        if args.baseline:
+            baseline = json.loads(args.baseline.read_text())
+            regressions = compare(results, baseline, args.tolerance)
+
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.platform(),
+            "settings": {
+                "PIXEL_DTYPE": get_settings().PIXEL_DTYPE,
+                "PIXEL_CODEC": get_settings().PIXEL_CODEC,
+                "PROCESSING_BACKEND": get_settings().PROCESSING_BACKEND,
+            },
+            "repeat": args.repeat,
+            "results": results,
+            "regressions": regressions,
+        }
+        args.output.write_text(json.dumps(report, indent=2))
+        if args.save_baseline:
+            args.save_baseline.write_text(json.dumps(report, indent=2))
+    finally:
+        if "src.config.database" in sys.modules:
+            from src.config.database import engine
+
+            loop.run_until_complete(engine.dispose())
+        shutil.rmtree(WORK_DIR, ignore_errors=True)
+
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Synthetic frame generator for benchmarks.
+
+Frames look like a depth log: smooth bands drifting with depth plus noise,
+so compression and color mapping see realistic rather than white-noise data.
+"""
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+DEPTH_START = 9000.0
+DEPTH_STEP = 0.1
+
+
+def synthetic_frames(
+    rows: int, width: int, seed: int = 0
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Generate sorted depths and a grayscale pixel matrix.
+
+    Args:
+        rows: Number of frames
+        width: Pixels per frame
+        seed: Random seed, so runs are comparable
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (rows,) depths and (rows, width) float64
+        pixels in 0-255
+    """
+    rng = np.random.default_rng(seed)
+    depths = DEPTH_START + np.arange(rows) * DEPTH_STEP
+    columns = np.linspace(0, 4 * np.pi, width)
+    bands = np.sin(columns[np.newaxis, :] + depths[:, np.newaxis] / 5.0)
+    pixels = 127.5 + 100.0 * bands + rng.normal(0, 10, (rows, width))
+    return depths, np.clip(pixels, 0, 255)
+
+
+def write_csv(path: Path, rows: int, width: int, seed: int = 0) -> Path:
+    """
+    Write synthetic frames in the ingest CSV layout (depth, col1..colN).
+
+    Args:
+        path: Output file
+        rows: Number of frames
+        width: Pixel columns
+        seed: Random seed
+
+    Returns:
+        Path: The written file
+    """
+    depths, pixels = synthetic_frames(rows, width, seed)
+    header = ",".join(["depth", *(f"col{i}" for i in range(1, width + 1))])
+    np.savetxt(
+        path,
+        np.column_stack([depths, pixels]),
+        delimiter=",",
+        header=header,
+        comments="",
+        fmt="%.4f",
+    )
+    return path
@@ -4,5 +4,8 @@ set -e
 # Run the tests first
 pytest --maxfail=3 --disable-warnings tests/
 
+# Create or update the schema once, before any worker starts
+python scripts/init_db.py
+
 # If tests pass, start the FastAPI server
 uvicorn main:app --host 0.0.0.0 --port 8000
@@ -1,12 +1,22 @@
-from fastapi import FastAPI
+import asyncio
+import time
+
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 
+from src.api.dependencies import create_repository
+from src.api.pagination import NEXT_CURSOR_HEADER
 from src.api.routes import router
-from src.config.database import engine
+from src.config.database import async_session, engine, warm_up_pool
 from src.config.settings import get_settings
-from src.core.log_handlers import setup_logging
+from src.core.log_handlers import setup_logging, stop_logging
+from src.core.metrics import PROMETHEUS_MEDIA_TYPE, render_metrics
 from src.core.middleware import LoggingMiddleware
-from src.infrastructure.database.models import Base
+from src.domain.services.color_map import warm_luts
+from src.infrastructure.database.schema import create_schema
+from src.infrastructure.services.depth_index import depth_index
+from src.infrastructure.services.executor import processing_executor
+from src.infrastructure.services.ingest_jobs import ingest_jobs
 
 
 def create_app() -> FastAPI:
@@ -29,24 +39,58 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[NEXT_CURSOR_HEADER],
     )
     app.add_middleware(LoggingMiddleware)
     app.include_router(router, prefix="/api/v1")
 
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        # Prometheus text exposition of the in-process histograms
+        return Response(content=render_metrics(), media_type=PROMETHEUS_MEDIA_TYPE)
+
     @app.on_event("startup")
     async def startup():
-        # Create database tables
-        async with engine.begin() as conn:
-            await conn.run_sync(Base.metadata.create_all)
+        start_time = time.perf_counter()
+        # Schema changes normally run once per deploy via scripts/init_db.py
+        if settings.DB_CREATE_SCHEMA_ON_STARTUP:
+            async with engine.begin() as conn:
+                await conn.run_sync(create_schema)
+        await warm_up_pool(settings.DB_POOL_SIZE)
+        try:
+            async with async_session() as session:
+                index = await depth_index.get(create_repository(session))
+            logger.info("Depth index holds %s frames", len(index))
+        except Exception as e:
+            # Loaded by the first frame request instead
+            logger.warning("Depth index not loaded at startup: %s", e)
+        await ingest_jobs.start()
+        # Loads matplotlib in the background instead of on the first request;
+        # kept so shutdown waits for it and failures are logged
+        app.state.lut_warmup = asyncio.get_running_loop().run_in_executor(
+            None, warm_luts, settings.WARM_COLOR_MAPS
+        )
+        app.state.lut_warmup.add_done_callback(log_lut_warmup)
+        logger.info(
+            "Worker ready, startup took %.3fs", time.perf_counter() - start_time
+        )
+
+    def log_lut_warmup(future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is not None:
+            # Tables are compiled by the first request needing them instead
+            logger.warning("Color map warm-up failed: %s", future.exception())
 
     @app.on_event("shutdown")
     async def shutdown():
+        lut_warmup = getattr(app.state, "lut_warmup", None)
+        if lut_warmup is not None:
+            await asyncio.gather(lut_warmup, return_exceptions=True)
+        await ingest_jobs.stop()
+        processing_executor.shutdown()
         # Properly close the engine on shutdown
         await engine.dispose()
-        # Loop through all handlers and close them
-        for handler in logger.handlers:
-            logger.removeHandler(handler)
-            handler.close()
+        # Write out queued log records and close the handlers
+        stop_logging()
 
     return app
 
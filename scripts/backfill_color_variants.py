@@ -0,0 +1,135 @@
+"""
+Script to backfill the stored color-mapped renditions of frames.
+
+Ingest stores renditions for every color map in MATERIALIZED_COLOR_MAPS;
+run this after adding a color map to the setting to render the frames
+ingested before. Frames are read by primary key in batches and every batch
+is committed on its own, so an interrupted backfill resumes where it
+stopped when rerun.
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+from sqlalchemy import and_, delete, exists, select
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.config.database import async_session, engine
+from src.config.settings import get_settings
+from src.core.log_handlers import setup_logging
+from src.domain.services.color_map import CustomColorMap
+from src.infrastructure.database.codecs import decode_pixel_rows
+from src.infrastructure.database.models import ColorVariantModel, ImageModel
+from src.infrastructure.database.repositories import SQLAlchemyImageRepository
+
+
+async def backfill_color_map(
+    color_map: str, batch_size: int, replace: bool, logger: logging.Logger
+) -> int:
+    """
+    Store the renditions of one color map for frames that lack them.
+
+    Args:
+        color_map: Color map name
+        batch_size: Frames per batch
+        replace: Delete the existing renditions first and recompute them all
+        logger: Progress logger
+
+    Returns:
+        int: Number of written renditions
+    """
+    mapper = CustomColorMap(color_map)
+    written = 0
+    after = 0
+    async with async_session() as session:
+        repository = SQLAlchemyImageRepository(session)
+        if replace:
+            await session.execute(
+                delete(ColorVariantModel).where(
+                    ColorVariantModel.color_map == color_map
+                )
+            )
+            await session.commit()
+
+        stored = exists().where(
+            and_(
+                ColorVariantModel.frame_id == ImageModel.id,
+                ColorVariantModel.color_map == color_map,
+            )
+        )
+        while True:
+            query = (
+                select(
+                    ImageModel.id,
+                    ImageModel.pixel_data,
+                    ImageModel.dtype,
+                    ImageModel.width,
+                    ImageModel.codec,
+                )
+                .where(and_(ImageModel.id > after, ~stored))
+                .order_by(ImageModel.id)
+                .limit(batch_size)
+            )
+            rows = (await session.execute(query)).all()
+            if not rows:
+                break
+
+            pixels = decode_pixel_rows(
+                [(row.pixel_data, row.dtype, row.width, row.codec) for row in rows]
+            )
+            ids = [row.id for row in rows]
+            written += await repository.copy_color_variants(
+                ids, color_map, mapper.apply(pixels)
+            )
+            await session.commit()
+            after = ids[-1]
+            logger.info("Stored %s %s renditions", written, color_map)
+    return written
+
+
+async def backfill(color_maps: List[str], batch_size: int, replace: bool):
+    """Backfill the renditions of every given color map."""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+
+    try:
+        for color_map in color_maps:
+            start_time = time.perf_counter()
+            written = await backfill_color_map(color_map, batch_size, replace, logger)
+            logger.info(
+                "Backfilled %s %s renditions in %.1fs",
+                written,
+                color_map,
+                time.perf_counter() - start_time,
+            )
+
+    except Exception as e:
+        logger.error("Error backfilling color variants: %s", e)
+        raise
+
+    finally:
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--color-maps",
+        nargs="+",
+        default=get_settings().MATERIALIZED_COLOR_MAPS,
+        help="Color maps to render (default: MATERIALIZED_COLOR_MAPS)",
+    )
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Recompute renditions that are already stored",
+    )
+    args = parser.parse_args()
+    if not args.color_maps:
+        parser.error("No color maps given and MATERIALIZED_COLOR_MAPS is empty")
+    asyncio.run(backfill(args.color_maps, args.batch_size, args.replace))
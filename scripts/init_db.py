@@ -0,0 +1,44 @@
+"""
+Script to create or update the database schema.
+
+Run once per deployment before starting the API workers, which no longer
+create tables themselves. Idempotent: only missing tables, columns and
+indexes are created. Rewriting legacy pixel rows is left to
+migrate_pixel_storage.py.
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.config.database import engine
+from src.core.log_handlers import setup_logging
+from src.infrastructure.database.schema import create_schema
+
+
+async def init_db():
+    """Create missing tables, columns and indexes."""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+
+    try:
+        logger.info("Creating database schema")
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+        logger.info("Database schema is up to date")
+
+    except Exception as e:
+        logger.error("Error creating database schema: %s", e)
+        raise
+
+    finally:
+        await engine.dispose()
+        # Loop through all handlers and close them
+        for handler in logger.handlers:
+            logger.removeHandler(handler)
+            handler.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(init_db())
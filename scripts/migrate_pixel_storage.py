@@ -0,0 +1,116 @@
+"""
+Script to migrate stored pixel data to typed, quantized storage.
+
+Adds the dtype/width/codec/content_hash columns and the (depth, id) index
+where they are missing, rewrites rows written before the storage columns
+existed (raw float64 blobs) with the configured PIXEL_DTYPE and PIXEL_CODEC,
+and fills in missing content hashes of the other rows.
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+from sqlalchemy import select, update
+
+sys.path.append(str(Path(__file__).parent.parent))
+from src.config.database import async_session, engine
+from src.config.settings import get_settings
+from src.core.log_handlers import setup_logging
+from src.infrastructure.database.codecs import decode_pixels, encode_pixels, hash_pixels
+from src.infrastructure.database.models import ImageLevelModel, ImageModel
+from src.infrastructure.database.schema import create_schema
+
+BATCH_SIZE = 1000
+
+
+async def rewrite_legacy_rows(model, logger: logging.Logger) -> int:
+    """
+    Re-encode legacy rows and hash rows without a content hash, by primary key.
+
+    Args:
+        model: ImageModel or ImageLevelModel
+        logger: Progress logger
+
+    Returns:
+        int: Number of rewritten rows
+    """
+    settings = get_settings()
+    rewritten = 0
+    async with async_session() as session:
+        while True:
+            query = (
+                select(
+                    model.id, model.pixel_data, model.dtype, model.width, model.codec
+                )
+                .where(model.content_hash.is_(None))
+                .order_by(model.id)
+                .limit(BATCH_SIZE)
+            )
+            rows = (await session.execute(query)).all()
+            if not rows:
+                break
+
+            legacy = [
+                {
+                    "id": row.id,
+                    **encode_pixels(
+                        decode_pixels(row.pixel_data),
+                        settings.PIXEL_DTYPE,
+                        settings.PIXEL_CODEC,
+                    ),
+                }
+                for row in rows
+                if row.dtype is None
+            ]
+            unhashed = [
+                {
+                    "id": row.id,
+                    "content_hash": hash_pixels(
+                        decode_pixels(
+                            row.pixel_data, row.dtype, row.width, row.codec
+                        ).tobytes(),
+                        row.dtype,
+                    ),
+                }
+                for row in rows
+                if row.dtype is not None
+            ]
+            for values in (legacy, unhashed):
+                if values:
+                    await session.execute(update(model), values)
+            await session.commit()
+            rewritten += len(rows)
+            logger.info("Rewrote %s rows of %s", rewritten, model.__tablename__)
+    return rewritten
+
+
+async def migrate_pixel_storage():
+    """Migrate the schema and rewrite legacy pixel rows."""
+    setup_logging()
+    logger = logging.getLogger(__name__)
+
+    try:
+        logger.info("Starting pixel storage migration")
+        async with engine.begin() as conn:
+            await conn.run_sync(create_schema)
+
+        for model in (ImageModel, ImageLevelModel):
+            await rewrite_legacy_rows(model, logger)
+
+        logger.info("Pixel storage migration completed successfully")
+
+    except Exception as e:
+        logger.error("Error migrating pixel storage: %s", e)
+        raise
+
+    finally:
+        await engine.dispose()
+        # Loop through all handlers and close them
+        for handler in logger.handlers:
+            logger.removeHandler(handler)
+            handler.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_pixel_storage())
@@ -1,19 +1,18 @@
 """
 Script to process the initial CSV data file and populate the database.
 """
+import argparse
 import asyncio
 import logging
 import sys
 from pathlib import Path
 
 sys.path.append(str(Path(__file__).parent.parent))
-from src.config.database import async_session
 from src.core.log_handlers import setup_logging
-from src.infrastructure.database.repositories import SQLAlchemyImageRepository
-from src.infrastructure.services.image_processor import ImageProcessor
+from src.infrastructure.services.csv_ingest import ingest_csv
 
 
-async def process_csv_file():
+async def process_csv_file(csv_path: Path, chunk_size: int = None):
     """Process the CSV file and store images in the database."""
     setup_logging()
     logger = logging.getLogger(__name__)
@@ -21,20 +20,20 @@ async def process_csv_file():
     try:
         logger.info("Starting CSV processing")
 
-        csv_path = Path(__file__).parent.parent / "data" / "img.csv"
-        frames = await ImageProcessor.process_csv(str(csv_path))
-
-        logger.info(f"Processed {len(frames)} frames from CSV")
-
-        # Store in database
-        async with async_session() as session:
-            repository = SQLAlchemyImageRepository(session)
-            await repository.bulk_save(frames)
+        # Chunks are committed with their depth pyramid rows and checkpointed,
+        # so rerunning after a failure resumes where it stopped
+        progress = await ingest_csv(str(csv_path), chunk_size=chunk_size)
 
+        logger.info(
+            "Processed %s frames from CSV in %.1fs (%.0f rows/sec)",
+            progress.rows_done,
+            progress.elapsed,
+            progress.rows_per_second,
+        )
         logger.info("CSV processing completed successfully")
 
     except Exception as e:
-        logger.error(f"Error processing CSV: {str(e)}")
+        logger.error("Error processing CSV: %s", e)
         raise
 
     finally:
@@ -45,4 +44,13 @@ async def process_csv_file():
 
 
 if __name__ == "__main__":
-    asyncio.run(process_csv_file())
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "csv_path",
+        nargs="?",
+        type=Path,
+        default=Path(__file__).parent.parent / "data" / "img.csv",
+    )
+    parser.add_argument("--chunk-size", type=int, default=None)
+    args = parser.parse_args()
+    asyncio.run(process_csv_file(args.csv_path, args.chunk_size))
@@ -0,0 +1,115 @@
+"""
+Script to report API worker start-up time.
+
+Imports main.py in a fresh interpreter with ``-X importtime``, runs the
+startup hooks the way uvicorn would, and prints the slowest imports plus the
+time until the worker is ready. The startup hooks connect to DATABASE_URL.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).parent.parent
+HEAVY_MODULES = ("pandas", "matplotlib", "PIL", "lz4")
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+# Runs in the child process; prints timings as JSON on its last stdout line
+CHILD = """
+import asyncio, json, sys, time
+start = time.perf_counter()
+import main
+imported = time.perf_counter()
+
+async def start_worker():
+    await main.app.router.startup()
+    ready = time.perf_counter()
+    await main.app.router.shutdown()
+    return ready
+
+ready = asyncio.run(start_worker())
+print(json.dumps({
+    "import_s": imported - start,
+    "startup_s": ready - imported,
+    "ready_s": ready - start,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def parse_import_times(stderr: str) -> List[Dict[str, object]]:
+    """
+    Parse ``-X importtime`` output into per-module timings.
+
+    Args:
+        stderr: Standard error of the child interpreter
+
+    Returns:
+        List[Dict[str, object]]: module, depth, self_s and cumulative_s
+    """
+    modules = []
+    for line in stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append(
+                {
+                    "module": module,
+                    "depth": len(indent) // 2,
+                    "self_s": int(self_us) / 1e6,
+                    "cumulative_s": int(cumulative_us) / 1e6,
+                }
+            )
+    return modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--top", type=int, default=15, help="Modules to list")
+    parser.add_argument("--json", type=Path, help="Also write the report here")
+    args = parser.parse_args()
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD % (HEAVY_MODULES,)],
+        cwd=ROOT,
+        env=os.environ,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-4000:], file=sys.stderr)
+        return result.returncode
+
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    modules = parse_import_times(result.stderr)
+    # Modules imported directly by main and the project's own modules
+    interesting = [
+        module
+        for module in modules
+        if module["depth"] <= 1 or str(module["module"]).startswith("src.")
+    ]
+    interesting.sort(key=lambda module: module["cumulative_s"], reverse=True)
+
+    print(f"{'module':<55} {'cumulative':>10} {'self':>8}")
+    for module in interesting[: args.top]:
+        print(
+            f"{module['module']:<55} {module['cumulative_s'] * 1000:8.1f}ms "
+            f"{module['self_s'] * 1000:6.1f}ms"
+        )
+    print()
+    print(f"import main:      {timings['import_s'] * 1000:8.1f}ms")
+    print(f"startup hooks:    {timings['startup_s'] * 1000:8.1f}ms")
+    print(f"time to ready:    {timings['ready_s'] * 1000:8.1f}ms")
+    print(f"heavy modules loaded at ready: {', '.join(timings['loaded']) or 'none'}")
+
+    if args.json:
+        args.json.write_text(json.dumps({**timings, "modules": modules}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+from src.config.settings import get_settings
+from src.core.exceptions import PayloadTooLargeError
+from src.domain.entities.image import DepthIndex
+
+FRAME_COUNT_HEADER = "X-Frame-Count"
+ESTIMATED_BYTES_HEADER = "X-Estimated-Bytes"
+
+# Budgets count color-mapped bytes: one byte per channel of every pixel
+RGB_CHANNELS = 3
+
+
+def estimate_rgb_bytes(index: DepthIndex, depth_min: float, depth_max: float) -> int:
+    """Size of a depth range once color-mapped, before serialization."""
+    return RGB_CHANNELS * index.pixels(depth_min, depth_max)
+
+
+def budget_frames(index: DepthIndex, depth_min: float, depth_max: float) -> int:
+    """
+    Most frames of a depth range one response may hold.
+
+    Args:
+        index: Depth index
+        depth_min: Minimum depth value
+        depth_max: Maximum depth value
+
+    Returns:
+        int: RANGE_MAX_FRAMES, lowered so that frames of the range's average
+        size stay within RANGE_MAX_BYTES; at least 1
+    """
+    settings = get_settings()
+    frames = index.count(depth_min, depth_max)
+    if not frames:
+        return settings.RANGE_MAX_FRAMES
+    frame_bytes = max(estimate_rgb_bytes(index, depth_min, depth_max) // frames, 1)
+    return max(
+        min(settings.RANGE_MAX_FRAMES, settings.RANGE_MAX_BYTES // frame_bytes), 1
+    )
+
+
+def check_budget(
+    index: DepthIndex, depth_min: float, depth_max: float, frames: int
+) -> None:
+    """
+    Reject a response of ``frames`` frames of a depth range above the budget.
+
+    Args:
+        index: Depth index
+        depth_min: Minimum depth value
+        depth_max: Maximum depth value
+        frames: Frames the response would hold
+
+    Raises:
+        PayloadTooLargeError: If the response would exceed the budget
+    """
+    limit = budget_frames(index, depth_min, depth_max)
+    if frames > limit:
+        raise PayloadTooLargeError(
+            detail=f"Responses hold at most {limit} frames of this depth range"
+        )
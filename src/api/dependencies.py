@@ -0,0 +1,30 @@
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.database import get_session
+from src.config.settings import get_settings
+from src.domain.interfaces.repositories import ImageRepository
+from src.infrastructure.database.repositories import SQLAlchemyImageRepository
+from src.infrastructure.storage.repositories import MemoryMappedImageRepository
+
+
+def create_repository(session: AsyncSession) -> ImageRepository:
+    """
+    Create the frame repository selected by ``FRAME_STORE_BACKEND``.
+
+    Args:
+        session: Database session, unused by the memory-mapped store
+
+    Returns:
+        ImageRepository: SQL or memory-mapped frame repository
+    """
+    if get_settings().FRAME_STORE_BACKEND == "mmap":
+        return MemoryMappedImageRepository()
+    return SQLAlchemyImageRepository(session)
+
+
+async def get_repository(
+    session: AsyncSession = Depends(get_session),
+) -> ImageRepository:
+    """Dependency for getting the configured frame repository."""
+    return create_repository(session)
@@ -0,0 +1,80 @@
+import hashlib
+import struct
+from typing import Iterable, Optional
+
+from fastapi import Response
+
+from src.config.settings import get_settings
+from src.domain.interfaces.repositories import FrameVersion
+
+_VERSION_PREFIX = struct.Struct("<qd")
+
+
+def frames_etag(
+    media_type: str, color_map: str, versions: Iterable[FrameVersion]
+) -> Optional[str]:
+    """
+    Derive a strong ETag for a representation of one or more frames.
+
+    The tag covers the media type, the color map and the ID, depth and
+    content hash of every frame, so it changes whenever any byte of the
+    response would.
+
+    Args:
+        media_type: Negotiated media type
+        color_map: Color map name
+        versions: (id, depth, content_hash) of the frames, in response order
+
+    Returns:
+        Optional[str]: Quoted ETag, or None if a frame has no content hash yet
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{media_type};{color_map}".encode("ascii"))
+    for frame_id, depth, content_hash in versions:
+        if content_hash is None:
+            return None
+        digest.update(_VERSION_PREFIX.pack(frame_id, depth))
+        digest.update(bytes.fromhex(content_hash))
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(etag: str, if_none_match: Optional[str]) -> bool:
+    """
+    Evaluate an If-None-Match header against the current ETag.
+
+    Args:
+        etag: Current quoted ETag
+        if_none_match: Header value, a comma-separated list of tags or ``*``
+
+    Returns:
+        bool: True if the client's copy is current
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # If-None-Match uses weak comparison, so a W/ prefix is ignored
+    tags = (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+    return etag in tags
+
+
+def cache_headers(etag: Optional[str]) -> dict:
+    """
+    Validator and caching headers for a frame response.
+
+    Args:
+        etag: Quoted ETag, or None when the response cannot be validated
+
+    Returns:
+        dict: Response headers
+    """
+    headers = {"Vary": "Accept"}
+    if etag is not None:
+        headers["ETag"] = etag
+        headers["Cache-Control"] = get_settings().HTTP_CACHE_CONTROL
+    return headers
+
+
+def not_modified(etag: str) -> Response:
+    """Build the 304 answer sent instead of the frames."""
+    return Response(status_code=304, headers=cache_headers(etag))
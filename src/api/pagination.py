@@ -0,0 +1,42 @@
+import base64
+import binascii
+import struct
+from typing import Tuple
+
+from src.core.exceptions import AppException
+
+# Cursors are the (depth, id) key of the last frame of a page
+CURSOR_FORMAT = struct.Struct("<dq")
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(depth: float, frame_id: int) -> str:
+    """
+    Encode the keyset position after a frame as an opaque cursor.
+
+    Args:
+        depth: Depth of the last returned frame
+        frame_id: ID of the last returned frame
+
+    Returns:
+        str: URL-safe cursor string
+    """
+    packed = CURSOR_FORMAT.pack(depth, frame_id)
+    return base64.urlsafe_b64encode(packed).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, int]:
+    """
+    Decode a cursor produced by ``encode_cursor``.
+
+    Args:
+        cursor: Cursor string from a previous page
+
+    Returns:
+        Tuple[float, int]: (depth, id) of the last frame of the previous page
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return CURSOR_FORMAT.unpack(base64.urlsafe_b64decode(padded))
+    except (binascii.Error, struct.error, ValueError):
+        raise AppException(status_code=400, detail="Invalid cursor")
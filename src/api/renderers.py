@@ -0,0 +1,370 @@
+import io
+import struct
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from fastapi import Response, status
+
+from src.api.schemas import safe_float_encoder
+from src.core.exceptions import AppException
+from src.core.metrics import FRAMES_PER_RESPONSE, stage
+from src.domain.entities.image import FrameBatch
+from src.domain.services.color_map import ColorMap
+from src.domain.services.depth_log import render_depth_log
+from src.domain.services.resampling import ResampleMethod
+from src.infrastructure.services.frame_cache import ColoredFrame
+from src.infrastructure.services.image_encoder import ImageFormat, encode_image
+
+JSON_MEDIA_TYPE = "application/json"
+OCTET_STREAM_MEDIA_TYPE = "application/octet-stream"
+NPY_MEDIA_TYPE = "application/x-npy"
+PNG_MEDIA_TYPE = "image/png"
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+WEBP_MEDIA_TYPE = "image/webp"
+
+IMAGE_MEDIA_TYPES = {"png": PNG_MEDIA_TYPE, "webp": WEBP_MEDIA_TYPE}
+
+# Order matters: on equal quality JSON stays the default
+SUPPORTED_MEDIA_TYPES = [
+    JSON_MEDIA_TYPE,
+    OCTET_STREAM_MEDIA_TYPE,
+    NPY_MEDIA_TYPE,
+    PNG_MEDIA_TYPE,
+]
+STREAMING_MEDIA_TYPES = SUPPORTED_MEDIA_TYPES + [NDJSON_MEDIA_TYPE]
+
+# Packed frame header: magic, version, channels, frame count, width
+FRAME_HEADER = struct.Struct("<4sHHII")
+FRAME_MAGIC = b"FRMS"
+FRAME_VERSION = 1
+
+# Decimal text of every uint8 value, right-aligned in 3 bytes; the padding
+# spaces are dropped once a whole matrix has been laid out
+_UINT8_TEXT = np.array([b"%3d" % value for value in range(256)])
+_UINT8_TEXT = _UINT8_TEXT.view(np.uint8).reshape(256, 3)
+_PAD = ord(" ")
+
+
+def media_type_responses(media_types: List[str]) -> dict:
+    """Document the non-JSON media types of an endpoint for OpenAPI."""
+    return {
+        status.HTTP_200_OK: {
+            "content": {
+                media_type: {}
+                for media_type in media_types
+                if media_type != JSON_MEDIA_TYPE
+            },
+            "description": "Frames in the format selected by the Accept header",
+        }
+    }
+
+
+def negotiate_media_type(
+    accept: Optional[str], supported: List[str] = SUPPORTED_MEDIA_TYPES
+) -> str:
+    """
+    Pick the best supported media type for an Accept header.
+
+    Args:
+        accept: Raw Accept header value
+        supported: Media types the endpoint can produce
+
+    Returns:
+        str: Selected media type, JSON when the client has no preference
+    """
+    if not accept:
+        return JSON_MEDIA_TYPE
+
+    best_type, best_quality = None, 0.0
+    for entry in accept.split(","):
+        media_range, *params = [part.strip() for part in entry.split(";")]
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        for media_type in supported:
+            if _matches(media_range.lower(), media_type) and quality > best_quality:
+                best_type, best_quality = media_type, quality
+
+    if best_type is None:
+        raise AppException(
+            status_code=status.HTTP_406_NOT_ACCEPTABLE,
+            detail=f"Supported media types: {', '.join(supported)}",
+        )
+    return best_type
+
+
+def _matches(media_range: str, media_type: str) -> bool:
+    """Check whether a media range such as ``image/*`` covers a media type."""
+    if media_range == "*/*":
+        return True
+    range_type, _, range_subtype = media_range.partition("/")
+    main_type, _, subtype = media_type.partition("/")
+    return range_type == main_type and range_subtype in ("*", subtype)
+
+
+def pack_frames(ids: np.ndarray, depths: np.ndarray, rgb: np.ndarray) -> bytes:
+    """
+    Pack color-mapped frames into a little-endian binary buffer.
+
+    Layout: FRAME_HEADER, ``n`` int64 ids, ``n`` float64 depths and the
+    ``n * width * channels`` uint8 RGB matrix in row-major order.
+
+    Args:
+        ids: Frame IDs
+        depths: Frame depths
+        rgb: uint8 array of shape (n_frames, width, channels)
+
+    Returns:
+        bytes: Packed frames
+    """
+    n_frames, width, channels = rgb.shape
+    header = FRAME_HEADER.pack(FRAME_MAGIC, FRAME_VERSION, channels, n_frames, width)
+    return b"".join(
+        [
+            header,
+            np.asarray(ids, dtype="<i8").tobytes(),
+            np.asarray(depths, dtype="<f8").tobytes(),
+            np.ascontiguousarray(rgb, dtype=np.uint8).tobytes(),
+        ]
+    )
+
+
+def frames_to_npy(ids: np.ndarray, depths: np.ndarray, rgb: np.ndarray) -> bytes:
+    """
+    Serialize frames as a structured ``.npy`` array with id, depth and pixels.
+
+    Args:
+        ids: Frame IDs
+        depths: Frame depths
+        rgb: uint8 array of shape (n_frames, width, channels)
+
+    Returns:
+        bytes: ``.npy`` file contents
+    """
+    n_frames, width, channels = rgb.shape
+    dtype = np.dtype(
+        [("id", "<i8"), ("depth", "<f8"), ("pixels", "u1", (width, channels))]
+    )
+    records = np.empty(n_frames, dtype=dtype)
+    records["id"] = ids
+    records["depth"] = depths
+    records["pixels"] = rgb
+
+    buffer = io.BytesIO()
+    np.save(buffer, records, allow_pickle=False)
+    return buffer.getvalue()
+
+
+def encode_rgb_json(rgb: np.ndarray) -> List[bytes]:
+    """
+    Encode uint8 frames as the JSON arrays of ``NumpyArrayModel.data``.
+
+    Every value is looked up in a table of decimal texts and each pixel is
+    laid out in a fixed-width cell such as ``[  0, 12,255],``, all in one
+    byte array. Dropping the padding then leaves the compact JSON of every
+    frame back to back, without a Python object per pixel.
+
+    Args:
+        rgb: uint8 array of shape (n_frames, width, channels)
+
+    Returns:
+        List[bytes]: ``[[r,g,b],...]`` per frame
+    """
+    n_frames, width, channels = rgb.shape
+    if not width:
+        return [b"[]"] * n_frames
+
+    cell = 4 * channels + 2
+    text = np.empty((n_frames, width, cell), dtype=np.uint8)
+    for channel in range(channels):
+        text[:, :, 4 * channel] = ord("[" if channel == 0 else ",")
+        text[:, :, 4 * channel + 1 : 4 * channel + 4] = _UINT8_TEXT[rgb[..., channel]]
+    text[:, :, -2] = ord("]")
+    text[:, :, -1] = ord(",")
+    text[:, -1, -1] = _PAD
+
+    keep = text != _PAD
+    body = text[keep].tobytes()
+    ends = np.cumsum(keep.reshape(n_frames, -1).sum(axis=1)).tolist()
+    return [b"[%s]" % body[start:end] for start, end in zip([0] + ends[:-1], ends)]
+
+
+def encode_float_json(value: float, exponent: str = "e") -> bytes:
+    """
+    Encode a float as JSON, ``null`` for NaN and infinity like safe_float_encoder.
+
+    Args:
+        value: Value to encode
+        exponent: ``e`` for ``json.dumps`` output (``1e+16``, ``1e-07``),
+            ``pydantic`` for pydantic's (``1e16``, ``1e-7``)
+
+    Returns:
+        bytes: JSON number or ``null``
+    """
+    value = safe_float_encoder(float(value))
+    if value is None:
+        return b"null"
+    text = repr(value)
+    if exponent == "pydantic" and "e" in text:
+        mantissa, _, power = text.partition("e")
+        text = f"{mantissa}e{int(power)}"
+    return text.encode("ascii")
+
+
+def _frame_pixels_json(frames: Sequence[ColoredFrame]) -> List[bytes]:
+    """Encode the pixels of frames, in one pass when they share a shape."""
+    if len({frame.rgb.shape for frame in frames}) == 1:
+        return encode_rgb_json(np.stack([frame.rgb for frame in frames]))
+    return [encode_rgb_json(frame.rgb[np.newaxis])[0] for frame in frames]
+
+
+def frame_json(_id: int, depth: float, pixels: bytes, exponent: str = "e") -> bytes:
+    """
+    Assemble the ImageResponse JSON of one frame.
+
+    Args:
+        _id: Frame ID
+        depth: Frame depth
+        pixels: JSON pixel array from encode_rgb_json
+        exponent: Float exponent style, see encode_float_json
+
+    Returns:
+        bytes: Compact UTF-8 JSON object
+    """
+    return b'{"id":%d,"depth":%s,"pixels":{"data":%s}}' % (
+        _id,
+        encode_float_json(depth, exponent),
+        pixels,
+    )
+
+
+def frames_to_json(frames: Sequence[ColoredFrame], many: bool = True) -> bytes:
+    """
+    Serialize frames exactly as the ImageResponse response model would be.
+
+    The bytes are written directly instead of building the model, whose
+    validation and serialization walk every pixel as a Python int.
+
+    Args:
+        frames: Color-mapped frames
+        many: Serialize a list rather than the single first frame
+
+    Returns:
+        bytes: Compact UTF-8 JSON
+    """
+    content = [
+        frame_json(frame.id, frame.depth, pixels)
+        for frame, pixels in zip(frames, _frame_pixels_json(frames))
+    ]
+    return b"[%s]" % b",".join(content) if many else content[0]
+
+
+def render_lookup(frame_ids: Sequence[int], found: Dict[int, ColoredFrame]) -> Response:
+    """
+    Serialize a batch lookup in request order, marking IDs that were not found.
+
+    Args:
+        frame_ids: Requested IDs, in request order
+        found: Color-mapped frames by ID
+
+    Returns:
+        Response: JSON list of FrameLookupResponse
+    """
+    FRAMES_PER_RESPONSE.observe(len(found), "lookup")
+    with stage("serialize"):
+        pixels = dict(zip(found, _frame_pixels_json(list(found.values()))))
+        content = [
+            (
+                b'{"id":%d,"found":true,"frame":%s}'
+                % (
+                    frame_id,
+                    frame_json(frame_id, found[frame_id].depth, pixels[frame_id]),
+                )
+                if frame_id in found
+                else b'{"id":%d,"found":false,"frame":null}' % frame_id
+            )
+            for frame_id in frame_ids
+        ]
+        body = b"[%s]" % b",".join(content)
+    return Response(content=body, media_type=JSON_MEDIA_TYPE)
+
+
+def render_frames(
+    media_type: str, frames: Sequence[ColoredFrame], many: bool = True
+) -> Response:
+    """
+    Build the response for color-mapped frames in the negotiated format.
+
+    CPU bound for large ranges; callers on the event loop should run it
+    through the processing executor.
+
+    Args:
+        media_type: Negotiated media type
+        frames: Color-mapped frames
+        many: Whether JSON holds a list, as opposed to a single frame
+
+    Returns:
+        Response: Serialized frames
+    """
+    FRAMES_PER_RESPONSE.observe(len(frames), "frames")
+    if media_type == JSON_MEDIA_TYPE:
+        with stage("serialize"):
+            content = frames_to_json(frames, many)
+        return Response(
+            content=content, media_type=media_type, headers={"Vary": "Accept"}
+        )
+
+    with stage("serialize"):
+        ids = np.array([frame.id for frame in frames])
+        depths = np.array([frame.depth for frame in frames])
+        rgb = np.stack([frame.rgb for frame in frames])
+        if media_type == OCTET_STREAM_MEDIA_TYPE:
+            content = pack_frames(ids, depths, rgb)
+        elif media_type == NPY_MEDIA_TYPE:
+            content = frames_to_npy(ids, depths, rgb)
+        else:
+            # Rows are depths and columns are pixels
+            content = encode_image(rgb, "png")
+
+    headers = {
+        "Vary": "Accept",
+        "X-Frame-Count": str(rgb.shape[0]),
+        "X-Frame-Width": str(rgb.shape[1]),
+    }
+    return Response(content=content, media_type=media_type, headers=headers)
+
+
+def render_depth_log_image(
+    frames: FrameBatch,
+    color_map: ColorMap,
+    image_format: ImageFormat,
+    height: Optional[int] = None,
+    width: Optional[int] = None,
+    method: ResampleMethod = "linear",
+) -> bytes:
+    """
+    Stitch frames into one depth-log image and encode it.
+
+    CPU bound; callers on the event loop should run it in a worker thread.
+
+    Args:
+        frames: Frames ordered by depth
+        color_map: Color map applied after resampling
+        image_format: Output image format
+        height: Optional output rows along the depth axis
+        width: Optional output columns along the pixel axis
+        method: Resampling method
+
+    Returns:
+        bytes: Encoded image
+    """
+    FRAMES_PER_RESPONSE.observe(len(frames), "render")
+    with stage("render"):
+        rgb = render_depth_log(frames.pixels, color_map, height, width, method)
+    with stage("encode"):
+        return encode_image(rgb, image_format)
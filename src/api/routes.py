@@ -1,76 +1,526 @@
-from typing import List
+import uuid
+from pathlib import Path
+from typing import List, Literal, Optional
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
+import anyio
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
 
-from src.api.schemas import DepthRangeRequest, ImageResponse
-from src.config.database import get_session
+from src.api.budgets import (
+    ESTIMATED_BYTES_HEADER,
+    FRAME_COUNT_HEADER,
+    budget_frames,
+    check_budget,
+    estimate_rgb_bytes,
+)
+from src.api.dependencies import get_repository
+from src.api.etags import cache_headers, etag_matches, frames_etag, not_modified
+from src.api.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+from src.api.renderers import (
+    IMAGE_MEDIA_TYPES,
+    NDJSON_MEDIA_TYPE,
+    STREAMING_MEDIA_TYPES,
+    SUPPORTED_MEDIA_TYPES,
+    media_type_responses,
+    negotiate_media_type,
+    render_depth_log_image,
+    render_frames,
+    render_lookup,
+)
+from src.api.schemas import (
+    DepthRangeRequest,
+    FrameIdsRequest,
+    FrameLookupResponse,
+    ImageResponse,
+    IngestJobResponse,
+    RangeEstimateResponse,
+)
+from src.api.streaming import stream_frames_by_depth
+from src.config.settings import get_settings
 from src.core.exceptions import AppException, NotFoundError
-from src.domain.services.color_map import CustomColorMap
-from src.infrastructure.database.repositories import SQLAlchemyImageRepository
+from src.domain.entities.image import DepthIndex
+from src.domain.interfaces.repositories import FrameVersion, ImageRepository
+from src.domain.services.color_map import COLOR_MAPS, DEFAULT_COLOR_MAP, CustomColorMap
+from src.domain.services.resampling import ResampleMethod
+from src.infrastructure.services.depth_index import depth_index
+from src.infrastructure.services.executor import processing_executor
+from src.infrastructure.services.frame_reader import CachedFrameReader
+from src.infrastructure.services.image_encoder import ImageFormat
+from src.infrastructure.services.ingest_jobs import ingest_jobs
+from src.infrastructure.services.single_flight import depth_range_flights
 
 router = APIRouter()
+settings = get_settings()
 
 
-@router.post("/frames/by-depth", response_model=List[ImageResponse])
+@router.post(
+    "/frames/by-depth",
+    response_model=List[ImageResponse],
+    responses=media_type_responses(STREAMING_MEDIA_TYPES),
+)
 async def get_image_frames_by_depth(
-    request: DepthRangeRequest, session: AsyncSession = Depends(get_session)
+    request: DepthRangeRequest,
+    http_request: Request,
+    accept: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    repository: ImageRepository = Depends(get_repository),
 ):
     """
     Retrieve and color-map frames within the specified depth range.
 
     Args:
-        request: Depth range and color map parameters
-        session: Database session
+        request: Depth range, color map and paging parameters
+        http_request: Incoming request, used to detect disconnects when streaming
+        accept: Accept header selecting JSON, a binary format or NDJSON streaming
+        if_none_match: ETags of the client's copy, answered with 304 if current
+        repository: Frame repository
 
     Returns:
         List[ImageResponse]: List of processed image frames
     """
-    repository = SQLAlchemyImageRepository(session)
-    frames = await repository.get_by_depth_range(request.depth_min, request.depth_max)
+    media_type = negotiate_media_type(accept, STREAMING_MEDIA_TYPES)
+    ranges = await depth_index.get(repository)
+    await _check_range_found(repository, ranges, request.depth_min, request.depth_max)
+    if media_type == NDJSON_MEDIA_TYPE:
+        return await stream_frames_by_depth(
+            http_request,
+            request.depth_min,
+            request.depth_max,
+            request.color_map,
+            batch_size=settings.STREAM_BATCH_SIZE,
+        )
+
+    limit = budget_frames(ranges, request.depth_min, request.depth_max)
+    if request.rows:
+        if request.reduction not in settings.PYRAMID_REDUCTIONS:
+            raise AppException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"No depth pyramid is built with reduction {request.reduction}",
+            )
+        check_budget(ranges, request.depth_min, request.depth_max, request.rows)
+    elif _page_limit(request) > limit:
+        # Pages of large frames shrink to the byte budget; the cursor goes on
+        request = request.model_copy(update={"limit": limit})
+
+    # Conditional requests check their tag first, so a current copy is still
+    # answered from the index alone
+    index = None
+    if if_none_match and not request.rows:
+        index = await _page_index(repository, request)
+        etag = frames_etag(media_type, request.color_map, index)
+        if etag is not None and etag_matches(etag, if_none_match):
+            return not_modified(etag)
+
+    # Concurrent identical requests share one read, color-mapping and render
+    shared = await depth_range_flights.run(
+        _depth_range_key(request, media_type, repository),
+        lambda: _render_depth_range(repository, request, media_type, index, limit),
+    )
+    return Response(
+        content=shared.body,
+        status_code=shared.status_code,
+        headers=dict(shared.headers),
+    )
+
+
+async def _check_range_found(
+    repository: ImageRepository,
+    ranges: DepthIndex,
+    depth_min: float,
+    depth_max: float,
+) -> None:
+    """
+    Reject a depth range without frames.
+
+    Ranges the depth index finds frames in pass without a database query.
+    An empty count is confirmed by the repository first, as the index can
+    miss frames committed out of ID order until its next full reload.
+
+    Args:
+        repository: Frame repository
+        ranges: Depth index of the repository's backend
+        depth_min: Minimum depth value
+        depth_max: Maximum depth value
+
+    Raises:
+        NotFoundError: If the range holds no frames
+    """
+    if ranges.count(depth_min, depth_max):
+        return
+    if not await repository.get_depth_index(depth_min, depth_max, limit=1):
+        raise NotFoundError(detail="No frames found in this depth range")
+    depth_index.reload()
+
+
+def _page_limit(request: DepthRangeRequest) -> int:
+    """Page size of a depth range request, capped at MAX_PAGE_SIZE."""
+    return min(request.limit or settings.MAX_PAGE_SIZE, settings.MAX_PAGE_SIZE)
+
+
+async def _page_index(
+    repository: ImageRepository, request: DepthRangeRequest
+) -> List[FrameVersion]:
+    """
+    Read the index of a depth range page, plus one row when another follows.
+
+    Args:
+        repository: Frame repository
+        request: Depth range and paging parameters
+
+    Returns:
+        List[FrameVersion]: (id, depth, content_hash) of the page
+
+    Raises:
+        NotFoundError: If the page is empty
+    """
+    index = await repository.get_depth_index(
+        request.depth_min,
+        request.depth_max,
+        limit=_page_limit(request) + 1,
+        after=decode_cursor(request.cursor) if request.cursor else None,
+    )
+    if not index:
+        raise NotFoundError(detail="No frames found in this depth range")
+    return index
+
+
+def _depth_range_key(
+    request: DepthRangeRequest, media_type: str, repository: ImageRepository
+) -> tuple:
+    """Normalize a depth range request into the key of its shared computation."""
+    if request.rows:
+        paging = ("rows", request.rows, request.reduction)
+    else:
+        paging = ("page", _page_limit(request), request.cursor)
+    return (
+        type(repository).__name__,
+        media_type,
+        request.depth_min,
+        request.depth_max,
+        request.color_map,
+        *paging,
+    )
+
+
+async def _render_depth_range(
+    repository: ImageRepository,
+    request: DepthRangeRequest,
+    media_type: str,
+    index: Optional[List[FrameVersion]] = None,
+    max_frames: Optional[int] = None,
+) -> Response:
+    """
+    Read, color-map and serialize the frames of a depth range request.
+
+    Args:
+        repository: Frame repository
+        request: Depth range, color map and paging parameters
+        media_type: Negotiated media type
+        index: Page index if the caller already read it
+        max_frames: Budget of a ``rows`` response; full-resolution reads above
+            it are rejected and larger pyramid levels binned down to ``rows``
+
+    Returns:
+        Response: Serialized frames with their ETag and next cursor
+    """
+    reader = CachedFrameReader(repository)
+    etag = next_cursor = None
+    if request.rows:
+        frames = await reader.get_by_depth_range_at_resolution(
+            request.depth_min,
+            request.depth_max,
+            request.rows,
+            request.reduction,
+            request.color_map,
+            max_frames=max_frames,
+        )
+    else:
+        if index is None:
+            index = await _page_index(repository, request)
+        # The extra row is part of the tag, as it decides the next cursor
+        etag = frames_etag(media_type, request.color_map, index)
+        limit = _page_limit(request)
+        if len(index) > limit:
+            index = index[:limit]
+            frame_id, depth, _ = index[-1]
+            next_cursor = encode_cursor(depth, frame_id)
+        frames = await reader.get_by_index(index, request.color_map)
 
     if not frames:
         raise NotFoundError(detail="No frames found in this depth range")
     try:
-        color_mapper = CustomColorMap(request.color_map)
-        processed_frames = [
-            ImageResponse.from_raw_data(
-                _id=frame.id,
-                depth=frame.depth,
-                pixels=color_mapper.apply(frame.pixel_data),
-            )
-            for frame in frames
-        ]
+        response = await processing_executor.run(
+            render_frames,
+            media_type,
+            frames,
+            work_size=len(frames) * frames[0].rgb.shape[0],
+        )
     except Exception:
         raise AppException(status_code=400)
+    response.headers.update(cache_headers(etag))
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
+
+
+@router.post("/frames/by-ids", response_model=List[FrameLookupResponse])
+async def get_image_frames_by_ids(
+    request: FrameIdsRequest,
+    repository: ImageRepository = Depends(get_repository),
+):
+    """
+    Retrieve and color-map a batch of frames by ID in one query.
 
-    return processed_frames
+    Args:
+        request: Frame IDs and color map
+        repository: Frame repository
 
+    Returns:
+        List[FrameLookupResponse]: One entry per requested ID, in request order,
+        with ``found`` false for IDs that do not exist
+    """
+    reader = CachedFrameReader(repository)
+    found = await reader.get_by_ids(request.ids, request.color_map)
+    try:
+        return await processing_executor.run(
+            render_lookup,
+            request.ids,
+            found,
+            work_size=sum(frame.rgb.shape[0] for frame in found.values()),
+        )
+    except Exception:
+        raise AppException(status_code=400)
 
-@router.get("/frames/{frame_id}", response_model=ImageResponse)
+
+@router.api_route(
+    "/frames/count",
+    methods=["GET", "HEAD"],
+    response_model=RangeEstimateResponse,
+)
+async def count_image_frames_by_depth(
+    response: Response,
+    depth_min: float = Query(..., description="Minimum depth value"),
+    depth_max: float = Query(..., description="Maximum depth value"),
+    repository: ImageRepository = Depends(get_repository),
+):
+    """
+    Count the frames of a depth range and estimate their size, from memory.
+
+    The answer comes from the worker's depth index, which can miss frames
+    ingested by other workers during the last DEPTH_INDEX_CHECK_SECONDS, and
+    frames committed out of ID order until its next full reload, at most
+    DEPTH_INDEX_RELOAD_SECONDS apart.
+    HEAD requests get the same numbers in the X-Frame-Count and
+    X-Estimated-Bytes headers only.
+
+    Args:
+        response: Response whose headers are set
+        depth_min: Minimum depth value
+        depth_max: Maximum depth value
+        repository: Frame repository, read only to refresh the index
+
+    Returns:
+        RangeEstimateResponse: Frame count, depth bounds and estimated size
+    """
+    ranges = await depth_index.get(repository)
+    first_depth, last_depth = ranges.bounds(depth_min, depth_max) or (None, None)
+    estimate = RangeEstimateResponse(
+        depth_min=depth_min,
+        depth_max=depth_max,
+        frames=ranges.count(depth_min, depth_max),
+        first_depth=first_depth,
+        last_depth=last_depth,
+        rgb_bytes=estimate_rgb_bytes(ranges, depth_min, depth_max),
+        max_frames=budget_frames(ranges, depth_min, depth_max),
+    )
+    response.headers[FRAME_COUNT_HEADER] = str(estimate.frames)
+    response.headers[ESTIMATED_BYTES_HEADER] = str(estimate.rgb_bytes)
+    return estimate
+
+
+@router.get(
+    "/frames/render",
+    response_class=Response,
+    responses={
+        200: {
+            "content": {media_type: {} for media_type in IMAGE_MEDIA_TYPES.values()},
+            "description": "Depth range rendered as one image",
+        }
+    },
+)
+async def render_image_frames_by_depth(
+    depth_min: float = Query(..., description="Minimum depth value"),
+    depth_max: float = Query(..., description="Maximum depth value"),
+    color_map: Literal[*COLOR_MAPS] = Query(DEFAULT_COLOR_MAP, description="Color map"),
+    image_format: ImageFormat = Query("png", alias="format"),
+    height: Optional[int] = Query(
+        None, gt=0, le=settings.RENDER_MAX_DIMENSION, description="Output rows"
+    ),
+    width: Optional[int] = Query(
+        None, gt=0, le=settings.RENDER_MAX_DIMENSION, description="Output columns"
+    ),
+    method: ResampleMethod = Query("linear", description="Resampling method"),
+    repository: ImageRepository = Depends(get_repository),
+):
+    """
+    Render a depth range as one image, rows being depths and columns pixels.
+
+    Args:
+        depth_min: Minimum depth value
+        depth_max: Maximum depth value
+        color_map: Color map name
+        image_format: Output image format, png or webp
+        height: Optional rows to resample the depth axis to, also used to
+            pick the depth pyramid level; at most the RANGE_MAX_FRAMES or
+            RANGE_MAX_BYTES budget, which ranges above it default to
+        width: Optional number of columns to resample the pixel axis to
+        method: Resampling method used for height and width
+        repository: Frame repository
+
+    Returns:
+        Response: Encoded depth-log image
+    """
+    ranges = await depth_index.get(repository)
+    await _check_range_found(repository, ranges, depth_min, depth_max)
+    limit = budget_frames(ranges, depth_min, depth_max)
+    if height:
+        check_budget(ranges, depth_min, depth_max, height)
+    elif ranges.count(depth_min, depth_max) > limit:
+        # Oversized ranges are rendered from the depth pyramid instead
+        height = limit
+
+    if height:
+        batch = await repository.get_by_depth_range_at_resolution(
+            depth_min, depth_max, height, max_frames=limit
+        )
+        # The level read can hold up to twice the rows asked for
+        batch = batch.bin_rows(limit)
+    else:
+        batch = await repository.get_batch_by_depth_range(depth_min, depth_max)
+
+    if not len(batch):
+        raise NotFoundError(detail="No frames found in this depth range")
+    try:
+        content = await processing_executor.run(
+            render_depth_log_image,
+            batch,
+            CustomColorMap(color_map),
+            image_format,
+            height=height,
+            width=width,
+            method=method,
+            work_size=batch.pixels.size,
+        )
+    except Exception:
+        raise AppException(status_code=400)
+
+    return Response(
+        content=content,
+        media_type=IMAGE_MEDIA_TYPES[image_format],
+        headers={"X-Frame-Count": str(len(batch))},
+    )
+
+
+@router.get(
+    "/frames/{frame_id}",
+    response_model=ImageResponse,
+    responses=media_type_responses(SUPPORTED_MEDIA_TYPES),
+)
 async def get_image_frames_by_id(
-    frame_id: int, session: AsyncSession = Depends(get_session)
+    frame_id: int,
+    accept: Optional[str] = Header(default=None),
+    if_none_match: Optional[str] = Header(default=None),
+    repository: ImageRepository = Depends(get_repository),
 ):
     """
     Retrieve and color-map frames within the specified depth range.
 
     Args:
         frame_id: Frame ID
-        session: Database session
+        accept: Accept header selecting JSON or a binary format
+        if_none_match: ETags of the client's copy, answered with 304 if current
+        repository: Frame repository
 
     Returns:
         ImageResponse: Processed image frame with custom color map.
     """
-    repository = SQLAlchemyImageRepository(session)
-    frame = await repository.get_by_id(frame_id)
+    media_type = negotiate_media_type(accept)
+    version = await repository.get_version(frame_id)
+    if version is None:
+        raise NotFoundError(detail="No frame found for specified ID")
+    etag = frames_etag(media_type, DEFAULT_COLOR_MAP, [version])
+    if etag is not None and etag_matches(etag, if_none_match):
+        return not_modified(etag)
 
+    frame = await CachedFrameReader(repository).get_by_id(frame_id, DEFAULT_COLOR_MAP)
     if not frame:
         raise NotFoundError(detail="No frame found for specified ID")
     try:
-        color_mapper = CustomColorMap()
-        frame = ImageResponse.from_raw_data(
-            _id=frame.id, depth=frame.depth, pixels=color_mapper.apply(frame.pixel_data)
+        response = await processing_executor.run(
+            render_frames,
+            media_type,
+            [frame],
+            many=False,
+            work_size=frame.rgb.shape[0],
         )
-        return frame
     except Exception:
         raise AppException(status_code=400)
+    response.headers.update(cache_headers(etag))
+    return response
+
+
+@router.post(
+    "/ingest",
+    response_model=IngestJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def create_ingest_job(file: UploadFile = File(..., description="CSV file")):
+    """
+    Spool an uploaded CSV file to disk and queue it for ingest.
+
+    Args:
+        file: Multipart CSV upload with a depth column and pixel columns
+
+    Returns:
+        IngestJobResponse: The queued job
+    """
+    spool_dir = Path(settings.INGEST_SPOOL_DIR)
+    spool_dir.mkdir(parents=True, exist_ok=True)
+    file_path = spool_dir / f"{uuid.uuid4().hex}.csv"
+
+    async with await anyio.open_file(file_path, "wb") as spool:
+        while chunk := await file.read(settings.INGEST_UPLOAD_CHUNK_SIZE):
+            await spool.write(chunk)
+
+    try:
+        job = ingest_jobs.submit(file_path, file.filename or file_path.name)
+    except AppException:
+        file_path.unlink(missing_ok=True)
+        raise
+    return IngestJobResponse.from_job(job)
+
+
+@router.get("/ingest/{job_id}", response_model=IngestJobResponse)
+async def get_ingest_job(job_id: str):
+    """
+    Report the status, progress and throughput of an ingest job.
+
+    Args:
+        job_id: Ingest job ID
+
+    Returns:
+        IngestJobResponse: Current job state
+    """
+    job = ingest_jobs.get(job_id)
+    if job is None:
+        raise NotFoundError(detail="No ingest job found for specified ID")
+    return IngestJobResponse.from_job(job)
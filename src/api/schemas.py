@@ -1,23 +1,11 @@
 import math
-from typing import List, Literal, Union
+from typing import List, Literal, Optional, Union
 
 import numpy as np
 from pydantic import BaseModel, Field
 
-# Color mapping list
-COLOR_MAPS = [
-    "magma",
-    "inferno",
-    "plasma",
-    "viridis",
-    "cividis",
-    "twilight",
-    "twilight_shifted",
-    "turbo",
-    "Blues",
-    "BrBG",
-    "BuGn",
-]
+from src.config.settings import get_settings
+from src.domain.services.color_map import COLOR_MAPS, DEFAULT_COLOR_MAP
 
 
 def safe_float_encoder(x):
@@ -70,3 +58,84 @@ class DepthRangeRequest(BaseModel):
     color_map: Literal[*COLOR_MAPS] = Field(
         ..., description="Color mapping value", examples=COLOR_MAPS
     )
+    rows: Optional[int] = Field(
+        None,
+        gt=0,
+        description="Rows needed on screen; served from the coarsest depth "
+        "pyramid level that still has this many rows (not used when streaming)",
+    )
+    reduction: Literal["mean", "max"] = Field(
+        "mean", description="Depth pyramid reduction used when rows is set"
+    )
+    limit: Optional[int] = Field(
+        None,
+        gt=0,
+        description="Page size, capped at MAX_PAGE_SIZE; the X-Next-Cursor "
+        "response header holds the cursor of the next page if there is one",
+    )
+    cursor: Optional[str] = Field(
+        None, description="X-Next-Cursor value of the previous page"
+    )
+
+
+class FrameIdsRequest(BaseModel):
+    """Request schema for fetching a batch of frames by ID."""
+
+    ids: List[int] = Field(
+        ...,
+        min_length=1,
+        max_length=get_settings().MAX_BATCH_IDS,
+        description="Frame IDs; results follow this order",
+    )
+    color_map: Literal[*COLOR_MAPS] = Field(
+        DEFAULT_COLOR_MAP, description="Color mapping value", examples=COLOR_MAPS
+    )
+
+
+class RangeEstimateResponse(BaseModel):
+    """Response schema for depth range counts."""
+
+    depth_min: float
+    depth_max: float
+    frames: int = Field(..., description="Frames in the depth range")
+    first_depth: Optional[float] = Field(None, description="Depth of the first frame")
+    last_depth: Optional[float] = Field(None, description="Depth of the last frame")
+    rgb_bytes: int = Field(
+        ..., description="Size of the frames once color-mapped, before serialization"
+    )
+    max_frames: int = Field(
+        ..., description="Most frames of this range one response may hold"
+    )
+
+
+class FrameLookupResponse(BaseModel):
+    """One entry of a batch lookup: the frame, or a not-found marker."""
+
+    id: int
+    found: bool
+    frame: Optional[ImageResponse] = None
+
+
+class IngestJobResponse(BaseModel):
+    """Response schema for CSV ingest jobs."""
+
+    id: str
+    status: Literal["queued", "running", "completed", "failed"]
+    file_name: str
+    rows_done: int
+    rows_per_second: float
+    elapsed: float
+    error: Optional[str] = None
+
+    @classmethod
+    def from_job(cls, job) -> "IngestJobResponse":
+        """Prepare response data."""
+        return cls(
+            id=job.id,
+            status=job.status,
+            file_name=job.file_name,
+            rows_done=job.progress.rows_done,
+            rows_per_second=round(job.progress.rows_per_second, 1),
+            elapsed=round(job.progress.elapsed, 3),
+            error=job.error,
+        )
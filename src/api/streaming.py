@@ -0,0 +1,108 @@
+import logging
+from typing import AsyncIterator
+
+import anyio
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.api.dependencies import create_repository
+from src.api.renderers import NDJSON_MEDIA_TYPE, encode_rgb_json, frame_json
+from src.config.database import async_session
+from src.core.exceptions import NotFoundError
+from src.core.metrics import stage
+from src.domain.entities.image import FrameBatch
+from src.domain.services.color_map import CustomColorMap
+from src.infrastructure.services.executor import processing_executor
+
+logger = logging.getLogger(__name__)
+
+
+async def stream_frames_by_depth(
+    http_request: Request,
+    depth_min: float,
+    depth_max: float,
+    color_map: str,
+    batch_size: int,
+) -> StreamingResponse:
+    """
+    Build a newline-delimited JSON response streaming a depth range.
+
+    The first batch is fetched before the response starts so an empty range
+    still answers with 404. The stream owns its session because it outlives
+    the request dependencies.
+
+    Args:
+        http_request: Incoming request, polled for client disconnects
+        depth_min: Minimum depth value
+        depth_max: Maximum depth value
+        color_map: Color map name
+        batch_size: Number of frames read and color-mapped per batch
+
+    Returns:
+        StreamingResponse: One ImageResponse JSON document per line
+    """
+    color_mapper = CustomColorMap(color_map)
+    session = async_session()
+    batches = create_repository(session).stream_by_depth_range(
+        depth_min, depth_max, batch_size
+    )
+    try:
+        first_batch = await anext(batches, None)
+    except Exception:
+        await _close(batches, session)
+        raise
+
+    if first_batch is None:
+        await _close(batches, session)
+        raise NotFoundError(detail="No frames found in this depth range")
+
+    return StreamingResponse(
+        _ndjson_lines(http_request, session, batches, first_batch, color_mapper),
+        media_type=NDJSON_MEDIA_TYPE,
+        headers={"Vary": "Accept"},
+    )
+
+
+async def _ndjson_lines(
+    http_request: Request,
+    session: AsyncSession,
+    batches: AsyncIterator[FrameBatch],
+    batch: FrameBatch,
+    color_mapper: CustomColorMap,
+) -> AsyncIterator[bytes]:
+    """Color-map each batch and yield it as NDJSON until done or disconnected."""
+    try:
+        while batch is not None:
+            if await http_request.is_disconnected():
+                logger.info("Client disconnected, cancelling frame stream")
+                break
+            yield await processing_executor.run(
+                _to_ndjson,
+                color_mapper,
+                batch,
+                work_size=batch.pixels.size,
+            )
+            batch = await anext(batches, None)
+    finally:
+        await _close(batches, session)
+
+
+def _to_ndjson(color_mapper: CustomColorMap, batch: FrameBatch) -> bytes:
+    """Color-map a batch and serialize it as one NDJSON chunk."""
+    rgb_frames = color_mapper.apply(batch.pixels)
+    with stage("serialize"):
+        # Lines keep the float format of ImageResponse.model_dump_json
+        return b"".join(
+            frame_json(_id, depth, pixels, exponent="pydantic") + b"\n"
+            for _id, depth, pixels in zip(
+                batch.ids.tolist(), batch.depths.tolist(), encode_rgb_json(rgb_frames)
+            )
+        )
+
+
+async def _close(batches: AsyncIterator, session: AsyncSession) -> None:
+    """Release the server-side cursor and session, even when cancelled."""
+    with anyio.CancelScope(shield=True):
+        await batches.aclose()
+        await session.close()
@@ -1,3 +1,7 @@
+import asyncio
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
@@ -5,13 +9,13 @@ from src.config.settings import get_settings
 
 settings = get_settings()
 
-# Create async engine
-engine = create_async_engine(
-    settings.DATABASE_URL,
-    pool_size=settings.DB_POOL_SIZE,
-    max_overflow=settings.DB_MAX_OVERFLOW,
-    echo=settings.DEBUG,
-)
+# Create async engine; SQLite (tests, benchmarks) does not take pool sizes
+engine_options = {"echo": settings.DEBUG}
+if make_url(settings.DATABASE_URL).get_backend_name() != "sqlite":
+    engine_options.update(
+        pool_size=settings.DB_POOL_SIZE, max_overflow=settings.DB_MAX_OVERFLOW
+    )
+engine = create_async_engine(settings.DATABASE_URL, **engine_options)
 
 # Create async session factory
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
@@ -24,3 +28,18 @@ async def get_session() -> AsyncSession:
             yield session
         finally:
             await session.close()
+
+
+async def warm_up_pool(connections: int) -> None:
+    """
+    Open pooled connections up front so first requests skip connecting.
+
+    Args:
+        connections: Number of connections to open concurrently
+    """
+
+    async def ping():
+        async with engine.connect() as connection:
+            await connection.execute(text("SELECT 1"))
+
+    await asyncio.gather(*(ping() for _ in range(connections)))
@@ -1,6 +1,6 @@
 import os
 from functools import lru_cache
-from typing import Literal, Optional
+from typing import List, Literal, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -13,6 +13,39 @@ class BaseAppSettings(BaseSettings):
     DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
     DB_POOL_SIZE: Optional[int] = os.getenv("DB_POOL_SIZE", 3)
     DB_MAX_OVERFLOW: Optional[int] = os.getenv("DB_MAX_OVERFLOW", 3)
+    DB_CREATE_SCHEMA_ON_STARTUP: bool = False
+    WARM_COLOR_MAPS: List[str] = ["viridis"]
+    MATERIALIZED_COLOR_MAPS: List[str] = []
+    STREAM_BATCH_SIZE: int = 500
+    MAX_PAGE_SIZE: int = 5000
+    MAX_BATCH_IDS: int = 1000
+    COALESCE_REQUESTS: bool = True
+    DEPTH_INDEX_CHECK_SECONDS: float = 1.0
+    DEPTH_INDEX_RELOAD_SECONDS: float = 60.0
+    RANGE_MAX_FRAMES: int = 50_000
+    RANGE_MAX_BYTES: int = 256 * 1024 * 1024
+    HTTP_CACHE_CONTROL: str = "public, max-age=0, must-revalidate"
+    PROFILE_SAMPLE_RATE: float = 0.0
+    ACCESS_LOG_SAMPLE_RATE: float = 1.0
+    ACCESS_LOG_SLOW_SECONDS: float = 1.0
+    RENDER_MAX_DIMENSION: int = 4096
+    PYRAMID_LEVELS: int = 10
+    PYRAMID_REDUCTIONS: List[Literal["mean", "max"]] = ["mean"]
+    PIXEL_DTYPE: Literal["uint8", "float16"] = "uint8"
+    PIXEL_CODEC: Literal["raw", "zlib", "lz4"] = "raw"
+    FRAME_CACHE_MAX_BYTES: int = 128 * 1024 * 1024
+    FRAME_STORE_BACKEND: Literal["sql", "mmap"] = "sql"
+    FRAME_STORE_DIR: str = "frame_store"
+    INGEST_CHUNK_SIZE: int = 10000
+    INGEST_RESAMPLE_METHOD: Literal["linear", "nearest", "area", "lanczos"] = "linear"
+    INGEST_SPOOL_DIR: str = "uploads"
+    INGEST_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    INGEST_WORKERS: int = 1
+    INGEST_QUEUE_SIZE: int = 16
+    INGEST_JOB_HISTORY: int = 100
+    PROCESSING_BACKEND: Literal["inline", "thread", "process"] = "thread"
+    PROCESSING_POOL_SIZE: int = 4
+    PROCESSING_INLINE_CUTOFF: int = 50_000
 
 
 class LocalSettings(BaseAppSettings):
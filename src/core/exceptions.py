@@ -21,3 +21,13 @@ class NotFoundError(AppException):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=detail,
         )
+
+
+class PayloadTooLargeError(AppException):
+    """Response too large error."""
+
+    def __init__(self, detail: str = "Response too large"):
+        super().__init__(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=detail,
+        )
@@ -1,14 +1,42 @@
+import atexit
 import logging
+import queue
 import sys
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
+from typing import Optional
 
-from src.config.settings import get_settings
+# Background thread writing queued records to the real handlers
+_listener: Optional[QueueListener] = None
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Queue handler that leaves formatting to the listener thread.
+
+    The stdlib handler formats every record before queueing it so it can be
+    pickled; the queue here never leaves the process, so records are passed
+    on untouched and ``%`` interpolation happens off the event loop.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
 
 
 def setup_logging():
-    """Configure application logging."""
-    settings = get_settings()
+    """
+    Configure application logging.
+
+    Records are put on an in-memory queue and written to the log file and
+    stdout by a background thread, so slow disks or pipes do not block the
+    event loop. Call ``stop_logging`` to flush the queue.
+
+    Returns:
+        logging.Logger: The root logger
+    """
+    global _listener
+    stop_logging()
+
     log_dir = Path("logs")
     log_dir.mkdir(exist_ok=True)
     formatter = logging.Formatter(
@@ -26,6 +54,12 @@ def setup_logging():
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
 
+    log_queue = queue.SimpleQueue()
+    _listener = QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+
     # Get root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.INFO)
@@ -33,7 +67,27 @@ def setup_logging():
     # Remove existing handlers
     root_logger.handlers = []
 
-    # Add handlers
-    root_logger.addHandler(file_handler)
-    root_logger.addHandler(console_handler)
+    # The queue handler is the only handler doing work on the caller's thread
+    root_logger.addHandler(DeferredQueueHandler(log_queue))
     return root_logger
+
+
+def stop_logging() -> None:
+    """Write out queued records, stop the listener and close the handlers."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    # Drains the queue before the thread exits
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        if isinstance(handler, QueueHandler):
+            root_logger.removeHandler(handler)
+            handler.close()
+
+
+# Scripts exit without a shutdown hook; flush whatever is still queued
+atexit.register(stop_logging)
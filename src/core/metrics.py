@@ -0,0 +1,204 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+PROMETHEUS_MEDIA_TYPE = "text/plain; version=0.0.4"
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = tuple(1024 * 4**i for i in range(10))  # 1 KiB to 256 MiB
+FRAME_BUCKETS = (1, 10, 100, 500, 1000, 5000, 10000, 50000)
+
+# Per-stage durations of the current request, set only for profiled requests
+_profile: ContextVar[Optional[Dict[str, float]]] = ContextVar("profile", default=None)
+
+
+class Histogram:
+    """Thread-safe cumulative histogram rendered in Prometheus text format."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        buckets: Sequence[float],
+        label_names: Tuple[str, ...] = (),
+    ):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self.label_names = label_names
+        # label values -> [count per bucket incl. +Inf, sum of observations]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        """
+        Record one observation.
+
+        Args:
+            value: Observed value
+            label_values: Values for ``label_names``, in order
+        """
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [
+                    [0] * (len(self.buckets) + 1),
+                    0.0,
+                ]
+            series[0][bucket] += 1
+            series[1] += value
+
+    def render(self) -> List[str]:
+        """Exposition lines for this histogram."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            series = [
+                (labels, list(counts), total)
+                for labels, (counts, total) in self._series.items()
+            ]
+        for label_values, counts, total in sorted(series):
+            labels = [
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.label_names, label_values)
+            ]
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                bucket_labels = ",".join([*labels, f'le="{bound}"'])
+                lines.append(f"{self.name}_bucket{{{bucket_labels}}} {cumulative}")
+            suffix = f"{{{','.join(labels)}}}" if labels else ""
+            lines.append(f"{self.name}_sum{suffix} {total}")
+            lines.append(f"{self.name}_count{suffix} {cumulative}")
+        return lines
+
+
+class Counter:
+    """Thread-safe monotonic counter rendered in Prometheus text format."""
+
+    def __init__(self, name: str, description: str, label_names: Tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.label_names = label_names
+        self._series: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        """
+        Add to the counter.
+
+        Args:
+            label_values: Values for ``label_names``, in order
+            amount: Increment
+        """
+        with self._lock:
+            self._series[label_values] = self._series.get(label_values, 0.0) + amount
+
+    def value(self, *label_values: str) -> float:
+        """Current value of one series, 0 if it was never incremented."""
+        with self._lock:
+            return self._series.get(label_values, 0.0)
+
+    def render(self) -> List[str]:
+        """Exposition lines for this counter."""
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} counter",
+        ]
+        with self._lock:
+            series = sorted(self._series.items())
+        for label_values, total in series:
+            labels = ",".join(
+                f'{name}="{_escape(value)}"'
+                for name, value in zip(self.label_names, label_values)
+            )
+            suffix = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}{suffix} {total}")
+        return lines
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request to sending the last response byte.",
+    LATENCY_BUCKETS,
+    ("method", "route", "status"),
+)
+RESPONSE_SIZE = Histogram(
+    "http_response_size_bytes",
+    "Response body size.",
+    SIZE_BUCKETS,
+    ("method", "route"),
+)
+FRAMES_PER_RESPONSE = Histogram(
+    "frames_per_response",
+    "Frames returned by one frame response.",
+    FRAME_BUCKETS,
+    ("endpoint",),
+)
+STAGE_DURATION = Histogram(
+    "stage_duration_seconds",
+    "Time spent in one processing stage of a request.",
+    LATENCY_BUCKETS,
+    ("stage",),
+)
+COALESCED_REQUESTS = Counter(
+    "coalesced_requests_total",
+    "Requests that ran a computation (leader) or shared another's (follower).",
+    ("endpoint", "role"),
+)
+REGISTRY = [
+    REQUEST_DURATION,
+    RESPONSE_SIZE,
+    FRAMES_PER_RESPONSE,
+    STAGE_DURATION,
+    COALESCED_REQUESTS,
+]
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a processing stage such as ``db_query``, ``decode`` or ``color_map``.
+
+    Args:
+        name: Stage name, used as the ``stage`` label
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_DURATION.observe(elapsed, name)
+        profile = _profile.get()
+        if profile is not None:
+            profile[name] = profile.get(name, 0.0) + elapsed
+
+
+@contextmanager
+def profile_request() -> Iterator[Dict[str, float]]:
+    """
+    Collect the stage durations of the current request.
+
+    Yields:
+        Dict[str, float]: Seconds per stage, filled in as stages finish
+    """
+    profile: Dict[str, float] = {}
+    token = _profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _profile.reset(token)
+
+
+def render_metrics() -> str:
+    """Render every registered metric in Prometheus text format."""
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
@@ -1,45 +1,97 @@
 import logging
+import random
 import time
+from contextlib import nullcontext
 
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from src.config.settings import get_settings
 from src.core.exceptions import AppException
+from src.core.metrics import REQUEST_DURATION, RESPONSE_SIZE, profile_request
 
 logger = logging.getLogger(__name__)
 
 
-class LoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for logging requests and responses."""
+class LoggingMiddleware:
+    """
+    Pure ASGI middleware logging requests and recording latency metrics.
 
-    async def dispatch(self, request: Request, call_next):
-        start_time = time.time()
-        # Log request
-        logger.info(f"Request: {request.method} {request.url}")
+    Unlike ``BaseHTTPMiddleware`` it does not wrap the response in a new
+    stream, so streaming responses pass through untouched and the duration
+    covers sending the last body chunk. Only ``ACCESS_LOG_SAMPLE_RATE`` of
+    requests get an access log line; server errors and requests slower than
+    ``ACCESS_LOG_SLOW_SECONDS`` are always logged.
+    """
 
-        try:
-            response = await call_next(request)
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        settings = get_settings()
+        self.profile_sample_rate = settings.PROFILE_SAMPLE_RATE
+        self.access_log_sample_rate = settings.ACCESS_LOG_SAMPLE_RATE
+        self.slow_request_seconds = settings.ACCESS_LOG_SLOW_SECONDS
 
-            # Log response
-            process_time = time.time() - start_time
-            logger.info(
-                f"Response: {request.method} {request.url} "
-                f"Status: {response.status_code} "
-                f"Duration: {process_time:.3f}s"
-            )
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.perf_counter()
+        method = scope["method"]
+        path = scope["path"]
+        status_code = 500
+        body_bytes = 0
+        logger.debug("Request: %s %s", method, path)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code, body_bytes
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            elif message["type"] == "http.response.body":
+                body_bytes += len(message.get("body", b""))
+            await send(message)
 
-            return response
-        except AppException as e:
-            logger.error(
-                f"Error processing request: {request.method} {request.url} "
-                f"Error: {str(e)}"
+        sampled = random.random() < self.profile_sample_rate
+        with profile_request() if sampled else nullcontext() as profile:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            except AppException as e:
+                logger.error(
+                    "Error processing request: %s %s Error: %s", method, path, e
+                )
+                # Our custom exceptions are already formatted correctly
+                raise e
+            except Exception as e:
+                # Unexpeced errors logging
+                logger.error(
+                    "Error processing request: %s %s Error: %s", method, path, e
+                )
+                raise AppException(status_code=500)
+            finally:
+                process_time = time.perf_counter() - start_time
+                # Route templates keep the label set bounded
+                route = getattr(scope.get("route"), "path", "unmatched")
+                REQUEST_DURATION.observe(process_time, method, route, str(status_code))
+                RESPONSE_SIZE.observe(body_bytes, method, route)
+
+        if status_code >= 500 or process_time >= self.slow_request_seconds:
+            level = logging.WARNING
+        elif random.random() < self.access_log_sample_rate:
+            level = logging.INFO
+        else:
+            level = None
+        if level is not None:
+            logger.log(
+                level,
+                "Response: %s %s Status: %s Duration: %.3fs",
+                method,
+                path,
+                status_code,
+                process_time,
+            )
+        if profile is not None:
+            stages = "".join(
+                f" {name}={seconds:.4f}s" for name, seconds in profile.items()
             )
-            # Our custom exceptions are already formatted correctly
-            raise e
-        except Exception as e:
-            # Unexpeced errors logging
-            logger.error(
-                f"Error processing request: {request.method} {request.url} "
-                f"Error: {str(e)}"
+            logger.info(
+                "Profile: %s %s total=%.4fs%s", method, path, process_time, stages
             )
-            raise AppException(status_code=500)
@@ -1,8 +1,11 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import Hashable, List, Optional, Sequence, Tuple
 
 import numpy as np
 
+from src.domain.services.pyramid import Reduction, bin_rows
+from src.domain.services.resampling import ResampleMethod, resample
+
 
 @dataclass
 class ImageFrame:
@@ -19,22 +22,193 @@ class ImageFrame:
         """Get the width of the image frame."""
         return self.pixel_data.shape[0]
 
-    def resize(self, new_width: int) -> "ImageFrame":
+    def resize(self, new_width: int, method: ResampleMethod = "linear") -> "ImageFrame":
         """
         Create a new ImageFrame with resized pixel data.
 
         Args:
             new_width (int): Target width for the resized image
+            method: Resampling method
 
         Returns:
             ImageFrame: New instance with resized data
         """
-        resized_data = np.interp(
-            np.linspace(0, self.width - 1, new_width),
-            np.arange(self.width),
-            self.pixel_data,
-        )
-        # img = Image.fromarray(self.pixel_data.reshape((1, self.width)))
-        # img_resized = img.resize((1, new_width), Image.LANCZOS)
-        # resized_data = np.array(img_resized).flatten()
+        resized_data = resample(self.pixel_data, new_width, method)
         return ImageFrame(depth=self.depth, pixel_data=resized_data, id=self.id)
+
+
+@dataclass
+class FrameBatch:
+    """
+    Array-backed batch of image frames: one depths array and one contiguous
+    (n_frames, width) pixel matrix instead of an ImageFrame per row.
+    """
+
+    depths: np.ndarray
+    pixels: np.ndarray
+    ids: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self.depths)
+
+    @property
+    def width(self) -> int:
+        """Get the width of the frames in the batch."""
+        return self.pixels.shape[1]
+
+    @classmethod
+    def from_frames(cls, frames: Sequence[ImageFrame]) -> "FrameBatch":
+        """Stack image frames of equal width into a batch."""
+        ids = [frame.id for frame in frames]
+        return cls(
+            depths=np.array([frame.depth for frame in frames], dtype=np.float64),
+            pixels=np.stack([frame.pixel_data for frame in frames]),
+            ids=None if None in ids else np.array(ids, dtype=np.int64),
+        )
+
+    def to_frames(self) -> List[ImageFrame]:
+        """Split the batch into image frames sharing the batch's pixel rows."""
+        ids = self.ids.tolist() if self.ids is not None else [None] * len(self)
+        return [
+            ImageFrame(depth=depth, pixel_data=pixels, id=_id)
+            for depth, pixels, _id in zip(self.depths.tolist(), self.pixels, ids)
+        ]
+
+    def sort_by_depth(self) -> "FrameBatch":
+        """Get the batch ordered by depth."""
+        order = np.argsort(self.depths, kind="stable")
+        return FrameBatch(
+            depths=self.depths[order],
+            pixels=self.pixels[order],
+            ids=None if self.ids is None else self.ids[order],
+        )
+
+    def resize(self, new_width: int, method: ResampleMethod = "linear") -> "FrameBatch":
+        """
+        Create a new FrameBatch with every frame resized in one operation.
+
+        Args:
+            new_width: Target width for the resized frames
+            method: Resampling method
+
+        Returns:
+            FrameBatch: New instance with resized data
+        """
+        if new_width == self.width:
+            return self
+        return FrameBatch(
+            depths=self.depths,
+            pixels=resample(self.pixels, new_width, method),
+            ids=self.ids,
+        )
+
+    def bin_rows(self, rows: int, reduction: Reduction = "mean") -> "FrameBatch":
+        """
+        Create a new FrameBatch of at most ``rows`` rows by binning along depth.
+
+        Args:
+            rows: Most rows to keep
+            reduction: How pixel values in a bin are combined
+
+        Returns:
+            FrameBatch: New instance, each row having the ID of its bin's first
+            frame; the batch itself if it holds at most ``rows`` rows
+        """
+        if len(self) <= rows:
+            return self
+        starts, depths, pixels = bin_rows(self.depths, self.pixels, rows, reduction)
+        return FrameBatch(
+            depths=depths,
+            pixels=pixels,
+            ids=None if self.ids is None else self.ids[starts],
+        )
+
+
+@dataclass(frozen=True)
+class DepthIndex:
+    """
+    Sorted depths of every frame with running pixel counts.
+
+    Answers how many frames a depth range holds, where they start and end
+    and how large they are by binary search, without reading any pixels.
+    """
+
+    # Changes whenever frames are added; opaque outside the repository
+    version: Hashable
+    depths: np.ndarray
+    # pixel_offsets[i] is the number of pixels of the first i frames
+    pixel_offsets: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.depths)
+
+    @classmethod
+    def build(
+        cls, version: Hashable, depths: np.ndarray, widths: np.ndarray
+    ) -> "DepthIndex":
+        """
+        Index frames given in any order.
+
+        Args:
+            version: Version of the frames the arrays were read from
+            depths: Frame depths
+            widths: Pixels per frame
+
+        Returns:
+            DepthIndex: Index of the frames
+        """
+        order = np.argsort(depths, kind="stable")
+        offsets = np.zeros(len(order) + 1, dtype=np.int64)
+        np.cumsum(np.asarray(widths, dtype=np.int64)[order], out=offsets[1:])
+        return cls(version, np.asarray(depths, dtype=np.float64)[order], offsets)
+
+    def extend(
+        self, version: Hashable, depths: np.ndarray, widths: np.ndarray
+    ) -> "DepthIndex":
+        """
+        Index added frames along with the indexed ones.
+
+        Only the added frames are sorted; they are then merged into the
+        indexed depths in one linear pass, after indexed frames of equal depth.
+
+        Args:
+            version: Version of the frames including the added ones
+            depths: Depths of the added frames
+            widths: Pixels per added frame
+
+        Returns:
+            DepthIndex: New index of all frames
+        """
+        order = np.argsort(depths, kind="stable")
+        depths = np.asarray(depths, dtype=np.float64)[order]
+        widths = np.asarray(widths, dtype=np.int64)[order]
+        positions = np.searchsorted(self.depths, depths, side="right")
+        merged_widths = np.insert(np.diff(self.pixel_offsets), positions, widths)
+        offsets = np.zeros(len(merged_widths) + 1, dtype=np.int64)
+        np.cumsum(merged_widths, out=offsets[1:])
+        return DepthIndex(version, np.insert(self.depths, positions, depths), offsets)
+
+    def positions(self, depth_min: float, depth_max: float) -> Tuple[int, int]:
+        """Start and stop positions of ``depth_min <= depth <= depth_max``."""
+        start = int(np.searchsorted(self.depths, depth_min, side="left"))
+        stop = int(np.searchsorted(self.depths, depth_max, side="right"))
+        return start, max(start, stop)
+
+    def count(self, depth_min: float, depth_max: float) -> int:
+        """Number of frames in a depth range."""
+        start, stop = self.positions(depth_min, depth_max)
+        return stop - start
+
+    def pixels(self, depth_min: float, depth_max: float) -> int:
+        """Number of pixels of the frames in a depth range."""
+        start, stop = self.positions(depth_min, depth_max)
+        return int(self.pixel_offsets[stop] - self.pixel_offsets[start])
+
+    def bounds(
+        self, depth_min: float, depth_max: float
+    ) -> Optional[Tuple[float, float]]:
+        """Depths of the first and last frame in a range, None if it is empty."""
+        start, stop = self.positions(depth_min, depth_max)
+        if start == stop:
+            return None
+        return float(self.depths[start]), float(self.depths[stop - 1])
@@ -1,7 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
 
-from src.domain.entities.image import ImageFrame
+from src.domain.entities.image import DepthIndex, FrameBatch, ImageFrame
+from src.domain.services.pyramid import Reduction
+
+# (id, depth, content_hash) of a frame, as used for paging and ETags
+FrameVersion = Tuple[int, float, Optional[str]]
 
 
 class ImageRepository(ABC):
@@ -14,11 +18,85 @@ class ImageRepository(ABC):
 
     @abstractmethod
     async def get_by_depth_range(
-        self, depth_min: float, depth_max: float
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
     ) -> List[ImageFrame]:
         """Retrieve image frames within the specified depth range."""
         pass
 
+    @abstractmethod
+    async def get_batch_by_depth_range(
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> FrameBatch:
+        """Retrieve the frames of a depth range as one batch."""
+        pass
+
+    @abstractmethod
+    async def get_depth_index(
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[FrameVersion]:
+        """Retrieve IDs, depths and content hashes of a depth range."""
+        pass
+
+    @abstractmethod
+    async def get_by_ids(self, ids: Sequence[int]) -> List[ImageFrame]:
+        """Retrieve image frames by their IDs."""
+        pass
+
+    @abstractmethod
+    async def get_batch_by_ids(self, ids: Sequence[int]) -> FrameBatch:
+        """Retrieve image frames by their IDs as one batch."""
+        pass
+
+    @abstractmethod
+    async def get_color_variants(
+        self, ids: Sequence[int], color_map: str
+    ) -> FrameBatch:
+        """Retrieve stored (n_frames, width, 3) RGB renditions of frames."""
+        pass
+
+    @abstractmethod
+    async def get_by_depth_range_at_resolution(
+        self,
+        depth_min: float,
+        depth_max: float,
+        rows: int,
+        reduction: Reduction = "mean",
+        max_frames: Optional[int] = None,
+    ) -> FrameBatch:
+        """Retrieve a depth range from the coarsest level holding ``rows``."""
+        pass
+
+    @abstractmethod
+    def stream_by_depth_range(
+        self, depth_min: float, depth_max: float, batch_size: int
+    ) -> AsyncIterator[FrameBatch]:
+        """Stream image frames within the specified depth range in batches."""
+        pass
+
+    @abstractmethod
+    async def refresh_depth_index(
+        self, index: Optional[DepthIndex] = None
+    ) -> DepthIndex:
+        """Get an up-to-date depth index, ``index`` itself if it is current."""
+        pass
+
+    @abstractmethod
+    async def get_version(self, _id: int) -> Optional[FrameVersion]:
+        """Retrieve the ID, depth and content hash of a frame."""
+        pass
+
     @abstractmethod
     async def get_by_id(self, _id: int) -> Optional[ImageFrame]:
         """Retrieve an image frame by its ID."""
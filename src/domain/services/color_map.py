@@ -1,8 +1,121 @@
+import threading
 from abc import ABC, abstractmethod
+from typing import Dict, Iterable
 
-import matplotlib.pyplot as plt
 import numpy as np
 
+from src.core.metrics import stage
+
+# Color mapping list
+COLOR_MAPS = [
+    "magma",
+    "inferno",
+    "plasma",
+    "viridis",
+    "cividis",
+    "twilight",
+    "twilight_shifted",
+    "turbo",
+    "Blues",
+    "BrBG",
+    "BuGn",
+]
+DEFAULT_COLOR_MAP = "viridis"
+
+# Grayscale input covers 0-255. Lookup tables hold the colormap's own entries
+# (256 for most, 510 for the twilight maps) plus one "bad" entry at the end
+# that NaN pixels are routed to.
+LUT_LEVELS = 256
+
+_lut_cache: Dict[str, np.ndarray] = {}
+_lut_lock = threading.Lock()
+
+
+def _compile_lut(name: str) -> np.ndarray:
+    """
+    Compile a matplotlib colormap into a uint8 RGB lookup table.
+
+    Row ``i`` holds the colormap's ``i``-th color, so indexing the table with
+    the bins matplotlib computes reproduces its output.
+
+    Args:
+        name: Name of a matplotlib colormap
+
+    Returns:
+        np.ndarray: Read-only (N + 1, 3) uint8 table, the last row being the
+        bad color
+    """
+    # Imported here so only LUT compilation pays for matplotlib
+    from matplotlib import colormaps
+
+    cmap = colormaps[name]
+    rgba = np.vstack([cmap(np.arange(cmap.N)), cmap.get_bad()])
+    lut = (rgba[:, :3] * 255).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+def get_lut(name: str) -> np.ndarray:
+    """
+    Get the compiled lookup table for a colormap, compiling it once per process.
+
+    Args:
+        name: Colormap name from COLOR_MAPS
+
+    Returns:
+        np.ndarray: Read-only (N + 1, 3) uint8 lookup table
+    """
+    lut = _lut_cache.get(name)
+    if lut is None:
+        if name not in COLOR_MAPS:
+            raise ValueError(f"Unsupported color map: {name}")
+        with _lut_lock:
+            lut = _lut_cache.get(name)
+            if lut is None:
+                lut = _lut_cache[name] = _compile_lut(name)
+    return lut
+
+
+def warm_luts(names: Iterable[str]) -> None:
+    """Compile lookup tables ahead of the first request that needs them."""
+    for name in names:
+        get_lut(name)
+
+
+def quantize(pixel_data: np.ndarray, levels: int = LUT_LEVELS) -> np.ndarray:
+    """
+    Quantize grayscale pixel data into lookup table indices.
+
+    Values are binned the way matplotlib bins ``x / 255``: scaled by
+    ``levels`` and truncated, with 255 itself in the top bin, and clipped to
+    the table. NaN values are mapped to the bad-color index ``levels``.
+
+    Args:
+        pixel_data: Grayscale data of any shape and numeric dtype
+        levels: Number of colors in the lookup table
+
+    Returns:
+        np.ndarray: Index array with the same shape as the input
+    """
+    if levels == LUT_LEVELS:
+        # One bin per integer, so integers index the table directly
+        if pixel_data.dtype == np.uint8:
+            return pixel_data
+        if pixel_data.dtype.kind in "iu":
+            return np.clip(pixel_data, 0, levels - 1).astype(np.intp)
+
+    nan_mask = np.isnan(pixel_data) if pixel_data.dtype.kind == "f" else None
+    # Same operation order as Colormap.__call__, so bin edges agree exactly
+    indices = np.divide(pixel_data, LUT_LEVELS - 1, dtype=np.float64)
+    indices *= levels
+    np.nan_to_num(indices, copy=False, nan=0.0)
+    np.floor(indices, out=indices)
+    np.clip(indices, 0, levels - 1, out=indices)
+    indices = indices.astype(np.intp)
+    if nan_mask is not None and nan_mask.any():
+        indices[nan_mask] = levels
+    return indices
+
 
 class ColorMap(ABC):
     @abstractmethod
@@ -11,27 +124,30 @@ class ColorMap(ABC):
 
 
 class CustomColorMap(ColorMap):
-    """Implementation of color mapping."""
+    """Implementation of color mapping backed by precompiled lookup tables."""
 
-    def __init__(self, color_map="viridis"):
+    def __init__(self, color_map=DEFAULT_COLOR_MAP):
         """
         Initialize with color mapping.
         """
-        self.color_map = plt.cm.get_cmap(color_map)
+        self.name = color_map
+        self.lut = get_lut(color_map)
+        self.levels = len(self.lut) - 1
 
     def apply(self, pixel_data: np.ndarray) -> np.ndarray:
         """
-        Apply color mapping to normalized pixel data.
+        Apply color mapping to grayscale pixel data.
+
+        Works on a single frame of shape (width,) as well as on a stacked
+        depth range of shape (n_frames, width) in one vectorized lookup.
 
         Args:
             pixel_data: Input grayscale image data (0-255)
 
         Returns:
-            np.ndarray: RGB color-mapped image data
+            np.ndarray: RGB uint8 data with a trailing channel axis
         """
-        # Normalize input data to 0-1 range for matplot
-        normalized = pixel_data.astype(float) / 255.0
-        colored_pixels = self.color_map(normalized)
-        # Convert RGBA to RGB uint8. Easier to use uint8 type data for general processing
-        rgb_pixels = (colored_pixels[:, :3] * 255).astype(np.uint8)
-        return rgb_pixels
+        with stage("color_map"):
+            return np.take(
+                self.lut, quantize(np.asarray(pixel_data), self.levels), axis=0
+            )
@@ -0,0 +1,36 @@
+from typing import Optional
+
+import numpy as np
+
+from src.domain.services.color_map import ColorMap
+from src.domain.services.resampling import ResampleMethod, resample
+
+
+def render_depth_log(
+    pixels: np.ndarray,
+    color_map: ColorMap,
+    height: Optional[int] = None,
+    width: Optional[int] = None,
+    method: ResampleMethod = "linear",
+) -> np.ndarray:
+    """
+    Render a stacked depth range as one RGB image.
+
+    Resampling runs on the grayscale matrix before color mapping, so only
+    the output rows are looked up.
+
+    Args:
+        pixels: Grayscale matrix of shape (n_frames, frame_width)
+        color_map: Color map applied to the resampled matrix
+        height: Output rows along the depth axis, defaults to n_frames
+        width: Output columns along the pixel axis, defaults to frame_width
+        method: Resampling method for both axes
+
+    Returns:
+        np.ndarray: uint8 RGB image of shape (height, width, 3)
+    """
+    if height is not None and height != pixels.shape[0]:
+        pixels = resample(pixels, height, method, axis=0)
+    if width is not None and width != pixels.shape[1]:
+        pixels = resample(pixels, width, method, axis=1)
+    return color_map.apply(pixels)
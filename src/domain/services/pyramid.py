@@ -0,0 +1,96 @@
+from typing import Iterator, Literal, Tuple
+
+import numpy as np
+
+Reduction = Literal["mean", "max"]
+
+
+def downsample_by_two(
+    depths: np.ndarray, pixels: np.ndarray, reduction: Reduction = "mean"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Bin consecutive depth rows in pairs.
+
+    An odd trailing row forms a bin on its own. Bin depths are always the
+    mean of their rows; pixels are reduced with ``reduction``.
+
+    Args:
+        depths: Depths sorted ascending, shape (n_frames,)
+        pixels: Grayscale matrix of shape (n_frames, width)
+        reduction: How pixel values in a bin are combined
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Binned depths and pixel matrix
+    """
+    if len(depths) % 2:
+        depths = np.append(depths, depths[-1])
+        pixels = np.vstack([pixels, pixels[-1:]])
+
+    binned_depths = depths.reshape(-1, 2).mean(axis=1)
+    pairs = pixels.reshape(-1, 2, pixels.shape[1])
+    if reduction == "max":
+        binned_pixels = pairs.max(axis=1)
+    else:
+        binned_pixels = pairs.mean(axis=1)
+    return binned_depths, binned_pixels
+
+
+def bin_rows(
+    depths: np.ndarray, pixels: np.ndarray, bins: int, reduction: Reduction = "mean"
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Bin consecutive depth rows into ``bins`` bins of near-equal size.
+
+    Bin depths are the mean of their rows; pixels are reduced with
+    ``reduction``. Inputs with at most ``bins`` rows are returned as they are.
+
+    Args:
+        depths: Depths sorted ascending, shape (n_frames,)
+        pixels: Grayscale matrix of shape (n_frames, width)
+        bins: Number of output rows
+        reduction: How pixel values in a bin are combined
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Position of each bin's first
+        row, binned depths and binned pixel matrix
+    """
+    if len(depths) <= bins:
+        return np.arange(len(depths)), depths, pixels
+
+    starts = np.linspace(0, len(depths), bins, endpoint=False).astype(np.intp)
+    counts = np.diff(np.append(starts, len(depths)))
+    binned_depths = np.add.reduceat(depths, starts) / counts
+    if reduction == "max":
+        binned_pixels = np.maximum.reduceat(pixels, starts, axis=0)
+    else:
+        binned_pixels = np.add.reduceat(pixels, starts, axis=0, dtype=np.float64)
+        binned_pixels /= counts[:, np.newaxis]
+    return starts, binned_depths, binned_pixels
+
+
+def build_pyramid(
+    depths: np.ndarray,
+    pixels: np.ndarray,
+    max_levels: int,
+    reduction: Reduction = "mean",
+) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Build level-of-detail levels, each halving the number of depth rows.
+
+    Level 0 is the full-resolution input and is not yielded. Building stops
+    after ``max_levels`` levels or once a level holds a single row.
+
+    Args:
+        depths: Depths sorted ascending, shape (n_frames,)
+        pixels: Grayscale matrix of shape (n_frames, width)
+        max_levels: Maximum number of levels to build
+        reduction: How pixel values in a bin are combined
+
+    Yields:
+        Tuple[int, np.ndarray, np.ndarray]: Level number, depths and pixels
+    """
+    for level in range(1, max_levels + 1):
+        if len(depths) <= 1:
+            break
+        depths, pixels = downsample_by_two(depths, pixels, reduction)
+        yield level, depths, pixels
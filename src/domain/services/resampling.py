@@ -0,0 +1,117 @@
+from functools import lru_cache
+from typing import Literal, Tuple
+
+import numpy as np
+
+ResampleMethod = Literal["linear", "nearest", "area", "lanczos"]
+RESAMPLE_METHODS = ["linear", "nearest", "area", "lanczos"]
+
+LANCZOS_LOBES = 3
+
+
+@lru_cache(maxsize=128)
+def resample_weights(
+    source_size: int, target_size: int, method: ResampleMethod = "linear"
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Precompute source indices and weights for resampling one axis.
+
+    ``linear`` and ``nearest`` sample evenly spaced positions from the first
+    to the last source element, matching ``np.interp`` on
+    ``np.linspace(0, source_size - 1, target_size)``. ``area`` and
+    ``lanczos`` treat elements as pixel areas with centers at ``i + 0.5``:
+    ``area`` averages by exact overlap and ``lanczos`` uses a 3-lobe window
+    truncated at the borders. Results are cached per arguments.
+
+    Args:
+        source_size: Number of elements along the source axis
+        target_size: Number of elements along the target axis
+        method: Resampling method
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Read-only (target_size, taps) index and
+        float64 weight arrays; each weight row sums to 1
+    """
+    if method == "linear":
+        positions = np.linspace(0, source_size - 1, target_size)
+        lower = np.floor(positions).astype(np.intp)
+        upper = np.minimum(lower + 1, source_size - 1)
+        fraction = positions - lower
+        indices = np.stack([lower, upper], axis=1)
+        weights = np.stack([1 - fraction, fraction], axis=1)
+    elif method == "nearest":
+        positions = np.linspace(0, source_size - 1, target_size)
+        indices = np.rint(positions).astype(np.intp)[:, np.newaxis]
+        weights = np.ones_like(indices, dtype=np.float64)
+    elif method == "area":
+        indices, weights = _area_weights(source_size, target_size)
+    elif method == "lanczos":
+        indices, weights = _lanczos_weights(source_size, target_size)
+    else:
+        raise ValueError(f"Unsupported resampling method: {method}")
+
+    indices.flags.writeable = False
+    weights.flags.writeable = False
+    return indices, weights
+
+
+def _area_weights(source_size: int, target_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Weights proportional to the overlap of source and target pixel areas."""
+    scale = source_size / target_size
+    starts = np.arange(target_size) * scale
+    ends = starts + scale
+    taps = int(np.ceil(scale)) + 1
+
+    indices = np.floor(starts).astype(np.intp)[:, np.newaxis] + np.arange(taps)
+    overlap = np.minimum(ends[:, np.newaxis], indices + 1) - np.maximum(
+        starts[:, np.newaxis], indices
+    )
+    weights = np.clip(overlap, 0, None)
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.clip(indices, 0, source_size - 1), weights
+
+
+def _lanczos_weights(
+    source_size: int, target_size: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Lanczos windowed-sinc weights, widened by the scale when downsampling."""
+    scale = source_size / target_size
+    stretch = max(scale, 1.0)
+    support = LANCZOS_LOBES * stretch
+    centers = (np.arange(target_size) + 0.5) * scale - 0.5
+    taps = int(np.ceil(2 * support)) + 1
+
+    first = np.floor(centers - support).astype(np.intp) + 1
+    indices = first[:, np.newaxis] + np.arange(taps)
+    distance = (indices - centers[:, np.newaxis]) / stretch
+    weights = np.sinc(distance) * np.sinc(distance / LANCZOS_LOBES)
+    weights[np.abs(distance) >= LANCZOS_LOBES] = 0.0
+    # Truncate the window at the borders and renormalize, as Pillow does
+    weights[(indices < 0) | (indices >= source_size)] = 0.0
+    weights /= weights.sum(axis=1, keepdims=True)
+    return np.clip(indices, 0, source_size - 1), weights
+
+
+def resample(
+    matrix: np.ndarray,
+    target_size: int,
+    method: ResampleMethod = "linear",
+    axis: int = -1,
+) -> np.ndarray:
+    """
+    Resample a matrix along one axis in a single vectorized gather.
+
+    Args:
+        matrix: Input array, e.g. (n_frames, width)
+        target_size: Number of samples along ``axis`` in the output
+        method: Resampling method
+        axis: Axis to resample
+
+    Returns:
+        np.ndarray: float64 array with ``target_size`` samples along ``axis``
+    """
+    indices, weights = resample_weights(matrix.shape[axis], target_size, method)
+    moved = np.moveaxis(np.asarray(matrix, dtype=np.float64), axis, -1)
+    # (..., target_size, taps) gathered samples reduced against the weights
+    resampled = np.einsum("...tk,tk->...t", moved[..., indices], weights)
+    return np.moveaxis(resampled, -1, axis)
@@ -0,0 +1,182 @@
+import hashlib
+import zlib
+from typing import Dict, List, Literal, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # lz4 is optional
+    lz4_frame = None
+
+PixelDType = Literal["uint8", "float16"]
+Codec = Literal["raw", "zlib", "lz4"]
+
+# Rows written before dtype/codec columns existed hold raw float64 pixels
+LEGACY_DTYPE = "float64"
+LEGACY_CODEC = "raw"
+
+
+def quantize_pixels(pixels: np.ndarray, dtype: PixelDType = "uint8") -> np.ndarray:
+    """
+    Convert pixel data of any shape to the storage dtype.
+
+    ``uint8`` rounds and clips values to 0-255 (NaN becomes 0); use
+    ``float16`` where fractional values or NaN must survive.
+    """
+    pixels = np.asarray(pixels)
+    if dtype == "uint8":
+        if pixels.dtype == np.uint8:
+            return pixels
+        return np.clip(np.rint(np.nan_to_num(pixels)), 0, 255).astype(np.uint8)
+    return pixels.astype(np.float16)
+
+
+def compress(blob: bytes, codec: Codec = "raw") -> bytes:
+    """Compress a pixel blob with the given codec."""
+    if codec == "zlib":
+        return zlib.compress(blob, 1)
+    if codec == "lz4":
+        if lz4_frame is None:
+            raise ValueError("The lz4 codec requires the lz4 package")
+        return lz4_frame.compress(blob)
+    return blob
+
+
+def hash_pixels(raw: bytes, dtype: str) -> str:
+    """
+    Hash quantized pixel bytes, independently of the compression codec.
+
+    Args:
+        raw: Uncompressed pixel bytes in the storage dtype
+        dtype: Storage dtype
+
+    Returns:
+        str: 32 character hex digest
+    """
+    digest = hashlib.blake2b(dtype.encode("ascii"), digest_size=16)
+    digest.update(raw)
+    return digest.hexdigest()
+
+
+def encode_pixels(
+    pixels: np.ndarray, dtype: PixelDType = "uint8", codec: Codec = "raw"
+) -> Dict[str, object]:
+    """
+    Quantize and compress pixel data for storage.
+
+    Args:
+        pixels: Grayscale pixel data of shape (width,)
+        dtype: Storage dtype
+        codec: Compression codec
+
+    Returns:
+        Dict[str, object]: Column values for pixel_data, dtype, width, codec
+        and content_hash
+    """
+    pixels = quantize_pixels(pixels, dtype)
+    raw = pixels.tobytes()
+    return {
+        "pixel_data": compress(raw, codec),
+        "dtype": dtype,
+        "width": pixels.size,
+        "codec": codec,
+        "content_hash": hash_pixels(raw, dtype),
+    }
+
+
+def encode_pixel_rows(
+    pixels: np.ndarray, dtype: PixelDType = "uint8", codec: Codec = "raw"
+) -> List[Tuple[bytes, str]]:
+    """
+    Quantize a (n_frames, width) matrix once and encode each row as a blob.
+
+    Args:
+        pixels: Grayscale matrix of shape (n_frames, width)
+        dtype: Storage dtype
+        codec: Compression codec
+
+    Returns:
+        List[Tuple[bytes, str]]: (pixel_data, content_hash) per row
+    """
+    matrix = np.ascontiguousarray(quantize_pixels(pixels, dtype))
+    rows = [row.tobytes() for row in matrix]
+    return [(compress(raw, codec), hash_pixels(raw, dtype)) for raw in rows]
+
+
+def decompress(blob: bytes, codec: Optional[str] = None) -> bytes:
+    """Decompress a stored pixel blob, None meaning a legacy raw row."""
+    codec = codec or LEGACY_CODEC
+    if codec == "zlib":
+        return zlib.decompress(blob)
+    if codec == "lz4":
+        if lz4_frame is None:
+            raise ValueError("The lz4 codec requires the lz4 package")
+        return lz4_frame.decompress(blob)
+    return blob
+
+
+def decode_pixels(
+    blob: bytes,
+    dtype: Optional[str] = None,
+    width: Optional[int] = None,
+    codec: Optional[str] = None,
+) -> np.ndarray:
+    """
+    Decode stored pixel data into a read-only array.
+
+    Uncompressed blobs are wrapped with ``np.frombuffer`` without copying.
+
+    Args:
+        blob: Stored pixel bytes
+        dtype: Storage dtype, None for legacy rows
+        width: Number of pixels, checked when present
+        codec: Compression codec, None for legacy rows
+
+    Returns:
+        np.ndarray: Pixel data of shape (width,)
+    """
+    pixels = np.frombuffer(decompress(blob, codec), dtype=dtype or LEGACY_DTYPE)
+    if width is not None and pixels.size != width:
+        raise ValueError(f"Expected {width} pixels, got {pixels.size}")
+    return pixels
+
+
+def decode_pixel_rows(
+    rows: Sequence[Tuple[bytes, Optional[str], Optional[int], Optional[str]]]
+) -> np.ndarray:
+    """
+    Decode stored rows into one preallocated (n_rows, width) matrix.
+
+    Rows stored in the matrix dtype are copied byte for byte into their row,
+    without an intermediate array per row; other rows are cast on the way.
+
+    Args:
+        rows: (pixel_data, dtype, width, codec) per row, as stored
+
+    Returns:
+        np.ndarray: Pixel matrix in the widest dtype among the rows
+
+    Raises:
+        ValueError: If rows have different widths
+    """
+    if not rows:
+        return np.empty((0, 0), dtype=np.uint8)
+    dtype = np.result_type(*{row[1] or LEGACY_DTYPE for row in rows})
+    _, first_dtype, width, first_codec = rows[0]
+    if width is None:
+        width = decode_pixels(rows[0][0], first_dtype, None, first_codec).size
+
+    pixels = np.empty((len(rows), width), dtype=dtype)
+    row_bytes = pixels.view(np.uint8).reshape(len(rows), width * dtype.itemsize)
+    for position, (blob, row_dtype, row_width, codec) in enumerate(rows):
+        if row_width is not None and row_width != width:
+            raise ValueError(f"Expected {width} pixels, got {row_width}")
+        if np.dtype(row_dtype or LEGACY_DTYPE) == dtype:
+            raw = decompress(blob, codec)
+            if len(raw) != row_bytes.shape[1]:
+                raise ValueError(f"Expected {row_bytes.shape[1]} bytes, got {len(raw)}")
+            row_bytes[position] = np.frombuffer(raw, dtype=np.uint8)
+        else:
+            pixels[position] = decode_pixels(blob, row_dtype, width, codec)
+    return pixels
@@ -1,14 +1,63 @@
-from sqlalchemy import Column, Float, Integer, LargeBinary
+from sqlalchemy import Column, Float, ForeignKey, Index, Integer, LargeBinary, String
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
 
 
-class ImageModel(Base):
+class PixelStorageMixin:
+    """Pixel blob with the metadata needed to decode it.
+
+    Rows with NULL metadata predate these columns and hold raw float64 pixels.
+    """
+
+    pixel_data = Column(LargeBinary, nullable=False)
+    dtype = Column(String(8), nullable=True)
+    width = Column(Integer, nullable=True)
+    codec = Column(String(8), nullable=True)
+    # Hash of the quantized pixels, used to derive HTTP ETags
+    content_hash = Column(String(32), nullable=True)
+
+
+class ImageModel(PixelStorageMixin, Base):
     """SQLAlchemy model for storing image frames."""
 
     __tablename__ = "image_frames"
+    # Keyset pagination walks (depth, id), so a page is one index range scan
+    __table_args__ = (Index("ix_image_frames_depth_id", "depth", "id"),)
 
     id = Column(Integer, primary_key=True)
-    depth = Column(Float, index=True, nullable=False)
-    pixel_data = Column(LargeBinary, nullable=False)
+    depth = Column(Float, nullable=False)
+
+
+class ImageLevelModel(PixelStorageMixin, Base):
+    """SQLAlchemy model for downsampled depth pyramid levels of image frames."""
+
+    __tablename__ = "image_frame_levels"
+    __table_args__ = (
+        Index("ix_image_frame_levels_level_depth", "reduction", "level", "depth"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    level = Column(Integer, nullable=False)
+    reduction = Column(String(8), nullable=False, default="mean")
+    depth = Column(Float, nullable=False)
+
+
+class ColorVariantModel(Base):
+    """SQLAlchemy model for frames stored already color-mapped.
+
+    ``rgb`` holds the uint8 (width, 3) output of the color map applied to the
+    stored pixels, compressed with ``codec``.
+    """
+
+    __tablename__ = "image_frame_colors"
+
+    frame_id = Column(
+        Integer,
+        ForeignKey("image_frames.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    color_map = Column(String(32), primary_key=True)
+    rgb = Column(LargeBinary, nullable=False)
+    width = Column(Integer, nullable=False)
+    codec = Column(String(8), nullable=False)
@@ -1,19 +1,245 @@
-from typing import List, Optional
+import functools
+from typing import AsyncIterator, Dict, List, Optional, Sequence, Tuple
 
 import numpy as np
-from sqlalchemy import and_, select
+from sqlalchemy import (
+    Integer,
+    and_,
+    any_,
+    bindparam,
+    func,
+    insert,
+    select,
+    text,
+    tuple_,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
 
-from src.domain.entities.image import ImageFrame
-from src.domain.interfaces.repositories import ImageRepository
-from src.infrastructure.database.models import ImageModel
+from src.config.settings import get_settings
+from src.core.exceptions import PayloadTooLargeError
+from src.core.metrics import stage
+from src.domain.entities.image import DepthIndex, FrameBatch, ImageFrame
+from src.domain.interfaces.repositories import FrameVersion, ImageRepository
+from src.domain.services.pyramid import Reduction
+from src.infrastructure.database.codecs import (
+    Codec,
+    PixelDType,
+    compress,
+    decode_pixel_rows,
+    decode_pixels,
+    encode_pixel_rows,
+    encode_pixels,
+)
+from src.infrastructure.database.models import (
+    ColorVariantModel,
+    ImageLevelModel,
+    ImageModel,
+)
+from src.infrastructure.services.depth_index import depth_index
+from src.infrastructure.services.frame_cache import frame_cache
+
+
+def _frame_columns(model) -> tuple:
+    """Columns needed to decode frames, selected without ORM entities."""
+    return (
+        model.id,
+        model.depth,
+        model.pixel_data,
+        model.dtype,
+        model.width,
+        model.codec,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _depth_range_query(index_only: bool, paged: bool, limited: bool) -> Select:
+    """
+    Build a depth range query once per shape, every value a bound parameter.
+
+    Reusing the statement object skips rebuilding it per request and keeps
+    SQLAlchemy's compiled statement cache hit.
+
+    Args:
+        index_only: Select (id, depth, content_hash) instead of frame columns
+        paged: Continue after the ``after_depth``/``after_id`` keyset
+        limited: Apply the ``limit`` parameter
+
+    Returns:
+        Select: Query ordered by (depth, id), served by a range scan of the
+        (depth, id) index
+    """
+    if index_only:
+        columns = (ImageModel.id, ImageModel.depth, ImageModel.content_hash)
+    else:
+        columns = _frame_columns(ImageModel)
+    query = select(*columns).where(
+        and_(
+            ImageModel.depth >= bindparam("depth_min"),
+            ImageModel.depth <= bindparam("depth_max"),
+        )
+    )
+    if paged:
+        query = query.where(
+            tuple_(ImageModel.depth, ImageModel.id)
+            > tuple_(bindparam("after_depth"), bindparam("after_id"))
+        )
+    query = query.order_by(ImageModel.depth, ImageModel.id)
+    if limited:
+        query = query.limit(bindparam("limit", type_=Integer))
+    return query
+
+
+def _ids_condition(column, postgresql: bool):
+    """Condition matching ``column`` against the ``ids`` parameter."""
+    if postgresql:
+        # One array parameter keeps a single cached statement for any count
+        return column == any_(bindparam("ids", type_=ARRAY(Integer)))
+    return column.in_(bindparam("ids", expanding=True))
+
+
+@functools.lru_cache(maxsize=None)
+def _ids_query(postgresql: bool) -> Select:
+    """Query for frames by the ``ids`` parameter."""
+    return select(*_frame_columns(ImageModel)).where(
+        _ids_condition(ImageModel.id, postgresql)
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _color_variants_query(postgresql: bool) -> Select:
+    """Query for stored renditions of the ``ids`` frames in ``color_map``."""
+    return (
+        select(
+            ImageModel.id,
+            ImageModel.depth,
+            ColorVariantModel.rgb,
+            ColorVariantModel.width,
+            ColorVariantModel.codec,
+        )
+        .join(ColorVariantModel, ColorVariantModel.frame_id == ImageModel.id)
+        .where(
+            and_(
+                _ids_condition(ColorVariantModel.frame_id, postgresql),
+                ColorVariantModel.color_map == bindparam("color_map"),
+            )
+        )
+    )
+
+
+_ID_QUERY = select(*_frame_columns(ImageModel)).where(ImageModel.id == bindparam("id"))
+_VERSION_QUERY = select(ImageModel.id, ImageModel.depth, ImageModel.content_hash).where(
+    ImageModel.id == bindparam("id")
+)
+_MAX_ID_QUERY = select(func.max(ImageModel.id))
+_DEPTH_WIDTH_QUERY = select(
+    ImageModel.depth,
+    # Legacy rows have no width; their raw float64 blobs hold 8 bytes a pixel
+    func.coalesce(ImageModel.width, func.length(ImageModel.pixel_data) // 8),
+).where(ImageModel.id > bindparam("after"))
+_LEVEL_QUERY = (
+    select(*_frame_columns(ImageLevelModel))
+    .where(
+        and_(
+            ImageLevelModel.reduction == bindparam("reduction"),
+            ImageLevelModel.level == bindparam("level"),
+            ImageLevelModel.depth >= bindparam("depth_min"),
+            ImageLevelModel.depth <= bindparam("depth_max"),
+        )
+    )
+    .order_by(ImageLevelModel.depth)
+)
+_LEVEL_COUNT_QUERY = select(func.count()).where(
+    and_(
+        ImageLevelModel.reduction == bindparam("reduction"),
+        ImageLevelModel.level == bindparam("level"),
+        ImageLevelModel.depth >= bindparam("depth_min"),
+        ImageLevelModel.depth <= bindparam("depth_max"),
+    )
+)
 
 
 class SQLAlchemyImageRepository(ImageRepository):
     """Implementation of ImageRepository using SQLAlchemy."""
 
-    def __init__(self, session: AsyncSession):
+    def __init__(
+        self,
+        session: AsyncSession,
+        pixel_dtype: Optional[PixelDType] = None,
+        codec: Optional[Codec] = None,
+    ):
+        settings = get_settings()
         self.session = session
+        self.pixel_dtype = pixel_dtype or settings.PIXEL_DTYPE
+        self.codec = codec or settings.PIXEL_CODEC
+
+    def _encode(self, pixels: np.ndarray) -> dict:
+        """Column values for storing pixels with the configured dtype and codec."""
+        return encode_pixels(pixels, self.pixel_dtype, self.codec)
+
+    @staticmethod
+    def _to_frame(row) -> ImageFrame:
+        """Build an ImageFrame from a model or a row with the same columns."""
+        return ImageFrame(
+            id=row.id,
+            depth=row.depth,
+            pixel_data=decode_pixels(row.pixel_data, row.dtype, row.width, row.codec),
+        )
+
+    async def _execute(self, query, params: Optional[Dict[str, object]] = None):
+        """Execute a read query, timed as the ``db_query`` stage."""
+        with stage("db_query"):
+            return await self.session.execute(query, params)
+
+    @staticmethod
+    def _to_batch(rows: Sequence) -> FrameBatch:
+        """
+        Decode rows of ``_frame_columns`` into one batch in a single pass.
+
+        Timed as the ``decode`` stage.
+
+        Args:
+            rows: (id, depth, pixel_data, dtype, width, codec) rows
+
+        Returns:
+            FrameBatch: IDs, depths and one contiguous pixel matrix
+        """
+        with stage("decode"):
+            return FrameBatch(
+                ids=np.fromiter((row[0] for row in rows), np.int64, len(rows)),
+                depths=np.fromiter((row[1] for row in rows), np.float64, len(rows)),
+                pixels=decode_pixel_rows([row[2:] for row in rows]),
+            )
+
+    async def _select_range(
+        self,
+        index_only: bool,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int],
+        after: Optional[Tuple[float, int]],
+    ):
+        """
+        Run the depth range query matching the paging arguments.
+
+        Args:
+            index_only: Select (id, depth, content_hash) instead of frames
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            limit: Maximum number of rows, None for no limit
+            after: (depth, id) of the last row of the previous page
+
+        Returns:
+            Result: Rows ordered by (depth, id)
+        """
+        query = _depth_range_query(index_only, after is not None, limit is not None)
+        params = {"depth_min": depth_min, "depth_max": depth_max}
+        if after is not None:
+            params["after_depth"], params["after_id"] = after
+        if limit is not None:
+            params["limit"] = limit
+        return await self._execute(query, params)
 
     async def bulk_save(self, frames: List[ImageFrame]) -> None:
         """
@@ -23,11 +249,257 @@ class SQLAlchemyImageRepository(ImageRepository):
             frames: List of ImageFrame to bulk save for large data population
         """
         models = [
-            ImageModel(depth=image.depth, pixel_data=image.pixel_data.tobytes())
+            ImageModel(depth=image.depth, **self._encode(image.pixel_data))
             for image in frames
         ]
         self.session.add_all(models)
         await self.session.commit()
+        # Rows are only inserted, under new IDs, so no cached frame is stale
+        depth_index.invalidate()
+
+    async def bulk_save_level(
+        self,
+        level: int,
+        reduction: Reduction,
+        depths: np.ndarray,
+        pixels: np.ndarray,
+    ) -> None:
+        """
+        Save one downsampled depth pyramid level.
+
+        Args:
+            level: Pyramid level, each level halving the rows of the previous one
+            reduction: Reduction used to bin the pixel values
+            depths: Binned depths, shape (n_rows,)
+            pixels: Binned grayscale matrix of shape (n_rows, width)
+        """
+        models = [
+            ImageLevelModel(
+                level=level,
+                reduction=reduction,
+                depth=float(depth),
+                **self._encode(row),
+            )
+            for depth, row in zip(depths, pixels)
+        ]
+        self.session.add_all(models)
+        await self.session.commit()
+        depth_index.invalidate()
+
+    def frame_records(
+        self, depths: np.ndarray, pixels: np.ndarray, **constants
+    ) -> List[dict]:
+        """
+        Encode rows of frames or pyramid levels into column dicts.
+
+        CPU-bound and free of I/O, so bulk loaders can run it in a worker
+        thread and only await the write.
+
+        Args:
+            depths: Row depths
+            pixels: Grayscale matrix with one row per depth
+            constants: Column values shared by every row, such as a level
+
+        Returns:
+            List[dict]: One record per row, for copy_frame_records or
+            copy_level_records
+        """
+        encoded = encode_pixel_rows(pixels, self.pixel_dtype, self.codec)
+        shared = {
+            "dtype": self.pixel_dtype,
+            "width": pixels.shape[1],
+            "codec": self.codec,
+            **constants,
+        }
+        return [
+            {
+                "depth": float(depth),
+                "pixel_data": blob,
+                "content_hash": content_hash,
+                **shared,
+            }
+            for depth, (blob, content_hash) in zip(depths, encoded)
+        ]
+
+    def color_variant_records(self, color_map: str, rgb: np.ndarray) -> List[dict]:
+        """
+        Encode color-mapped renditions into column dicts, without frame IDs.
+
+        Args:
+            color_map: Color map the renditions were made with
+            rgb: uint8 array of shape (n_frames, width, 3), the color map
+                applied to the frames' stored pixels
+
+        Returns:
+            List[dict]: One record per frame, for copy_color_variant_records
+        """
+        width = rgb.shape[1]
+        return [
+            {
+                "color_map": color_map,
+                "rgb": compress(row.tobytes(), self.codec),
+                "width": width,
+                "codec": self.codec,
+            }
+            for row in np.ascontiguousarray(rgb)
+        ]
+
+    async def copy_frames(self, depths: np.ndarray, pixels: np.ndarray) -> List[int]:
+        """
+        Bulk load a chunk of frames without committing.
+
+        Args:
+            depths: Frame depths, shape (n_frames,)
+            pixels: Grayscale matrix of shape (n_frames, width)
+
+        Returns:
+            List[int]: IDs of the written rows, in input order
+        """
+        return await self.copy_frame_records(self.frame_records(depths, pixels))
+
+    async def copy_frame_records(self, records: List[dict]) -> List[int]:
+        """
+        Bulk load frames encoded by frame_records without committing.
+
+        Args:
+            records: Frame records
+
+        Returns:
+            List[int]: IDs of the written rows, in input order
+        """
+        return await self._write_records(ImageModel, records, returning_ids=True)
+
+    async def copy_level(
+        self,
+        level: int,
+        reduction: Reduction,
+        depths: np.ndarray,
+        pixels: np.ndarray,
+    ) -> int:
+        """
+        Bulk load a chunk of one depth pyramid level without committing.
+
+        Args:
+            level: Pyramid level
+            reduction: Reduction used to bin the pixel values
+            depths: Binned depths, shape (n_rows,)
+            pixels: Binned grayscale matrix of shape (n_rows, width)
+
+        Returns:
+            int: Number of written rows
+        """
+        return await self.copy_level_records(
+            self.frame_records(depths, pixels, level=level, reduction=reduction)
+        )
+
+    async def copy_level_records(self, records: List[dict]) -> int:
+        """
+        Bulk load pyramid rows encoded by frame_records without committing.
+
+        Args:
+            records: Level records, each carrying its level and reduction
+
+        Returns:
+            int: Number of written rows
+        """
+        await self._write_records(ImageLevelModel, records)
+        return len(records)
+
+    async def copy_color_variants(
+        self, frame_ids: Sequence[int], color_map: str, rgb: np.ndarray
+    ) -> int:
+        """
+        Bulk load color-mapped renditions of frames without committing.
+
+        Args:
+            frame_ids: IDs of the frames
+            color_map: Color map the renditions were made with
+            rgb: uint8 array of shape (n_frames, width, 3), the color map
+                applied to the frames' stored pixels
+
+        Returns:
+            int: Number of written rows
+        """
+        return await self.copy_color_variant_records(
+            frame_ids, self.color_variant_records(color_map, rgb)
+        )
+
+    async def copy_color_variant_records(
+        self, frame_ids: Sequence[int], records: List[dict]
+    ) -> int:
+        """
+        Bulk load renditions encoded by color_variant_records without committing.
+
+        Args:
+            frame_ids: IDs of the frames, in the order of ``records``
+            records: Rendition records
+
+        Returns:
+            int: Number of written rows
+        """
+        records = [
+            {"frame_id": int(frame_id), **record}
+            for frame_id, record in zip(frame_ids, records)
+        ]
+        await self._write_records(ColorVariantModel, records)
+        return len(records)
+
+    async def _allocate_ids(self, model, count: int) -> List[int]:
+        """Reserve IDs from a table's PostgreSQL sequence for rows written with COPY."""
+        result = await self.session.execute(
+            text(
+                "SELECT nextval(pg_get_serial_sequence(:table, 'id')) "
+                "FROM generate_series(1, :count)"
+            ),
+            {"table": model.__tablename__, "count": count},
+        )
+        return list(result.scalars())
+
+    async def _copy_records(self, model, records: List[dict]) -> None:
+        """Write rows given as column dicts with PostgreSQL COPY."""
+        connection = await self.session.connection()
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            model.__tablename__,
+            records=[tuple(record.values()) for record in records],
+            columns=list(records[0]),
+        )
+
+    async def _write_records(
+        self, model, records: List[dict], returning_ids: bool = False
+    ) -> List[int]:
+        """
+        Write column dicts with COPY on PostgreSQL and batched INSERT elsewhere.
+
+        Args:
+            model: Model of the target table
+            records: Rows as column dicts
+            returning_ids: Return the IDs of the written rows
+
+        Returns:
+            List[int]: IDs of the written rows in input order if
+            ``returning_ids``, otherwise an empty list
+        """
+        if not records:
+            return []
+
+        if self.session.bind.dialect.name == "postgresql":
+            # COPY cannot return generated keys, so they are reserved up front
+            ids = []
+            if returning_ids:
+                ids = await self._allocate_ids(model, len(records))
+                records = [{"id": _id, **record} for _id, record in zip(ids, records)]
+            await self._copy_records(model, records)
+            return ids
+
+        if returning_ids:
+            result = await self.session.execute(
+                insert(model).returning(model.id, sort_by_parameter_order=True),
+                records,
+            )
+            return list(result.scalars())
+        await self.session.execute(insert(model), records)
+        return []
 
     async def save(self, image: ImageFrame) -> ImageFrame:
         """
@@ -39,18 +511,20 @@ class SQLAlchemyImageRepository(ImageRepository):
         Returns:
             ImageFrame: Saved image with updated ID
         """
-        model = ImageModel(depth=image.depth, pixel_data=image.pixel_data.tobytes())
+        model = ImageModel(depth=image.depth, **self._encode(image.pixel_data))
         self.session.add(model)
         await self.session.commit()
+        frame_cache.invalidate([model.id])
+        depth_index.invalidate()
 
-        return ImageFrame(
-            id=model.id,
-            depth=model.depth,
-            pixel_data=np.frombuffer(model.pixel_data, dtype=np.uint8),
-        )
+        return self._to_frame(model)
 
     async def get_by_depth_range(
-        self, depth_min: float, depth_max: float
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
     ) -> List[ImageFrame]:
         """
         Retrieve image frames within the specified depth range.
@@ -58,27 +532,287 @@ class SQLAlchemyImageRepository(ImageRepository):
         Args:
             depth_min: Minimum depth value
             depth_max: Maximum depth value
+            limit: Maximum number of frames, None for the whole range
+            after: Keyset (depth, id) to continue after
 
         Returns:
             List[ImageFrame]: List of matching image frames
         """
-        query = (
-            select(ImageModel)
-            .where(and_(ImageModel.depth >= depth_min, ImageModel.depth <= depth_max))
-            .order_by(ImageModel.depth)
+        batch = await self.get_batch_by_depth_range(depth_min, depth_max, limit, after)
+        return batch.to_frames()
+
+    async def get_batch_by_depth_range(
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> FrameBatch:
+        """
+        Retrieve the frames of a depth range as one batch.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            limit: Maximum number of frames, None for the whole range
+            after: Keyset (depth, id) to continue after
+
+        Returns:
+            FrameBatch: Matching frames ordered by depth
+        """
+        result = await self._select_range(False, depth_min, depth_max, limit, after)
+        return self._to_batch(result.all())
+
+    async def get_depth_index(
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[FrameVersion]:
+        """
+        Retrieve IDs, depths and content hashes of a depth range, without pixels.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            limit: Maximum number of frames, None for the whole range
+            after: Keyset (depth, id) to continue after
+
+        Returns:
+            List[FrameVersion]: (id, depth, content_hash) ordered by depth
+        """
+        result = await self._select_range(True, depth_min, depth_max, limit, after)
+        return [tuple(row) for row in result]
+
+    async def get_by_ids(self, ids: Sequence[int]) -> List[ImageFrame]:
+        """
+        Retrieve image frames by their IDs in one query.
+
+        Args:
+            ids: Image frame IDs
+
+        Returns:
+            List[ImageFrame]: Matching image frames in no particular order
+        """
+        return (await self.get_batch_by_ids(ids)).to_frames()
+
+    async def get_batch_by_ids(self, ids: Sequence[int]) -> FrameBatch:
+        """
+        Retrieve image frames by their IDs in one query, as one batch.
+
+        Args:
+            ids: Image frame IDs
+
+        Returns:
+            FrameBatch: Matching frames in no particular order
+        """
+        if not len(ids):
+            return self._to_batch([])
+        query = _ids_query(self.session.bind.dialect.name == "postgresql")
+        result = await self._execute(query, {"ids": [int(i) for i in ids]})
+        return self._to_batch(result.all())
+
+    async def get_color_variants(
+        self, ids: Sequence[int], color_map: str
+    ) -> FrameBatch:
+        """
+        Retrieve stored color-mapped renditions of frames.
+
+        Args:
+            ids: Image frame IDs
+            color_map: Color map name
+
+        Returns:
+            FrameBatch: Frames having a rendition, pixels being the uint8 RGB
+            array of shape (n_frames, width, 3)
+        """
+        if not len(ids):
+            return self._to_rgb_batch([])
+        query = _color_variants_query(self.session.bind.dialect.name == "postgresql")
+        result = await self._execute(
+            query, {"ids": [int(i) for i in ids], "color_map": color_map}
         )
+        return self._to_rgb_batch(result.all())
+
+    @staticmethod
+    def _to_rgb_batch(rows: Sequence) -> FrameBatch:
+        """Decode (id, depth, rgb, width, codec) rows into an RGB batch."""
+        with stage("decode"):
+            rgb = decode_pixel_rows(
+                [(row[2], "uint8", row[3] * 3, row[4]) for row in rows]
+            )
+            return FrameBatch(
+                ids=np.fromiter((row[0] for row in rows), np.int64, len(rows)),
+                depths=np.fromiter((row[1] for row in rows), np.float64, len(rows)),
+                pixels=rgb.reshape(len(rows), rgb.shape[1] // 3, 3),
+            )
+
+    async def select_level(
+        self, depth_min: float, depth_max: float, rows: int, reduction: Reduction
+    ) -> int:
+        """
+        Pick the coarsest pyramid level that still has ``rows`` rows in a range.
 
-        result = await self.session.execute(query)
-        models = result.scalars().all()
+        The candidate level comes from the range's frame count in the depth
+        index; its rows are then counted, stepping down a level while it is
+        short, such as over frames saved without pyramid levels.
 
-        return [
-            ImageFrame(
-                id=model.id,
-                depth=model.depth,
-                pixel_data=np.frombuffer(model.pixel_data, dtype=np.float64),
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            rows: Number of rows the caller needs
+            reduction: Pyramid reduction to look at
+
+        Returns:
+            int: Pyramid level, 0 meaning the full-resolution frames
+        """
+        if reduction not in get_settings().PYRAMID_REDUCTIONS:
+            return 0
+        # Level L of a chunk holds about 1/2**L of its frames, so the frame count
+        # from the depth index names the candidate; only its rows are counted
+        index = await depth_index.get(self)
+        frames = index.count(depth_min, depth_max)
+        level = 0
+        while level < get_settings().PYRAMID_LEVELS and frames >> (level + 1) >= rows:
+            level += 1
+        for level in range(level, 0, -1):
+            result = await self._execute(
+                _LEVEL_COUNT_QUERY,
+                {
+                    "reduction": reduction,
+                    "level": level,
+                    "depth_min": depth_min,
+                    "depth_max": depth_max,
+                },
             )
-            for model in models
-        ]
+            if result.scalar_one() >= rows:
+                return level
+        return 0
+
+    async def get_by_depth_range_at_resolution(
+        self,
+        depth_min: float,
+        depth_max: float,
+        rows: int,
+        reduction: Reduction = "mean",
+        max_frames: Optional[int] = None,
+    ) -> FrameBatch:
+        """
+        Retrieve a depth range from the coarsest level holding at least ``rows``.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            rows: Number of rows the caller needs
+            reduction: Pyramid reduction to read from
+            max_frames: Most full-resolution frames to read when no level
+                holds ``rows`` rows
+
+        Returns:
+            FrameBatch: Matching frames, IDs referring to the level rows
+
+        Raises:
+            PayloadTooLargeError: If the range must be read at full resolution
+                and holds more than ``max_frames`` frames
+        """
+        level = await self.select_level(depth_min, depth_max, rows, reduction)
+        if level == 0:
+            if max_frames is not None:
+                index = await depth_index.get(self)
+                frames = index.count(depth_min, depth_max)
+                if frames > max_frames:
+                    raise PayloadTooLargeError(
+                        detail=f"No pyramid level holds {rows} rows of this depth "
+                        f"range and its {frames} frames exceed {max_frames}"
+                    )
+            return await self.get_batch_by_depth_range(depth_min, depth_max)
+
+        result = await self._execute(
+            _LEVEL_QUERY,
+            {
+                "reduction": reduction,
+                "level": level,
+                "depth_min": depth_min,
+                "depth_max": depth_max,
+            },
+        )
+        return self._to_batch(result.all())
+
+    async def stream_by_depth_range(
+        self, depth_min: float, depth_max: float, batch_size: int
+    ) -> AsyncIterator[FrameBatch]:
+        """
+        Stream image frames within the specified depth range in batches.
+
+        Rows are read through a server-side cursor and selected as plain
+        columns, so no ORM objects accumulate in the session while streaming.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            batch_size: Number of rows fetched per batch
+
+        Yields:
+            FrameBatch: Next batch of matching image frames
+        """
+        result = await self.session.stream(
+            _depth_range_query(False, False, False),
+            {"depth_min": depth_min, "depth_max": depth_max},
+            execution_options={"yield_per": batch_size},
+        )
+        try:
+            async for rows in result.partitions(batch_size):
+                yield self._to_batch(rows)
+        finally:
+            await result.close()
+
+    async def refresh_depth_index(
+        self, index: Optional[DepthIndex] = None
+    ) -> DepthIndex:
+        """
+        Get an up-to-date depth index, reading only frames added since ``index``.
+
+        The highest ID versions the table: frames with a higher ID than the
+        index's version are taken as the ones added since. On PostgreSQL, IDs
+        reserved by concurrent transactions can commit out of order, so a
+        frame committed after a higher ID was indexed is missed; so are rows
+        removed by hand. Pass no index to read the table in full.
+
+        Args:
+            index: Previously returned index, None for a full read
+
+        Returns:
+            DepthIndex: ``index`` itself if no frame was added since
+        """
+        version = (await self._execute(_MAX_ID_QUERY)).scalar() or 0
+        if index is not None and index.version == version:
+            return index
+        extend = index is not None and 0 < index.version < version
+        rows = (
+            await self._execute(
+                _DEPTH_WIDTH_QUERY, {"after": index.version if extend else 0}
+            )
+        ).all()
+        depths = np.fromiter((row[0] for row in rows), np.float64, len(rows))
+        widths = np.fromiter((row[1] or 0 for row in rows), np.int64, len(rows))
+        if extend:
+            return index.extend(version, depths, widths)
+        return DepthIndex.build(version, depths, widths)
+
+    async def get_version(self, _id: int) -> Optional[FrameVersion]:
+        """
+        Retrieve the ID, depth and content hash of a frame, without pixels.
+
+        Args:
+            _id: Image frame ID
+
+        Returns:
+            Optional[FrameVersion]: (id, depth, content_hash) or None if the
+            frame does not exist
+        """
+        row = (await self._execute(_VERSION_QUERY, {"id": _id})).one_or_none()
+        return tuple(row) if row is not None else None
 
     async def get_by_id(self, _id: int) -> Optional[ImageFrame]:
         """
@@ -90,15 +824,8 @@ class SQLAlchemyImageRepository(ImageRepository):
         Returns:
             Optional[ImageFrame]: Matching image frame or None
         """
-        query = select(ImageModel).filter(ImageModel.id == _id)
-        result = await self.session.execute(query)
-        model = result.scalar_one_or_none()
-
-        if model is None:
+        rows = (await self._execute(_ID_QUERY, {"id": _id})).all()
+        if not rows:
             return None
 
-        return ImageFrame(
-            id=model.id,
-            depth=model.depth,
-            pixel_data=np.frombuffer(model.pixel_data, dtype=np.float64),
-        )
+        return self._to_batch(rows).to_frames()[0]
@@ -0,0 +1,61 @@
+from sqlalchemy import inspect, text
+
+from src.infrastructure.database.models import Base, ImageLevelModel, ImageModel
+
+# Columns added to the frame tables after their first release
+STORAGE_COLUMNS = {
+    "dtype": "VARCHAR(8)",
+    "width": "INTEGER",
+    "codec": "VARCHAR(8)",
+    "content_hash": "VARCHAR(32)",
+}
+# Indexes dropped from the models, each superseded by a composite index
+OBSOLETE_INDEXES = ("ix_image_frames_depth",)
+# Arbitrary key serializing concurrent schema updates on PostgreSQL
+SCHEMA_LOCK_KEY = 7_210_514
+
+
+def add_missing_columns(connection) -> None:
+    """Add the pixel storage columns to tables created before they existed."""
+    inspector = inspect(connection)
+    for table in (ImageModel.__table__, ImageLevelModel.__table__):
+        existing = {column["name"] for column in inspector.get_columns(table.name)}
+        for name, column_type in STORAGE_COLUMNS.items():
+            if name not in existing:
+                connection.execute(
+                    text(f"ALTER TABLE {table.name} ADD COLUMN {name} {column_type}")
+                )
+
+
+def add_missing_indexes(connection) -> None:
+    """Create indexes added to the models after their tables were created."""
+    for table in (ImageModel.__table__, ImageLevelModel.__table__):
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+
+def drop_obsolete_indexes(connection) -> None:
+    """Drop indexes the models no longer declare, so writes stop maintaining them."""
+    for name in OBSOLETE_INDEXES:
+        connection.execute(text(f"DROP INDEX IF EXISTS {name}"))
+
+
+def create_schema(connection) -> None:
+    """
+    Create missing tables, columns and indexes and drop obsolete indexes; safe
+    to run repeatedly.
+
+    On PostgreSQL a transaction-scoped advisory lock makes concurrent runs
+    wait for each other instead of racing on DDL.
+
+    Args:
+        connection: Synchronous connection inside a transaction
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(
+            text("SELECT pg_advisory_xact_lock(:key)"), {"key": SCHEMA_LOCK_KEY}
+        )
+    Base.metadata.create_all(connection)
+    add_missing_columns(connection)
+    add_missing_indexes(connection)
+    drop_obsolete_indexes(connection)
@@ -0,0 +1,200 @@
+import json
+import logging
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+import anyio
+
+from src.config.database import async_session
+from src.config.settings import BaseAppSettings, get_settings
+from src.domain.entities.image import FrameBatch
+from src.domain.services.color_map import CustomColorMap
+from src.infrastructure.database.codecs import quantize_pixels
+from src.infrastructure.database.repositories import SQLAlchemyImageRepository
+from src.infrastructure.services.depth_index import depth_index
+from src.infrastructure.services.image_processor import ImageProcessor
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class IngestProgress:
+    """Progress of a CSV ingest."""
+
+    rows_done: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_done / self.elapsed if self.elapsed else 0.0
+
+
+@dataclass
+class EncodedChunk:
+    """Database records of one CSV chunk, ready to be written."""
+
+    rows: int
+    frames: List[dict]
+    levels: List[dict] = field(default_factory=list)
+    color_variants: Dict[str, List[dict]] = field(default_factory=dict)
+
+
+def encode_chunk(
+    batch: FrameBatch,
+    repository: SQLAlchemyImageRepository,
+    settings: BaseAppSettings,
+) -> EncodedChunk:
+    """
+    Encode a chunk's frames, pyramid rows and color-mapped renditions.
+
+    Args:
+        batch: Resampled frames of the chunk
+        repository: Repository whose dtype and codec the records use
+        settings: Settings selecting pyramid reductions and color maps
+
+    Returns:
+        EncodedChunk: Records of the chunk
+    """
+    chunk = EncodedChunk(
+        rows=len(batch), frames=repository.frame_records(batch.depths, batch.pixels)
+    )
+    for reduction in settings.PYRAMID_REDUCTIONS:
+        levels = ImageProcessor.build_pyramid(batch, settings.PYRAMID_LEVELS, reduction)
+        for level, level_depths, level_pixels in levels:
+            chunk.levels += repository.frame_records(
+                level_depths, level_pixels, level=level, reduction=reduction
+            )
+    if settings.MATERIALIZED_COLOR_MAPS:
+        # Map the stored (quantized) pixels, as reads would
+        stored = quantize_pixels(batch.pixels, repository.pixel_dtype)
+        for color_map in settings.MATERIALIZED_COLOR_MAPS:
+            rgb = CustomColorMap(color_map).apply(stored)
+            chunk.color_variants[color_map] = repository.color_variant_records(
+                color_map, rgb
+            )
+    return chunk
+
+
+def _next_encoded_chunk(
+    chunks: Iterator[FrameBatch],
+    repository: SQLAlchemyImageRepository,
+    settings: BaseAppSettings,
+) -> Optional[EncodedChunk]:
+    """Parse, resample and encode the next chunk, None after the last one."""
+    batch = next(chunks, None)
+    if batch is None:
+        return None
+    return encode_chunk(batch, repository, settings)
+
+
+class IngestCheckpoint:
+    """Number of committed rows of a CSV file, persisted next to it."""
+
+    def __init__(self, file_path: Path, checkpoint_path: Optional[Path] = None):
+        self.file_path = file_path
+        self.path = checkpoint_path or file_path.with_name(
+            f"{file_path.name}.checkpoint.json"
+        )
+
+    def load(self) -> int:
+        """Rows already committed, 0 if there is no checkpoint for this file."""
+        if not self.path.exists():
+            return 0
+        state = json.loads(self.path.read_text())
+        if state.get("file_size") != self.file_path.stat().st_size:
+            logger.warning("Ignoring checkpoint %s for a changed file", self.path)
+            return 0
+        return int(state["rows_done"])
+
+    def save(self, rows_done: int) -> None:
+        """Atomically record the committed row count."""
+        state = {"file_size": self.file_path.stat().st_size, "rows_done": rows_done}
+        tmp_path = self.path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(state))
+        os.replace(tmp_path, self.path)
+
+    def clear(self) -> None:
+        self.path.unlink(missing_ok=True)
+
+
+async def ingest_csv(
+    file_path: str,
+    chunk_size: Optional[int] = None,
+    target_width: int = 150,
+    checkpoint_path: Optional[str] = None,
+    on_progress: Optional[Callable[[IngestProgress], None]] = None,
+) -> IngestProgress:
+    """
+    Stream a CSV file into the database chunk by chunk.
+
+    Each chunk is resampled as one matrix, written with its depth pyramid
+    rows and the renditions of every ``MATERIALIZED_COLOR_MAPS`` entry in a
+    single transaction, and then recorded in a checkpoint so a
+    failed ingest resumes after the last committed chunk. The CSV is
+    expected to be sorted by depth; pyramid bins never span chunks.
+
+    Args:
+        file_path: Path to the CSV file
+        chunk_size: Rows per chunk, rounded up to a multiple of the pyramid bin
+        target_width: Desired width for the processed images
+        checkpoint_path: Checkpoint file, defaults to one next to the CSV
+        on_progress: Called after every committed chunk
+
+    Returns:
+        IngestProgress: Final row count and duration
+    """
+    settings = get_settings()
+    pyramid_bin = 2**settings.PYRAMID_LEVELS
+    chunk_size = chunk_size or settings.INGEST_CHUNK_SIZE
+    chunk_size = math.ceil(chunk_size / pyramid_bin) * pyramid_bin
+
+    checkpoint = IngestCheckpoint(
+        Path(file_path), Path(checkpoint_path) if checkpoint_path else None
+    )
+    skip_rows = checkpoint.load()
+    if skip_rows:
+        logger.info("Resuming ingest of %s after %s rows", file_path, skip_rows)
+
+    progress = IngestProgress()
+    start_time = time.perf_counter()
+    chunks = ImageProcessor.iter_csv_chunks(
+        file_path,
+        chunk_size,
+        target_width,
+        skip_rows=skip_rows,
+        method=settings.INGEST_RESAMPLE_METHOD,
+    )
+    async with async_session() as session:
+        repository = SQLAlchemyImageRepository(session)
+        while True:
+            # All CPU-bound work runs in a worker thread, leaving the event
+            # loop (shared with API requests in ingest jobs) only the writes
+            chunk = await anyio.to_thread.run_sync(
+                _next_encoded_chunk, chunks, repository, settings
+            )
+            if chunk is None:
+                break
+            ids = await repository.copy_frame_records(chunk.frames)
+            for records in chunk.color_variants.values():
+                await repository.copy_color_variant_records(ids, records)
+            await repository.copy_level_records(chunk.levels)
+            await session.commit()
+            depth_index.invalidate()
+
+            progress.rows_done += chunk.rows
+            progress.elapsed = time.perf_counter() - start_time
+            checkpoint.save(skip_rows + progress.rows_done)
+            logger.info(
+                "Ingested %s rows (%.0f rows/sec)",
+                skip_rows + progress.rows_done,
+                progress.rows_per_second,
+            )
+            if on_progress is not None:
+                on_progress(progress)
+
+    checkpoint.clear()
+    return progress
@@ -0,0 +1,80 @@
+import time
+from typing import Dict
+
+from src.config.settings import get_settings
+from src.core.metrics import stage
+from src.domain.entities.image import DepthIndex
+from src.domain.interfaces.repositories import ImageRepository
+from src.infrastructure.services.single_flight import SingleFlight
+
+
+class DepthIndexLoader:
+    """
+    Keeps an in-memory depth index of every frame repository backend.
+
+    The index is loaded on first use (normally at startup) and brought up to
+    date at most every ``check_interval`` seconds, or on the next use after
+    invalidate(). Frames ingested by another worker can therefore be missing
+    from the index for up to ``check_interval`` seconds.
+
+    Updates only add frames the repository reports as new, e.g. by ID, which
+    misses frames committed out of ID order; the index is therefore read in
+    full again every ``reload_interval`` seconds, or on the next use after
+    reload().
+    """
+
+    def __init__(self, check_interval: float = 1.0, reload_interval: float = 60.0):
+        self.check_interval = check_interval
+        self.reload_interval = reload_interval
+        self._indexes: Dict[str, DepthIndex] = {}
+        self._checked_at: Dict[str, float] = {}
+        self._loaded_at: Dict[str, float] = {}
+        # Concurrent requests wait for one refresh instead of each running it
+        self._refreshes = SingleFlight("depth_index")
+
+    async def get(self, repository: ImageRepository) -> DepthIndex:
+        """
+        Get the depth index of a repository's backend.
+
+        Args:
+            repository: Repository used if the index needs a refresh
+
+        Returns:
+            DepthIndex: Index at most ``check_interval`` seconds old
+        """
+        backend = type(repository).__name__
+        index = self._indexes.get(backend)
+        checked_at = self._checked_at.get(backend, 0.0)
+        if index is not None and time.monotonic() - checked_at < self.check_interval:
+            return index
+        return await self._refreshes.run(
+            backend, lambda: self._refresh(backend, repository)
+        )
+
+    async def _refresh(self, backend: str, repository: ImageRepository) -> DepthIndex:
+        started = time.monotonic()
+        reload = started - self._loaded_at.get(backend, 0.0) >= self.reload_interval
+        with stage("depth_index"):
+            index = await repository.refresh_depth_index(
+                None if reload else self._indexes.get(backend)
+            )
+        self._indexes[backend] = index
+        self._checked_at[backend] = started
+        if reload:
+            self._loaded_at[backend] = started
+        return index
+
+    def invalidate(self) -> None:
+        """Check for new frames on the next use, e.g. after writing frames."""
+        self._checked_at.clear()
+
+    def reload(self) -> None:
+        """Read the index in full on the next use, e.g. after it proved stale."""
+        self._checked_at.clear()
+        self._loaded_at.clear()
+
+
+depth_index = DepthIndexLoader(
+    get_settings().DEPTH_INDEX_CHECK_SECONDS,
+    get_settings().DEPTH_INDEX_RELOAD_SECONDS,
+)
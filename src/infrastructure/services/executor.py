@@ -0,0 +1,175 @@
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Callable, Literal, Optional, Sequence, TypeVar, Union
+
+import numpy as np
+
+from src.config.settings import get_settings
+from src.core.metrics import stage
+from src.domain.services.color_map import CustomColorMap, quantize
+
+T = TypeVar("T")
+Backend = Literal["inline", "thread", "process"]
+
+
+def _color_map_shared(
+    input_name: str, shape: tuple, dtype: str, output_name: str, color_map: str
+) -> None:
+    """Color-map a matrix in shared memory into a shared output buffer."""
+    source = shared_memory.SharedMemory(name=input_name)
+    target = shared_memory.SharedMemory(name=output_name)
+    try:
+        pixels = np.ndarray(shape, dtype=dtype, buffer=source.buf)
+        rgb = np.ndarray((*shape, 3), dtype=np.uint8, buffer=target.buf)
+        mapper = CustomColorMap(color_map)
+        np.take(mapper.lut, quantize(pixels, mapper.levels), axis=0, out=rgb)
+        del pixels, rgb
+    finally:
+        source.close()
+        target.close()
+
+
+def _stack_and_map(
+    color_map: str, pixels: Union[np.ndarray, Sequence[np.ndarray]]
+) -> np.ndarray:
+    """Stack frames if needed and color-map them in one lookup."""
+    if not isinstance(pixels, np.ndarray):
+        pixels = np.stack(pixels)
+    return CustomColorMap(color_map).apply(pixels)
+
+
+class ProcessingExecutor:
+    """
+    Runs CPU-bound processing inline, on a thread pool or on a process pool.
+
+    Work smaller than ``inline_cutoff`` elements always runs inline, where a
+    pool hop would cost more than it saves. NumPy releases the GIL for most
+    of the color-mapping work, so threads already keep the event loop free;
+    the process backend moves color mapping to other processes and passes
+    pixel matrices through shared memory. Other work, such as serialization,
+    uses a thread pool with either pool backend.
+    """
+
+    def __init__(self, backend: Backend, pool_size: int, inline_cutoff: int):
+        self.backend = backend
+        self.pool_size = pool_size
+        self.inline_cutoff = inline_cutoff
+        self._threads: Optional[ThreadPoolExecutor] = None
+        self._processes: Optional[ProcessPoolExecutor] = None
+
+    def _inline(self, work_size: int) -> bool:
+        return self.backend == "inline" or work_size < self.inline_cutoff
+
+    def _thread_pool(self) -> ThreadPoolExecutor:
+        if self._threads is None:
+            self._threads = ThreadPoolExecutor(
+                max_workers=self.pool_size, thread_name_prefix="processing"
+            )
+        return self._threads
+
+    def _process_pool(self) -> ProcessPoolExecutor:
+        if self._processes is None:
+            self._processes = ProcessPoolExecutor(max_workers=self.pool_size)
+        return self._processes
+
+    async def run(
+        self, func: Callable[..., T], *args, work_size: int = 0, **kwargs
+    ) -> T:
+        """
+        Run a CPU-bound callable off the event loop unless it is small.
+
+        Args:
+            func: Callable to run
+            args: Positional arguments
+            work_size: Number of elements processed, compared to the cutoff
+            kwargs: Keyword arguments
+
+        Returns:
+            T: Result of the callable
+        """
+        if self._inline(work_size):
+            return func(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        # Keep context variables, such as the request's stage timings
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self._thread_pool(), functools.partial(context.run, func, *args, **kwargs)
+        )
+
+    async def apply_color_map(
+        self, color_map: str, pixels: Union[np.ndarray, Sequence[np.ndarray]]
+    ) -> np.ndarray:
+        """
+        Color-map a stacked matrix or a sequence of equally wide frames.
+
+        Args:
+            color_map: Color map name
+            pixels: (n_frames, width) matrix or frames to stack
+
+        Returns:
+            np.ndarray: uint8 RGB array of shape (n_frames, width, 3)
+        """
+        if isinstance(pixels, np.ndarray):
+            n_frames, width = pixels.shape
+            dtype = pixels.dtype
+        else:
+            n_frames, width = len(pixels), pixels[0].shape[0]
+            dtype = np.result_type(*pixels)
+        work_size = n_frames * width
+
+        if self.backend != "process" or self._inline(work_size):
+            return await self.run(
+                _stack_and_map, color_map, pixels, work_size=work_size
+            )
+
+        source = shared_memory.SharedMemory(
+            create=True, size=max(work_size * dtype.itemsize, 1)
+        )
+        target = shared_memory.SharedMemory(create=True, size=max(work_size * 3, 1))
+        try:
+            shared_pixels = np.ndarray(
+                (n_frames, width), dtype=dtype, buffer=source.buf
+            )
+            if isinstance(pixels, np.ndarray):
+                shared_pixels[:] = pixels
+            else:
+                np.stack(pixels, out=shared_pixels)
+            del shared_pixels
+
+            loop = asyncio.get_running_loop()
+            with stage("color_map"):
+                await loop.run_in_executor(
+                    self._process_pool(),
+                    _color_map_shared,
+                    source.name,
+                    (n_frames, width),
+                    dtype.str,
+                    target.name,
+                    color_map,
+                )
+            rgb = np.ndarray((n_frames, width, 3), dtype=np.uint8, buffer=target.buf)
+            result = rgb.copy()
+            del rgb
+            return result
+        finally:
+            for segment in (source, target):
+                segment.close()
+                segment.unlink()
+
+    def shutdown(self) -> None:
+        """Shut down the pools without waiting for queued work."""
+        for pool in (self._threads, self._processes):
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+        self._threads = self._processes = None
+
+
+settings = get_settings()
+processing_executor = ProcessingExecutor(
+    settings.PROCESSING_BACKEND,
+    settings.PROCESSING_POOL_SIZE,
+    settings.PROCESSING_INLINE_CUTOFF,
+)
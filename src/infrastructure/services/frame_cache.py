@@ -0,0 +1,126 @@
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, Optional, Set, Tuple
+
+import numpy as np
+
+from src.config.settings import get_settings
+
+CacheKey = Tuple[int, str]
+
+
+@dataclass(frozen=True)
+class ColoredFrame:
+    """Color-mapped frame shared read-only between requests."""
+
+    id: int
+    depth: float
+    rgb: np.ndarray
+
+
+class FrameCache:
+    """Thread-safe LRU cache of color-mapped frames bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[CacheKey, ColoredFrame]" = OrderedDict()
+        self._keys_by_frame: Dict[int, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get(self, key: CacheKey) -> Optional[ColoredFrame]:
+        """
+        Look up a frame and mark it as most recently used.
+
+        Args:
+            key: (frame_id, color_map)
+
+        Returns:
+            Optional[ColoredFrame]: Cached frame or None
+        """
+        with self._lock:
+            frame = self._entries.get(key)
+            if frame is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return frame
+
+    def put(self, key: CacheKey, frame: ColoredFrame) -> ColoredFrame:
+        """
+        Store a frame, evicting least recently used entries to stay in budget.
+
+        The pixel array is made read-only so it can be shared without copies.
+
+        Args:
+            key: (frame_id, color_map)
+            frame: Color-mapped frame
+
+        Returns:
+            ColoredFrame: The stored frame
+        """
+        frame.rgb.flags.writeable = False
+        size = frame.rgb.nbytes
+        if size > self.max_bytes:
+            return frame
+
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = frame
+            self._keys_by_frame.setdefault(key[0], set()).add(key)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+        return frame
+
+    def invalidate(self, frame_ids: Iterable[int]) -> None:
+        """Drop every cached color map of the given frames."""
+        with self._lock:
+            for frame_id in frame_ids:
+                for key in list(self._keys_by_frame.get(frame_id, ())):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all cached frames."""
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_frame.clear()
+            self.current_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Current size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.current_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def _remove(self, key: Hashable) -> None:
+        """Remove an entry; the caller must hold the lock."""
+        frame = self._entries.pop(key, None)
+        if frame is None:
+            return
+        self.current_bytes -= frame.rgb.nbytes
+        frame_keys = self._keys_by_frame.get(key[0])
+        if frame_keys is not None:
+            frame_keys.discard(key)
+            if not frame_keys:
+                del self._keys_by_frame[key[0]]
+
+
+frame_cache = FrameCache(get_settings().FRAME_CACHE_MAX_BYTES)
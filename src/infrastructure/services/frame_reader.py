@@ -0,0 +1,210 @@
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config.settings import get_settings
+from src.core.metrics import stage
+from src.domain.entities.image import FrameBatch
+from src.domain.interfaces.repositories import ImageRepository
+from src.domain.services.pyramid import Reduction
+from src.infrastructure.services.executor import ProcessingExecutor, processing_executor
+from src.infrastructure.services.frame_cache import (
+    ColoredFrame,
+    FrameCache,
+    frame_cache,
+)
+
+# Upper bound of IDs sent in one query for cache misses
+MISS_BATCH_SIZE = 1000
+
+
+class CachedFrameReader:
+    """
+    Reads color-mapped frames through the process-wide frame cache.
+
+    Cache misses in one of the materialized color maps are served from the
+    renditions stored at ingest; the rest are color-mapped on the fly.
+    """
+
+    def __init__(
+        self,
+        repository: ImageRepository,
+        cache: FrameCache = frame_cache,
+        executor: ProcessingExecutor = processing_executor,
+        materialized_color_maps: Optional[Iterable[str]] = None,
+    ):
+        self.repository = repository
+        self.cache = cache
+        self.executor = executor
+        if materialized_color_maps is None:
+            materialized_color_maps = get_settings().MATERIALIZED_COLOR_MAPS
+        self.materialized_color_maps = frozenset(materialized_color_maps)
+
+    async def get_by_id(self, frame_id: int, color_map: str) -> Optional[ColoredFrame]:
+        """
+        Retrieve a color-mapped frame, hitting the database only on a cache miss.
+
+        Args:
+            frame_id: Image frame ID
+            color_map: Color map name
+
+        Returns:
+            Optional[ColoredFrame]: Color-mapped frame or None
+        """
+        return (await self.get_by_ids([frame_id], color_map)).get(frame_id)
+
+    async def get_by_depth_range(
+        self,
+        depth_min: float,
+        depth_max: float,
+        color_map: str,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[ColoredFrame]:
+        """
+        Retrieve color-mapped frames in a depth range.
+
+        Only IDs and depths are read for the range; pixels are fetched and
+        color-mapped for the frames missing from the cache.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            color_map: Color map name
+            limit: Maximum number of frames, None for the whole range
+            after: Keyset (depth, id) to continue after
+
+        Returns:
+            List[ColoredFrame]: Color-mapped frames ordered by depth
+        """
+        if not self.cache.enabled:
+            batch = await self.repository.get_batch_by_depth_range(
+                depth_min, depth_max, limit, after
+            )
+            return await self._color_map(batch, color_map)
+
+        index = await self.repository.get_depth_index(
+            depth_min, depth_max, limit, after
+        )
+        return await self.get_by_index(index, color_map)
+
+    async def get_by_index(
+        self, index: Sequence[Tuple[int, ...]], color_map: str
+    ) -> List[ColoredFrame]:
+        """
+        Retrieve color-mapped frames for rows of a depth index.
+
+        Args:
+            index: Rows from ``get_depth_index``, the frame ID first
+            color_map: Color map name
+
+        Returns:
+            List[ColoredFrame]: Color-mapped frames in index order
+        """
+        found = await self.get_by_ids([row[0] for row in index], color_map)
+
+        # Frames deleted after the index was read are skipped
+        return [found[row[0]] for row in index if row[0] in found]
+
+    async def get_by_ids(
+        self, frame_ids: Sequence[int], color_map: str
+    ) -> Dict[int, ColoredFrame]:
+        """
+        Retrieve color-mapped frames by ID, fetching cache misses in batches.
+
+        Args:
+            frame_ids: Image frame IDs, duplicates allowed
+            color_map: Color map name
+
+        Returns:
+            Dict[int, ColoredFrame]: Found frames by ID; missing IDs are absent
+        """
+        found: Dict[int, Optional[ColoredFrame]] = {
+            frame_id: self.cache.get((frame_id, color_map)) for frame_id in frame_ids
+        }
+        missing = [frame_id for frame_id, frame in found.items() if frame is None]
+        if missing and color_map in self.materialized_color_maps:
+            for start in range(0, len(missing), MISS_BATCH_SIZE):
+                stored = await self.repository.get_color_variants(
+                    missing[start : start + MISS_BATCH_SIZE], color_map
+                )
+                for frame in self._colored(stored, stored.pixels, color_map):
+                    found[frame.id] = frame
+            # Frames ingested before their color map was materialized
+            missing = [frame_id for frame_id in missing if found[frame_id] is None]
+
+        for start in range(0, len(missing), MISS_BATCH_SIZE):
+            batch = await self.repository.get_batch_by_ids(
+                missing[start : start + MISS_BATCH_SIZE]
+            )
+            for frame in await self._color_map(batch, color_map):
+                found[frame.id] = frame
+
+        return {frame_id: frame for frame_id, frame in found.items() if frame}
+
+    async def get_by_depth_range_at_resolution(
+        self,
+        depth_min: float,
+        depth_max: float,
+        rows: int,
+        reduction: Reduction,
+        color_map: str,
+        max_frames: Optional[int] = None,
+    ) -> List[ColoredFrame]:
+        """
+        Retrieve color-mapped pyramid rows; pyramid levels are not cached.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            rows: Number of rows the caller needs
+            reduction: Pyramid reduction to read from
+            color_map: Color map name
+            max_frames: Most rows to read and return; ranges without a pyramid
+                level of ``rows`` rows and more full-resolution frames are
+                rejected, and levels holding more rows are binned down to
+                ``rows`` rows
+
+        Returns:
+            List[ColoredFrame]: Color-mapped rows ordered by depth
+
+        Raises:
+            PayloadTooLargeError: If the range must be read at full resolution
+                and holds more than ``max_frames`` frames
+        """
+        batch = await self.repository.get_by_depth_range_at_resolution(
+            depth_min, depth_max, rows, reduction, max_frames
+        )
+        if max_frames is not None and len(batch) > max_frames:
+            with stage("downsample"):
+                batch = batch.bin_rows(rows, reduction)
+        return await self._color_map(batch, color_map, cache=False)
+
+    async def _color_map(
+        self, batch: FrameBatch, color_map: str, cache: bool = True
+    ) -> List[ColoredFrame]:
+        """Color-map a batch in one lookup, caching the frames if requested."""
+        if not len(batch):
+            return []
+        rgb_frames = await self.executor.apply_color_map(color_map, batch.pixels)
+        return self._colored(batch, rgb_frames, color_map, cache)
+
+    def _colored(
+        self,
+        batch: FrameBatch,
+        rgb_frames: np.ndarray,
+        color_map: str,
+        cache: bool = True,
+    ) -> List[ColoredFrame]:
+        """Pair RGB rows with the batch's IDs and depths, caching them if requested."""
+        colored = [
+            # Copy rows so each cache entry owns exactly the bytes it accounts for
+            ColoredFrame(id=_id, depth=depth, rgb=rgb.copy())
+            for _id, depth, rgb in zip(
+                batch.ids.tolist(), batch.depths.tolist(), rgb_frames
+            )
+        ]
+        if cache and self.cache.enabled:
+            for frame in colored:
+                self.cache.put((frame.id, color_map), frame)
+        return colored
@@ -0,0 +1,29 @@
+import io
+from typing import Literal
+
+import numpy as np
+
+ImageFormat = Literal["png", "webp"]
+
+
+def encode_image(rgb: np.ndarray, image_format: ImageFormat = "png") -> bytes:
+    """
+    Encode an RGB matrix as a compressed image.
+
+    Args:
+        rgb: uint8 array of shape (rows, columns, 3)
+        image_format: Output image format
+
+    Returns:
+        bytes: Encoded image
+    """
+    # Pillow ships with matplotlib; imported lazily to keep it off the JSON path
+    from PIL import Image
+
+    image = Image.fromarray(np.ascontiguousarray(rgb, dtype=np.uint8), mode="RGB")
+    buffer = io.BytesIO()
+    if image_format == "png":
+        image.save(buffer, format="PNG", compress_level=6)
+    else:
+        image.save(buffer, format="WEBP", lossless=True)
+    return buffer.getvalue()
@@ -1,38 +1,113 @@
-from typing import List
+from typing import TYPE_CHECKING, Iterator, List, Tuple
 
-import pandas as pd
+import numpy as np
 
-from src.domain.entities.image import ImageFrame
+from src.domain.entities.image import FrameBatch, ImageFrame
+from src.domain.services.pyramid import Reduction, build_pyramid
+from src.domain.services.resampling import ResampleMethod
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 
 class ImageProcessor:
     """Service for processing image data from CSV files."""
 
     @staticmethod
-    async def process_csv(file_path: str, target_width: int = 150) -> List[ImageFrame]:
+    async def process_csv(
+        file_path: str, target_width: int = 150, method: ResampleMethod = "linear"
+    ) -> List[ImageFrame]:
         """
         Process CSV file containing image data and create ImageFrame objects.
 
         Args:
             file_path: Path to the CSV file
             target_width: Desired width for the processed images
+            method: Resampling method
 
         Returns:
             List[ImageFrame]: List of processed image frames
         """
-        # Read CSV file
+        batch = await ImageProcessor.process_csv_batch(file_path, target_width, method)
+        return batch.to_frames()
+
+    @staticmethod
+    async def process_csv_batch(
+        file_path: str, target_width: int = 150, method: ResampleMethod = "linear"
+    ) -> FrameBatch:
+        """
+        Process CSV file containing image data into one resampled FrameBatch.
+
+        Args:
+            file_path: Path to the CSV file
+            target_width: Desired width for the processed images
+            method: Resampling method
+
+        Returns:
+            FrameBatch: Depths and (n_frames, target_width) pixel matrix
+        """
+        # Imported here so only ingest pays for pandas
+        import pandas as pd
+
         df = pd.read_csv(file_path)
+        return ImageProcessor._to_batch(df).resize(target_width, method)
 
-        # Extract depth values and pixel data
-        depths = df["depth"].values
-        pixel_data = df.drop("depth", axis=1).values
+    @staticmethod
+    def iter_csv_chunks(
+        file_path: str,
+        chunk_size: int,
+        target_width: int = 150,
+        skip_rows: int = 0,
+        method: ResampleMethod = "linear",
+    ) -> Iterator[FrameBatch]:
+        """
+        Read a CSV file in chunks and resample each chunk as one 2-D array.
 
-        # Create ImageFrame objects
-        frames = []
-        for depth, pixels in zip(depths, pixel_data):
-            frame = ImageFrame(depth=depth, pixel_data=pixels)
-            if target_width != frame.width:
-                frame = frame.resize(target_width)
-            frames.append(frame)
+        Only one chunk is held in memory at a time.
 
-        return frames
+        Args:
+            file_path: Path to the CSV file
+            chunk_size: Number of rows per chunk
+            target_width: Desired width for the processed images
+            skip_rows: Number of data rows to skip, e.g. when resuming
+            method: Resampling method
+
+        Yields:
+            FrameBatch: Depths and (rows, target_width) pixel matrix of a chunk
+        """
+        import pandas as pd
+
+        reader = pd.read_csv(
+            file_path,
+            chunksize=chunk_size,
+            skiprows=range(1, skip_rows + 1) if skip_rows else None,
+        )
+        with reader:
+            for chunk in reader:
+                yield ImageProcessor._to_batch(chunk).resize(target_width, method)
+
+    @staticmethod
+    def build_pyramid(
+        batch: FrameBatch, max_levels: int, reduction: Reduction = "mean"
+    ) -> Iterator[Tuple[int, np.ndarray, np.ndarray]]:
+        """
+        Build the depth pyramid levels for processed image frames.
+
+        Args:
+            batch: Processed image frames
+            max_levels: Maximum number of levels to build
+            reduction: How pixel values in a bin are combined
+
+        Yields:
+            Tuple[int, np.ndarray, np.ndarray]: Level number, depths and pixels
+        """
+        batch = batch.sort_by_depth()
+        yield from build_pyramid(batch.depths, batch.pixels, max_levels, reduction)
+
+    @staticmethod
+    def _to_batch(df: "pd.DataFrame") -> FrameBatch:
+        """Split a depth column and pixel columns into a FrameBatch."""
+        return FrameBatch(
+            depths=df["depth"].to_numpy(dtype=np.float64),
+            pixels=df.drop(columns="depth").to_numpy(dtype=np.float64),
+        )
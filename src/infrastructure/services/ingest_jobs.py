@@ -0,0 +1,153 @@
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Literal, Optional
+
+from src.config.settings import get_settings
+from src.core.exceptions import AppException
+from src.infrastructure.services.csv_ingest import (
+    IngestCheckpoint,
+    IngestProgress,
+    ingest_csv,
+)
+
+logger = logging.getLogger(__name__)
+
+JobStatus = Literal["queued", "running", "completed", "failed"]
+
+
+@dataclass
+class IngestJob:
+    """State of one queued CSV ingest."""
+
+    file_path: Path
+    file_name: str
+    id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    status: JobStatus = "queued"
+    progress: IngestProgress = field(default_factory=IngestProgress)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+
+
+class IngestJobManager:
+    """
+    Queue of ingest jobs processed by a bounded pool of worker tasks.
+
+    Job state lives in memory only: the ``history`` most recent finished jobs
+    stay queryable and jobs are not recovered after a restart.
+    """
+
+    def __init__(self, workers: int, queue_size: int, history: int = 100):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.history = history
+        self.jobs: Dict[str, IngestJob] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """Start the worker tasks on the running event loop."""
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"ingest-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Cancel the workers.
+
+        Queued jobs are dropped. A running ingest keeps the chunks committed
+        so far and leaves its spool file and checkpoint behind, logged so
+        scripts/process_initial_data.py can resume it; it is not requeued.
+        """
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, file_path: Path, file_name: str) -> IngestJob:
+        """
+        Queue a spooled CSV file for ingest.
+
+        Args:
+            file_path: Spooled CSV file, removed once the job succeeds
+            file_name: Original upload name
+
+        Returns:
+            IngestJob: The queued job
+        """
+        if self._queue is None:
+            raise AppException(status_code=503, detail="Ingest workers not running")
+        job = IngestJob(file_path=file_path, file_name=file_name)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            raise AppException(status_code=503, detail="Ingest queue is full")
+        self.jobs[job.id] = job
+        return job
+
+    def get(self, job_id: str) -> Optional[IngestJob]:
+        return self.jobs.get(job_id)
+
+    async def _work(self) -> None:
+        """Process queued jobs one at a time."""
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: IngestJob) -> None:
+        """Run one ingest job and record its outcome."""
+        job.status = "running"
+        job.started_at = time.time()
+        logger.info("Starting ingest job %s for %s", job.id, job.file_name)
+        try:
+            job.progress = await ingest_csv(
+                str(job.file_path), on_progress=lambda p: setattr(job, "progress", p)
+            )
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Interrupted by shutdown"
+            logger.warning(
+                "Ingest job %s interrupted; resume it with "
+                "scripts/process_initial_data.py %s",
+                job.id,
+                job.file_path,
+            )
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            logger.error("Ingest job %s failed: %s", job.id, e)
+            # Nothing retries a failed job, so its upload would only pile up
+            job.file_path.unlink(missing_ok=True)
+            IngestCheckpoint(job.file_path).clear()
+        else:
+            job.status = "completed"
+            job.file_path.unlink(missing_ok=True)
+            logger.info("Ingest job %s completed", job.id)
+        finally:
+            job.finished_at = time.time()
+            self._prune()
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond ``history``."""
+        finished = [
+            job_id for job_id, job in self.jobs.items() if job.finished_at is not None
+        ]
+        for job_id in finished[: max(len(finished) - self.history, 0)]:
+            del self.jobs[job_id]
+
+
+settings = get_settings()
+ingest_jobs = IngestJobManager(
+    settings.INGEST_WORKERS, settings.INGEST_QUEUE_SIZE, settings.INGEST_JOB_HISTORY
+)
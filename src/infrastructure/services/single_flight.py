@@ -0,0 +1,84 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+from src.config.settings import get_settings
+from src.core.metrics import COALESCED_REQUESTS
+
+T = TypeVar("T")
+
+
+class _LeaderCancelled(Exception):
+    """The caller running a shared computation was cancelled before it finished."""
+
+
+class SingleFlight:
+    """
+    Shares one in-flight computation among concurrent callers with equal keys.
+
+    The first caller of a key (the leader) runs the computation inline, in
+    its own request task; callers arriving while it runs (followers) wait for
+    its result or exception instead of repeating the work. Nothing is kept
+    once the computation finishes, so this only collapses concurrent
+    duplicates.
+
+    A cancelled follower just stops waiting. A cancelled leader, such as one
+    whose client disconnected, abandons the computation and any partial work:
+    its followers then retry, the first of them becoming the new leader and
+    starting over. The computation is not detached from the leader because it
+    uses the leader's request-scoped resources, such as its database session,
+    which are released when the leader's request ends.
+    """
+
+    def __init__(self, name: str, enabled: bool = True):
+        self.name = name
+        self.enabled = enabled
+        self._calls: Dict[Hashable, asyncio.Future] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def run(self, key: Hashable, compute: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``compute``, or wait for the run already in flight for ``key``.
+
+        Args:
+            key: Normalized request; callers with equal keys share a result
+            compute: Coroutine function producing the result
+
+        Returns:
+            T: Result of the shared computation; callers must not mutate it
+        """
+        if not self.enabled:
+            return await compute()
+
+        while key in self._calls:
+            COALESCED_REQUESTS.inc(self.name, "follower")
+            try:
+                # Shielded, so a cancelled follower does not cancel the future
+                return await asyncio.shield(self._calls[key])
+            except _LeaderCancelled:
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        COALESCED_REQUESTS.inc(self.name, "leader")
+        try:
+            result = await compute()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            # Cancelled: followers must not fail with the leader's cancellation
+            future.set_exception(_LeaderCancelled())
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if future.done() and not future.cancelled():
+                # Mark the exception retrieved when no follower was waiting
+                future.exception()
+
+
+depth_range_flights = SingleFlight("by_depth", enabled=get_settings().COALESCE_REQUESTS)
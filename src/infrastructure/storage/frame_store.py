@@ -0,0 +1,336 @@
+"""
+Read-only, memory-mapped snapshot of the frame tables.
+
+A store directory holds one subdirectory per build and a ``CURRENT`` file
+naming the live one. Each build holds the frames and every depth pyramid
+level as ``.npy`` arrays ordered by (depth, id):
+
+    <version>/frames/{ids,depths,hashes,pixels,sorted_ids,id_positions}.npy
+    <version>/levels/<reduction>/<level>/{ids,depths,hashes,pixels}.npy
+
+Arrays are opened with ``mmap_mode="r"``, so every worker process shares the
+same page-cache pages instead of holding its own copy.
+"""
+import os
+import shutil
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import and_, func, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.database.codecs import LEGACY_DTYPE, decode_pixels
+from src.infrastructure.database.models import ImageLevelModel, ImageModel
+
+CURRENT_FILE = "CURRENT"
+HASH_DTYPE = "S32"
+
+
+@dataclass
+class FrameArrays:
+    """Rows of one table (or pyramid level) sorted by (depth, id)."""
+
+    ids: np.ndarray
+    depths: np.ndarray
+    hashes: np.ndarray
+    pixels: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def depth_range(
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> slice:
+        """
+        Locate rows with ``depth_min <= depth <= depth_max`` by binary search.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            limit: Maximum number of rows, None for the whole range
+            after: Keyset (depth, id) to continue after
+
+        Returns:
+            slice: Positions of the matching rows
+        """
+        start = int(np.searchsorted(self.depths, depth_min, side="left"))
+        stop = int(np.searchsorted(self.depths, depth_max, side="right"))
+        if after is not None:
+            after_depth, after_id = after
+            # Rows of equal depth are ordered by id
+            lo = int(np.searchsorted(self.depths, after_depth, side="left"))
+            hi = int(np.searchsorted(self.depths, after_depth, side="right"))
+            position = lo + int(np.searchsorted(self.ids[lo:hi], after_id, "right"))
+            start = max(start, position)
+        if limit is not None:
+            stop = min(stop, start + limit)
+        return slice(start, max(start, stop))
+
+    def content_hash(self, position: int) -> Optional[str]:
+        """Content hash of a row, None for rows stored without one."""
+        return self.hashes[position].decode("ascii") or None
+
+
+@dataclass
+class FrameStore:
+    """One build of the store: the frames and their pyramid levels."""
+
+    version: str
+    frames: FrameArrays
+    sorted_ids: np.ndarray
+    id_positions: np.ndarray
+    levels: Dict[Tuple[str, int], FrameArrays]
+
+    def positions(self, ids: np.ndarray) -> np.ndarray:
+        """
+        Map frame IDs to row positions.
+
+        Args:
+            ids: Frame IDs
+
+        Returns:
+            np.ndarray: Row position per ID, -1 for IDs not in the store
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if not len(self.sorted_ids):
+            return np.full(len(ids), -1, dtype=np.int64)
+        index = np.searchsorted(self.sorted_ids, ids)
+        index = np.minimum(index, len(self.sorted_ids) - 1)
+        found = self.sorted_ids[index] == ids
+        return np.where(found, self.id_positions[index], -1)
+
+
+def _load_arrays(directory: Path) -> FrameArrays:
+    return FrameArrays(
+        **{
+            name: np.load(directory / f"{name}.npy", mmap_mode="r")
+            for name in ("ids", "depths", "hashes", "pixels")
+        }
+    )
+
+
+def load_frame_store(directory: Path, version: str) -> FrameStore:
+    """
+    Memory-map one build of the store.
+
+    Args:
+        directory: Store directory
+        version: Build to open
+
+    Returns:
+        FrameStore: Memory-mapped arrays of the build
+    """
+    root = Path(directory) / version
+    frames = root / "frames"
+    levels = {}
+    for level_dir in sorted(root.glob("levels/*/*")):
+        levels[(level_dir.parent.name, int(level_dir.name))] = _load_arrays(level_dir)
+    return FrameStore(
+        version=version,
+        frames=_load_arrays(frames),
+        sorted_ids=np.load(frames / "sorted_ids.npy", mmap_mode="r"),
+        id_positions=np.load(frames / "id_positions.npy", mmap_mode="r"),
+        levels=levels,
+    )
+
+
+class FrameStoreLoader:
+    """
+    Opens the live build of a store and follows ``CURRENT`` on rebuilds.
+
+    The ``CURRENT`` file is read at most every ``check_interval`` seconds;
+    requests already holding the previous build keep reading it, as its
+    mappings stay valid after the files are replaced.
+    """
+
+    def __init__(self, directory: str, check_interval: float = 1.0):
+        self.directory = Path(directory)
+        self.check_interval = check_interval
+        self._store: Optional[FrameStore] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def get(self) -> FrameStore:
+        """
+        Get the live build, reopening it if ``CURRENT`` changed.
+
+        Returns:
+            FrameStore: Memory-mapped arrays of the live build
+
+        Raises:
+            FileNotFoundError: If the store has not been built
+        """
+        now = time.monotonic()
+        if self._store is not None and now - self._checked_at < self.check_interval:
+            return self._store
+        with self._lock:
+            version = (self.directory / CURRENT_FILE).read_text().strip()
+            if self._store is None or version != self._store.version:
+                self._store = load_frame_store(self.directory, version)
+            self._checked_at = now
+            return self._store
+
+
+async def _export_rows(
+    session: AsyncSession,
+    model,
+    condition,
+    directory: Path,
+    batch_size: int,
+) -> int:
+    """
+    Decode the rows of one table or pyramid level into ``.npy`` files.
+
+    Pixels are written straight into a memory-mapped file, so the export
+    needs memory for one batch rather than the whole table. Run it in a
+    snapshot transaction so the row count matches the rows read; rows
+    added meanwhile are otherwise left for the next build.
+
+    Args:
+        session: Database session
+        model: ImageModel or ImageLevelModel
+        condition: Filter selecting the rows, e.g. one pyramid level
+        directory: Output directory, created if missing
+        batch_size: Rows fetched per batch
+
+    Returns:
+        int: Number of exported rows
+
+    Raises:
+        ValueError: If rows have different widths
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    columns = (
+        model.id,
+        model.depth,
+        model.content_hash,
+        model.pixel_data,
+        model.dtype,
+        model.width,
+        model.codec,
+    )
+    count = (
+        await session.execute(select(func.count()).select_from(model).where(condition))
+    ).scalar()
+    dtypes = (
+        (await session.execute(select(model.dtype).where(condition).distinct()))
+        .scalars()
+        .all()
+    )
+    first = (
+        await session.execute(select(*columns).where(condition).limit(1))
+    ).one_or_none()
+    width = 0
+    if first is not None:
+        width = len(decode_pixels(first.pixel_data, first.dtype, None, first.codec))
+    dtype = np.result_type(*(dtype or LEGACY_DTYPE for dtype in dtypes), np.uint8)
+
+    ids = np.empty(count, dtype=np.int64)
+    depths = np.empty(count, dtype=np.float64)
+    hashes = np.empty(count, dtype=HASH_DTYPE)
+    pixels = np.lib.format.open_memmap(
+        directory / "pixels.npy", mode="w+", dtype=dtype, shape=(count, width)
+    )
+    query = (
+        select(*columns)
+        .where(condition)
+        .order_by(model.depth, model.id)
+        .execution_options(yield_per=batch_size)
+    )
+    result = await session.stream(query)
+    position = 0
+    try:
+        async for rows in result.partitions(batch_size):
+            for row in rows[: count - position]:
+                ids[position] = row.id
+                depths[position] = row.depth
+                hashes[position] = (row.content_hash or "").encode("ascii")
+                pixels[position] = decode_pixels(
+                    row.pixel_data, row.dtype, width, row.codec
+                )
+                position += 1
+    finally:
+        await result.close()
+
+    if position < count:
+        # Rows were deleted between counting and reading
+        trimmed = np.lib.format.open_memmap(
+            directory / "pixels.tmp.npy",
+            mode="w+",
+            dtype=dtype,
+            shape=(position, width),
+        )
+        trimmed[:] = pixels[:position]
+        trimmed.flush()
+        os.replace(directory / "pixels.tmp.npy", directory / "pixels.npy")
+    else:
+        pixels.flush()
+    np.save(directory / "ids.npy", ids[:position])
+    np.save(directory / "depths.npy", depths[:position])
+    np.save(directory / "hashes.npy", hashes[:position])
+    return position
+
+
+async def build_frame_store(
+    session: AsyncSession, directory: str, batch_size: int = 10000, keep: int = 2
+) -> str:
+    """
+    Export the frame tables into a new build and make it the live one.
+
+    Args:
+        session: Database session
+        directory: Store directory, created if missing
+        batch_size: Rows fetched per batch
+        keep: Number of builds to keep, including the new one
+
+    Returns:
+        str: Version of the new build
+    """
+    root = Path(directory)
+    root.mkdir(parents=True, exist_ok=True)
+    version = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    staging = root / f".{version}"
+    shutil.rmtree(staging, ignore_errors=True)
+
+    frames_dir = staging / "frames"
+    await _export_rows(session, ImageModel, true(), frames_dir, batch_size)
+    ids = np.load(frames_dir / "ids.npy")
+    order = np.argsort(ids, kind="stable")
+    np.save(frames_dir / "sorted_ids.npy", ids[order])
+    np.save(frames_dir / "id_positions.npy", order.astype(np.int64))
+
+    levels = await session.execute(
+        select(ImageLevelModel.reduction, ImageLevelModel.level).distinct()
+    )
+    for reduction, level in levels.all():
+        await _export_rows(
+            session,
+            ImageLevelModel,
+            and_(
+                ImageLevelModel.reduction == reduction,
+                ImageLevelModel.level == level,
+            ),
+            staging / "levels" / reduction / str(level),
+            batch_size,
+        )
+
+    os.replace(staging, root / version)
+    # Workers switch builds when CURRENT changes; replacing it is atomic
+    current = root / f".{CURRENT_FILE}"
+    current.write_text(version)
+    os.replace(current, root / CURRENT_FILE)
+
+    builds = sorted(path for path in root.iterdir() if path.is_dir())
+    for old in builds[: max(len(builds) - keep, 0)]:
+        if not old.name.startswith("."):
+            shutil.rmtree(old, ignore_errors=True)
+    return version
@@ -0,0 +1,308 @@
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from fastapi import status
+
+from src.config.settings import get_settings
+from src.core.exceptions import AppException, PayloadTooLargeError
+from src.core.metrics import stage
+from src.domain.entities.image import DepthIndex, FrameBatch, ImageFrame
+from src.domain.interfaces.repositories import FrameVersion, ImageRepository
+from src.domain.services.pyramid import Reduction
+from src.infrastructure.storage.frame_store import (
+    FrameArrays,
+    FrameStore,
+    FrameStoreLoader,
+)
+
+_loader: Optional[FrameStoreLoader] = None
+
+
+def get_frame_store() -> FrameStore:
+    """Get the live build of the store in ``FRAME_STORE_DIR``."""
+    global _loader
+    if _loader is None:
+        _loader = FrameStoreLoader(get_settings().FRAME_STORE_DIR)
+    return _loader.get()
+
+
+class MemoryMappedImageRepository(ImageRepository):
+    """
+    Read-only implementation of ImageRepository over a memory-mapped store.
+
+    Depth ranges are located with binary searches over the sorted depths and
+    frames share the mapped pixel rows without copying. The store is a
+    snapshot built by scripts/build_frame_store.py; frames written to the
+    database after the build are not visible until the next one.
+    """
+
+    def __init__(self, store: Optional[FrameStore] = None):
+        self.store = store if store is not None else get_frame_store()
+
+    @staticmethod
+    def _to_batch(arrays: FrameArrays, positions) -> FrameBatch:
+        """Batch of the selected rows, viewing the mapped arrays for slices."""
+        # Plain ndarray views, not np.memmap instances
+        return FrameBatch(
+            ids=np.asarray(arrays.ids[positions]),
+            depths=np.asarray(arrays.depths[positions]),
+            pixels=np.asarray(arrays.pixels[positions]),
+        )
+
+    async def save(self, image: ImageFrame) -> ImageFrame:
+        """
+        Reject the write: frames go to the database and reach the store by a rebuild.
+
+        Raises:
+            AppException: 409, the frame store is read-only
+        """
+        raise AppException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="The frame store is read-only; save frames to the database",
+        )
+
+    async def get_by_depth_range(
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[ImageFrame]:
+        """
+        Retrieve image frames within the specified depth range.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            limit: Maximum number of frames, None for the whole range
+            after: Keyset (depth, id) to continue after
+
+        Returns:
+            List[ImageFrame]: Matching frames ordered by depth
+        """
+        batch = await self.get_batch_by_depth_range(depth_min, depth_max, limit, after)
+        return batch.to_frames()
+
+    async def get_batch_by_depth_range(
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> FrameBatch:
+        """
+        Retrieve the frames of a depth range as one zero-copy batch.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            limit: Maximum number of frames, None for the whole range
+            after: Keyset (depth, id) to continue after
+
+        Returns:
+            FrameBatch: Matching frames ordered by depth
+        """
+        frames = self.store.frames
+        with stage("db_query"):
+            rows = frames.depth_range(depth_min, depth_max, limit, after)
+        return self._to_batch(frames, rows)
+
+    async def get_depth_index(
+        self,
+        depth_min: float,
+        depth_max: float,
+        limit: Optional[int] = None,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[FrameVersion]:
+        """
+        Retrieve IDs, depths and content hashes of a depth range, without pixels.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            limit: Maximum number of frames, None for the whole range
+            after: Keyset (depth, id) to continue after
+
+        Returns:
+            List[FrameVersion]: (id, depth, content_hash) ordered by depth
+        """
+        frames = self.store.frames
+        with stage("db_query"):
+            rows = frames.depth_range(depth_min, depth_max, limit, after)
+        hashes = [value.decode("ascii") or None for value in frames.hashes[rows]]
+        return list(
+            zip(frames.ids[rows].tolist(), frames.depths[rows].tolist(), hashes)
+        )
+
+    async def get_by_ids(self, ids: Sequence[int]) -> List[ImageFrame]:
+        """
+        Retrieve image frames by their IDs.
+
+        Args:
+            ids: Image frame IDs
+
+        Returns:
+            List[ImageFrame]: Matching image frames in no particular order
+        """
+        return (await self.get_batch_by_ids(ids)).to_frames()
+
+    async def get_batch_by_ids(self, ids: Sequence[int]) -> FrameBatch:
+        """
+        Retrieve image frames by their IDs as one batch.
+
+        Args:
+            ids: Image frame IDs
+
+        Returns:
+            FrameBatch: Matching frames ordered by ID
+        """
+        with stage("db_query"):
+            positions = self.store.positions(np.unique(np.asarray(ids, np.int64)))
+        return self._to_batch(self.store.frames, positions[positions >= 0])
+
+    async def get_color_variants(
+        self, ids: Sequence[int], color_map: str
+    ) -> FrameBatch:
+        """The store holds no color-mapped renditions; they are mapped on read."""
+        return FrameBatch(
+            ids=np.empty(0, dtype=np.int64),
+            depths=np.empty(0, dtype=np.float64),
+            pixels=np.empty((0, 0, 3), dtype=np.uint8),
+        )
+
+    def select_level(
+        self, depth_min: float, depth_max: float, rows: int, reduction: Reduction
+    ) -> int:
+        """
+        Pick the coarsest pyramid level that still has ``rows`` rows in a range.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            rows: Number of rows the caller needs
+            reduction: Pyramid reduction to look at
+
+        Returns:
+            int: Pyramid level, 0 meaning the full-resolution frames
+        """
+        levels = []
+        for (level_reduction, level), arrays in self.store.levels.items():
+            matching = arrays.depth_range(depth_min, depth_max)
+            if level_reduction == reduction and matching.stop - matching.start >= rows:
+                levels.append(level)
+        return max(levels, default=0)
+
+    async def get_by_depth_range_at_resolution(
+        self,
+        depth_min: float,
+        depth_max: float,
+        rows: int,
+        reduction: Reduction = "mean",
+        max_frames: Optional[int] = None,
+    ) -> FrameBatch:
+        """
+        Retrieve a depth range from the coarsest level holding at least ``rows``.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            rows: Number of rows the caller needs
+            reduction: Pyramid reduction to read from
+            max_frames: Most full-resolution frames to read when no level
+                holds ``rows`` rows
+
+        Returns:
+            FrameBatch: Matching frames, IDs referring to the level rows
+
+        Raises:
+            PayloadTooLargeError: If the range must be read at full resolution
+                and holds more than ``max_frames`` frames
+        """
+        with stage("db_query"):
+            level = self.select_level(depth_min, depth_max, rows, reduction)
+        if level == 0:
+            matching = self.store.frames.depth_range(depth_min, depth_max)
+            frames = matching.stop - matching.start
+            if max_frames is not None and frames > max_frames:
+                raise PayloadTooLargeError(
+                    detail=f"No pyramid level holds {rows} rows of this depth "
+                    f"range and its {frames} frames exceed {max_frames}"
+                )
+            return await self.get_batch_by_depth_range(depth_min, depth_max)
+        arrays = self.store.levels[(reduction, level)]
+        return self._to_batch(arrays, arrays.depth_range(depth_min, depth_max))
+
+    async def stream_by_depth_range(
+        self, depth_min: float, depth_max: float, batch_size: int
+    ) -> AsyncIterator[FrameBatch]:
+        """
+        Stream image frames within the specified depth range in batches.
+
+        Args:
+            depth_min: Minimum depth value
+            depth_max: Maximum depth value
+            batch_size: Number of frames per batch
+
+        Yields:
+            FrameBatch: Next batch of matching image frames
+        """
+        frames = self.store.frames
+        rows = frames.depth_range(depth_min, depth_max)
+        for start in range(rows.start, rows.stop, batch_size):
+            yield self._to_batch(
+                frames, slice(start, min(start + batch_size, rows.stop))
+            )
+
+    async def refresh_depth_index(
+        self, index: Optional[DepthIndex] = None
+    ) -> DepthIndex:
+        """
+        Get the depth index of the store's build, viewing its sorted depths.
+
+        Args:
+            index: Previously returned index
+
+        Returns:
+            DepthIndex: ``index`` if it belongs to the live build, else a new one
+        """
+        if index is not None and index.version == self.store.version:
+            return index
+        frames = self.store.frames
+        width = frames.pixels.shape[1]
+        return DepthIndex(
+            version=self.store.version,
+            depths=frames.depths,
+            pixel_offsets=np.arange(len(frames) + 1, dtype=np.int64) * width,
+        )
+
+    async def get_version(self, _id: int) -> Optional[FrameVersion]:
+        """
+        Retrieve the ID, depth and content hash of a frame, without pixels.
+
+        Args:
+            _id: Image frame ID
+
+        Returns:
+            Optional[FrameVersion]: (id, depth, content_hash) or None if the
+            frame does not exist
+        """
+        position = int(self.store.positions([_id])[0])
+        if position < 0:
+            return None
+        frames = self.store.frames
+        return _id, float(frames.depths[position]), frames.content_hash(position)
+
+    async def get_by_id(self, _id: int) -> Optional[ImageFrame]:
+        """
+        Retrieve an image frame by its ID.
+
+        Args:
+            _id: Image frame ID
+
+        Returns:
+            Optional[ImageFrame]: Matching image frame or None
+        """
+        positions = self.store.positions([_id])
+        if positions[0] < 0:
+            return None
+        return self._to_batch(self.store.frames, positions).to_frames()[0]
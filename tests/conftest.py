@@ -0,0 +1,11 @@
+import atexit
+import os
+import shutil
+import tempfile
+
+# Tests never touch the configured database: modules importing
+# src.config.database get a throwaway SQLite file instead
+_database_dir = tempfile.mkdtemp(prefix="frames-tests-")
+atexit.register(shutil.rmtree, _database_dir, ignore_errors=True)
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_database_dir}/test.db"
+os.environ["DEBUG"] = "false"
@@ -0,0 +1,29 @@
+import asyncio
+
+import pytest
+
+from benchmarks.synthetic import write_csv
+from src.config.database import engine
+from src.infrastructure.database.schema import create_schema
+from src.infrastructure.services.csv_ingest import ingest_csv
+
+# Synthetic frames start at DEPTH_START and are DEPTH_STEP apart
+SEEDED_FRAMES = 2000
+SEEDED_WIDTH = 16
+
+
+async def _seed(csv_path):
+    async with engine.begin() as connection:
+        await connection.run_sync(create_schema)
+    await ingest_csv(str(csv_path), target_width=SEEDED_WIDTH)
+    # Pooled connections belong to this event loop; the app opens its own
+    await engine.dispose()
+
+
+@pytest.fixture(scope="session", autouse=True)
+def seeded_frames(tmp_path_factory):
+    """Ingest synthetic frames, with their depth pyramid, into the test database."""
+    csv_path = write_csv(
+        tmp_path_factory.mktemp("seed") / "frames.csv", SEEDED_FRAMES, SEEDED_WIDTH
+    )
+    asyncio.run(_seed(csv_path))
@@ -0,0 +1,22 @@
+from src.api.etags import etag_matches, frames_etag
+
+VERSIONS = [(1, 9000.1, "00" * 16), (2, 9000.2, "11" * 16)]
+
+
+def test_etag_depends_on_representation_and_frames():
+    etag = frames_etag("application/json", "viridis", VERSIONS)
+
+    assert etag == frames_etag("application/json", "viridis", VERSIONS)
+    assert etag != frames_etag("image/png", "viridis", VERSIONS)
+    assert etag != frames_etag("application/json", "turbo", VERSIONS)
+    assert etag != frames_etag("application/json", "viridis", VERSIONS[:1])
+    assert frames_etag("application/json", "viridis", [(3, 1.0, None)]) is None
+
+
+def test_if_none_match():
+    etag = frames_etag("application/json", "viridis", VERSIONS)
+
+    assert etag_matches(etag, f'"other", W/{etag}')
+    assert etag_matches(etag, "*")
+    assert not etag_matches(etag, '"other"')
+    assert not etag_matches(etag, None)
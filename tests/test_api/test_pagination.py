@@ -0,0 +1,17 @@
+import pytest
+
+from src.api.pagination import decode_cursor, encode_cursor
+from src.core.exceptions import AppException
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(9000.123456789, 42)
+
+    assert decode_cursor(cursor) == (9000.123456789, 42)
+
+
+def test_invalid_cursor_is_rejected():
+    with pytest.raises(AppException) as exc_info:
+        decode_cursor("not-a-cursor")
+
+    assert exc_info.value.status_code == 400
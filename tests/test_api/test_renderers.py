@@ -0,0 +1,132 @@
+import io
+import json
+
+import numpy as np
+import pytest
+
+from src.api.renderers import (
+    FRAME_HEADER,
+    JSON_MEDIA_TYPE,
+    NPY_MEDIA_TYPE,
+    OCTET_STREAM_MEDIA_TYPE,
+    PNG_MEDIA_TYPE,
+    encode_float_json,
+    encode_rgb_json,
+    frames_to_json,
+    frames_to_npy,
+    negotiate_media_type,
+    pack_frames,
+    render_frames,
+    render_lookup,
+)
+from src.api.schemas import ImageResponse
+from src.core.exceptions import AppException
+from src.infrastructure.services.frame_cache import ColoredFrame
+
+IDS = np.array([1, 2])
+DEPTHS = np.array([9000.1, 9000.2])
+RGB = np.arange(2 * 4 * 3, dtype=np.uint8).reshape(2, 4, 3)
+FRAMES = [ColoredFrame(int(i), float(d), rgb) for i, d, rgb in zip(IDS, DEPTHS, RGB)]
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        (None, JSON_MEDIA_TYPE),
+        ("*/*", JSON_MEDIA_TYPE),
+        ("application/octet-stream", OCTET_STREAM_MEDIA_TYPE),
+        ("application/json;q=0.5, application/x-npy", NPY_MEDIA_TYPE),
+        ("text/html, image/*;q=0.8", PNG_MEDIA_TYPE),
+    ],
+)
+def test_negotiate_media_type(accept, expected):
+    assert negotiate_media_type(accept) == expected
+
+
+def test_negotiate_media_type_not_acceptable():
+    with pytest.raises(AppException) as exc_info:
+        negotiate_media_type("text/html")
+    assert exc_info.value.status_code == 406
+
+
+def test_pack_frames_layout():
+    payload = pack_frames(IDS, DEPTHS, RGB)
+    magic, _, channels, n_frames, width = FRAME_HEADER.unpack_from(payload)
+    offset = FRAME_HEADER.size
+
+    ids = np.frombuffer(payload, dtype="<i8", count=n_frames, offset=offset)
+    offset += ids.nbytes
+    depths = np.frombuffer(payload, dtype="<f8", count=n_frames, offset=offset)
+    offset += depths.nbytes
+    pixels = np.frombuffer(payload, dtype=np.uint8, offset=offset)
+
+    assert (magic, channels, n_frames, width) == (b"FRMS", 3, 2, 4)
+    assert np.array_equal(ids, IDS)
+    assert np.array_equal(depths, DEPTHS)
+    assert np.array_equal(pixels.reshape(n_frames, width, channels), RGB)
+
+
+def test_frames_to_npy_round_trip():
+    records = np.load(io.BytesIO(frames_to_npy(IDS, DEPTHS, RGB)))
+
+    assert np.array_equal(records["id"], IDS)
+    assert np.array_equal(records["depth"], DEPTHS)
+    assert np.array_equal(records["pixels"], RGB)
+
+
+def test_render_png():
+    response = render_frames(PNG_MEDIA_TYPE, FRAMES)
+
+    assert response.media_type == PNG_MEDIA_TYPE
+    assert response.body.startswith(b"\x89PNG")
+    assert response.headers["X-Frame-Count"] == "2"
+
+
+def test_render_json_matches_response_model():
+    response = render_frames(JSON_MEDIA_TYPE, FRAMES[:1], many=False)
+
+    assert response.body == (
+        b'{"id":1,"depth":9000.1,'
+        b'"pixels":{"data":[[0,1,2],[3,4,5],[6,7,8],[9,10,11]]}}'
+    )
+
+
+def test_encode_rgb_json_matches_json_module():
+    rgb = np.random.default_rng(0).integers(0, 256, (3, 5, 3), dtype=np.uint8)
+
+    encoded = encode_rgb_json(rgb)
+    assert [json.loads(frame) for frame in encoded] == rgb.tolist()
+    assert encoded[0] == json.dumps(rgb[0].tolist(), separators=(",", ":")).encode()
+
+
+def test_frames_to_json_handles_mixed_widths_and_non_finite_depths():
+    frames = [
+        ColoredFrame(1, float("nan"), RGB[0]),
+        ColoredFrame(2, float("inf"), RGB[1][:2]),
+    ]
+
+    entries = json.loads(frames_to_json(frames))
+    assert [entry["depth"] for entry in entries] == [None, None]
+    assert entries[1]["pixels"]["data"] == RGB[1][:2].tolist()
+
+
+@pytest.mark.parametrize("depth", [9000.1, 5.0, 1e-7, 1e16, -0.0])
+def test_encode_float_json_matches_pydantic(depth):
+    frame = ImageResponse.from_raw_data(_id=1, depth=depth, pixels=RGB[0][:0])
+
+    assert encode_float_json(depth) == json.dumps(depth).encode()
+    assert frame.model_dump_json() == (
+        '{"id":1,"depth":%s,"pixels":{"data":[]}}'
+        % encode_float_json(depth, exponent="pydantic").decode()
+    )
+
+
+def test_render_lookup_keeps_request_order_and_marks_missing():
+    found = {frame.id: frame for frame in FRAMES}
+    response = render_lookup([2, 7, 1], found)
+
+    entries = json.loads(response.body)
+    assert [entry["id"] for entry in entries] == [2, 7, 1]
+    assert [entry["found"] for entry in entries] == [True, False, True]
+    assert entries[1]["frame"] is None
+    assert entries[0]["frame"]["depth"] == 9000.2
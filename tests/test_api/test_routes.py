@@ -1,9 +1,20 @@
+import io
+import json
+
+import numpy as np
+import pytest
 from fastapi.testclient import TestClient
 
 from main import app
+from src.api.renderers import FRAME_HEADER, FRAME_MAGIC
+from src.config.settings import get_settings
+from tests.test_api.conftest import SEEDED_WIDTH
 
 client = TestClient(app)
 
+# The first 50 seeded frames, 9000.0 to 9004.9
+RANGE = {"depth_min": 9000.0, "depth_max": 9004.95, "color_map": "viridis"}
+
 
 def test_get_frames_by_depth():
     response = client.post(
@@ -18,3 +29,214 @@ def test_get_frames_by_depth():
         assert "id" in data[0]
         assert "depth" in data[0]
         assert "pixels" in data[0]
+
+
+def test_get_frames_by_depth_as_packed_frames():
+    response = client.post(
+        "/api/v1/frames/by-depth",
+        json=RANGE,
+        headers={"Accept": "application/octet-stream"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/octet-stream"
+    assert response.headers["vary"] == "Accept"
+    magic, _, channels, n_frames, width = FRAME_HEADER.unpack_from(response.content)
+    assert (magic, channels, n_frames, width) == (FRAME_MAGIC, 3, 50, SEEDED_WIDTH)
+    assert len(response.content) == FRAME_HEADER.size + n_frames * (16 + width * 3)
+
+
+def test_get_frames_by_depth_as_npy():
+    response = client.post(
+        "/api/v1/frames/by-depth",
+        json=RANGE,
+        headers={"Accept": "application/json;q=0.5, application/x-npy"},
+    )
+
+    assert response.status_code == 200
+    records = np.load(io.BytesIO(response.content))
+    assert len(records) == 50
+    assert records["pixels"].shape[1:] == (SEEDED_WIDTH, 3)
+    assert np.all(np.diff(records["depth"]) > 0)
+
+
+def test_get_frames_by_depth_not_acceptable():
+    response = client.post(
+        "/api/v1/frames/by-depth", json=RANGE, headers={"Accept": "text/csv"}
+    )
+
+    assert response.status_code == 406
+
+
+def test_stream_frames_by_depth_as_ndjson(monkeypatch):
+    # Several cursor batches make up the one stream
+    monkeypatch.setattr(get_settings(), "STREAM_BATCH_SIZE", 20)
+
+    response = client.post(
+        "/api/v1/frames/by-depth",
+        json=RANGE,
+        headers={"Accept": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    frames = [json.loads(line) for line in response.text.splitlines()]
+    assert len(frames) == 50
+    assert [frame["depth"] for frame in frames] == sorted(
+        frame["depth"] for frame in frames
+    )
+    assert len(frames[0]["pixels"]["data"]) == SEEDED_WIDTH
+
+
+def test_stream_of_an_empty_range_is_not_found():
+    response = client.post(
+        "/api/v1/frames/by-depth",
+        json={"depth_min": 0.0, "depth_max": 1.0, "color_map": "viridis"},
+        headers={"Accept": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 404
+
+
+def test_current_copy_of_a_depth_range_is_not_modified():
+    response = client.post("/api/v1/frames/by-depth", json=RANGE)
+    etag = response.headers["etag"]
+
+    response = client.post(
+        "/api/v1/frames/by-depth", json=RANGE, headers={"If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+    assert response.content == b""
+
+    # Another color map or representation is another resource
+    response = client.post(
+        "/api/v1/frames/by-depth",
+        json={**RANGE, "color_map": "magma"},
+        headers={"If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    response = client.post(
+        "/api/v1/frames/by-depth",
+        json=RANGE,
+        headers={"If-None-Match": etag, "Accept": "application/octet-stream"},
+    )
+    assert response.status_code == 200
+
+
+def test_current_copy_of_a_frame_is_not_modified():
+    frame_id = client.post("/api/v1/frames/by-depth", json=RANGE).json()[0]["id"]
+    response = client.get(f"/api/v1/frames/{frame_id}")
+    etag = response.headers["etag"]
+
+    response = client.get(
+        f"/api/v1/frames/{frame_id}", headers={"If-None-Match": f'"other", {etag}'}
+    )
+    assert response.status_code == 304
+
+
+def test_get_frames_by_ids_keeps_request_order():
+    frames = client.post("/api/v1/frames/by-depth", json=RANGE).json()
+    first, second = frames[0], frames[1]
+
+    response = client.post(
+        "/api/v1/frames/by-ids",
+        json={"ids": [second["id"], -1, first["id"], second["id"]]},
+    )
+
+    assert response.status_code == 200
+    lookups = response.json()
+    assert [lookup["id"] for lookup in lookups] == [
+        second["id"],
+        -1,
+        first["id"],
+        second["id"],
+    ]
+    assert [lookup["found"] for lookup in lookups] == [True, False, True, True]
+    assert lookups[1]["frame"] is None
+    assert lookups[0]["frame"] == lookups[3]["frame"]
+    assert lookups[2]["frame"]["depth"] == first["depth"]
+
+
+def test_get_frames_by_ids_rejects_an_empty_batch():
+    response = client.post("/api/v1/frames/by-ids", json={"ids": []})
+
+    assert response.status_code == 422
+
+
+def test_count_frames_by_depth():
+    params = {"depth_min": RANGE["depth_min"], "depth_max": RANGE["depth_max"]}
+    response = client.get("/api/v1/frames/count", params=params)
+
+    assert response.status_code == 200
+    estimate = response.json()
+    assert estimate["frames"] == 50
+    assert estimate["first_depth"] == pytest.approx(9000.0)
+    assert estimate["last_depth"] == pytest.approx(9004.9)
+    assert estimate["rgb_bytes"] == 50 * SEEDED_WIDTH * 3
+    assert response.headers["x-frame-count"] == "50"
+
+    response = client.head("/api/v1/frames/count", params=params)
+    assert response.status_code == 200
+    assert response.content == b""
+    assert response.headers["x-estimated-bytes"] == str(50 * SEEDED_WIDTH * 3)
+
+
+def test_empty_depth_range_is_not_found():
+    response = client.post(
+        "/api/v1/frames/by-depth",
+        json={"depth_min": 0.0, "depth_max": 1.0, "color_map": "viridis"},
+    )
+
+    assert response.status_code == 404
+
+
+def test_rows_above_the_budget_are_rejected(monkeypatch):
+    monkeypatch.setattr(get_settings(), "RANGE_MAX_FRAMES", 100)
+    whole_range = {**RANGE, "depth_max": 9500.0}
+
+    response = client.post("/api/v1/frames/by-depth", json={**whole_range, "rows": 101})
+    assert response.status_code == 413
+
+    # Read from a pyramid level instead of all 2000 frames
+    response = client.post("/api/v1/frames/by-depth", json={**whole_range, "rows": 100})
+    assert response.status_code == 200
+    assert len(response.json()) == 100
+
+
+def test_full_resolution_fallback_above_the_budget_is_rejected(monkeypatch):
+    monkeypatch.setattr(get_settings(), "RANGE_MAX_FRAMES", 100)
+    # 150 frames, while level 1 only holds 75 rows
+    response = client.post(
+        "/api/v1/frames/by-depth",
+        json={**RANGE, "depth_max": 9014.95, "rows": 90},
+    )
+
+    assert response.status_code == 413
+
+
+def test_rows_need_a_built_pyramid_reduction():
+    response = client.post(
+        "/api/v1/frames/by-depth", json={**RANGE, "rows": 10, "reduction": "max"}
+    )
+
+    assert response.status_code == 422
+
+
+def test_render_respects_the_budget(monkeypatch):
+    monkeypatch.setattr(get_settings(), "RANGE_MAX_FRAMES", 100)
+    params = {"depth_min": 9000.0, "depth_max": 9500.0}
+
+    response = client.get("/api/v1/frames/render", params=params)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "image/png"
+    assert int(response.headers["x-frame-count"]) <= 100
+
+    response = client.get("/api/v1/frames/render", params={**params, "height": 101})
+    assert response.status_code == 413
+    response = client.get(
+        "/api/v1/frames/render",
+        params={"depth_min": 9000.0, "depth_max": 9014.95, "height": 90},
+    )
+    assert response.status_code == 413
@@ -0,0 +1,28 @@
+from src.core.metrics import Histogram, profile_request, stage
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency.", (0.1, 1.0), ("route",))
+    for value in (0.05, 0.5, 5.0):
+        histogram.observe(value, "/frames")
+
+    assert histogram.render()[2:] == [
+        'latency_seconds_bucket{route="/frames",le="0.1"} 1',
+        'latency_seconds_bucket{route="/frames",le="1.0"} 2',
+        'latency_seconds_bucket{route="/frames",le="+Inf"} 3',
+        'latency_seconds_sum{route="/frames"} 5.55',
+        'latency_seconds_count{route="/frames"} 3',
+    ]
+
+
+def test_stages_are_collected_for_profiled_requests():
+    with profile_request() as profile:
+        with stage("db_query"):
+            pass
+        with stage("db_query"):
+            pass
+
+    assert list(profile) == ["db_query"]
+    with stage("decode"):
+        pass
+    assert "decode" not in profile
@@ -0,0 +1,52 @@
+import asyncio
+import logging
+
+from src.core.middleware import LoggingMiddleware
+
+
+def _app(status: int):
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": status, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    return app
+
+
+def _call(middleware: LoggingMiddleware) -> None:
+    scope = {"type": "http", "method": "GET", "path": "/api/v1/frames/1"}
+
+    async def receive():
+        return {"type": "http.request"}
+
+    async def send(message):
+        pass
+
+    asyncio.run(middleware(scope, receive, send))
+
+
+def _unsampled(status: int) -> LoggingMiddleware:
+    middleware = LoggingMiddleware(_app(status))
+    middleware.access_log_sample_rate = 0.0
+    middleware.slow_request_seconds = 60.0
+    return middleware
+
+
+def test_unsampled_requests_are_not_logged(caplog):
+    with caplog.at_level(logging.INFO, logger="src.core.middleware"):
+        _call(_unsampled(200))
+
+    assert not caplog.records
+
+
+def test_server_errors_and_slow_requests_are_always_logged(caplog):
+    slow = _unsampled(200)
+    slow.slow_request_seconds = 0.0
+    with caplog.at_level(logging.INFO, logger="src.core.middleware"):
+        _call(_unsampled(503))
+        _call(slow)
+
+    assert [record.levelno for record in caplog.records] == [logging.WARNING] * 2
+    assert caplog.records[0].getMessage() == (
+        "Response: GET /api/v1/frames/1 Status: 503 Duration: "
+        f"{caplog.records[0].args[-1]:.3f}s"
+    )
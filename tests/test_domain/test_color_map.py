@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from matplotlib import colormaps
+
+from src.domain.services.color_map import COLOR_MAPS, CustomColorMap, get_lut
+
+
+def reference_apply(name, pixel_data):
+    colored = colormaps[name](pixel_data.astype(float) / 255.0)
+    return (colored[..., :3] * 255).astype(np.uint8)
+
+
+@pytest.mark.parametrize("name", COLOR_MAPS)
+def test_lut_matches_matplotlib(name):
+    pixels = np.arange(256, dtype=np.float64)
+    result = CustomColorMap(name).apply(pixels)
+
+    diff = np.abs(result.astype(int) - reference_apply(name, pixels).astype(int))
+    assert result.dtype == np.uint8
+    assert diff.max() <= 1
+
+
+@pytest.mark.parametrize("name", COLOR_MAPS)
+def test_float_input_matches_matplotlib(name):
+    pixels = np.random.default_rng(0).uniform(-5, 260, size=20000)
+    pixels[:256] = np.arange(256) * 255 / 256
+    result = CustomColorMap(name).apply(pixels)
+
+    diff = np.abs(result.astype(int) - reference_apply(name, pixels).astype(int))
+    assert diff.max() <= 1
+
+
+def test_apply_batch_shape():
+    frames = np.random.default_rng(0).uniform(0, 255, size=(4, 150))
+    result = CustomColorMap("turbo").apply(frames)
+
+    assert result.shape == (4, 150, 3)
+    assert np.array_equal(result[2], CustomColorMap("turbo").apply(frames[2]))
+
+
+def test_nan_and_out_of_domain_values():
+    lut = get_lut("viridis")
+    result = CustomColorMap("viridis").apply(np.array([np.nan, -10.0, 300.0]))
+
+    assert np.array_equal(result[0], [0, 0, 0])
+    assert np.array_equal(result[1], lut[0])
+    assert np.array_equal(result[2], lut[255])
+
+
+def test_lut_is_cached_and_read_only():
+    assert get_lut("magma") is get_lut("magma")
+    assert not get_lut("magma").flags.writeable
+    with pytest.raises(ValueError):
+        get_lut("not-a-colormap")
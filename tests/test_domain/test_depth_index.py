@@ -0,0 +1,36 @@
+import numpy as np
+
+from src.domain.entities.image import DepthIndex
+
+
+def test_counts_bounds_and_pixels_of_a_range():
+    index = DepthIndex.build(3, np.array([3.0, 1.0, 2.0]), np.array([30, 10, 20]))
+
+    assert index.count(1.5, 3.0) == 2
+    assert index.bounds(1.5, 3.0) == (2.0, 3.0)
+    assert index.pixels(1.5, 3.0) == 50
+    assert index.count(4.0, 5.0) == 0
+    assert index.bounds(4.0, 5.0) is None
+    assert index.count(3.0, 1.0) == 0
+
+
+def test_extend_merges_added_frames():
+    index = DepthIndex.build(2, np.array([1.0, 3.0]), np.array([10, 10]))
+    extended = index.extend(3, np.array([2.0]), np.array([40]))
+
+    assert extended.version == 3
+    assert extended.depths.tolist() == [1.0, 2.0, 3.0]
+    assert extended.pixels(2.0, 3.0) == 50
+    assert len(index) == 2
+
+
+def test_extend_matches_a_full_build():
+    rng = np.random.default_rng(0)
+    depths = rng.integers(0, 50, 300).astype(np.float64)
+    widths = rng.integers(1, 100, 300)
+    index = DepthIndex.build(1, depths[:200], widths[:200])
+
+    extended = index.extend(2, depths[200:], widths[200:])
+    built = DepthIndex.build(2, depths, widths)
+    assert np.array_equal(extended.depths, built.depths)
+    assert np.array_equal(extended.pixel_offsets, built.pixel_offsets)
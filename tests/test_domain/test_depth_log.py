@@ -0,0 +1,18 @@
+import numpy as np
+
+from src.domain.services.color_map import CustomColorMap
+from src.domain.services.depth_log import render_depth_log
+
+
+def test_render_depth_log_shape():
+    pixels = np.random.default_rng(0).uniform(0, 255, size=(1000, 150))
+
+    assert render_depth_log(pixels, CustomColorMap()).shape == (1000, 150, 3)
+    assert render_depth_log(pixels, CustomColorMap(), height=100, width=50).shape == (
+        100,
+        50,
+        3,
+    )
+    assert render_depth_log(
+        pixels, CustomColorMap(), height=10, method="area"
+    ).shape == (10, 150, 3)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.domain.services.pyramid import bin_rows, build_pyramid, downsample_by_two
+
+
+def test_downsample_by_two_odd_rows():
+    depths = np.array([1.0, 2.0, 3.0])
+    pixels = np.array([[0.0, 10.0], [20.0, 30.0], [40.0, 50.0]])
+
+    binned_depths, binned_pixels = downsample_by_two(depths, pixels)
+
+    assert np.array_equal(binned_depths, [1.5, 3.0])
+    assert np.array_equal(binned_pixels, [[10.0, 20.0], [40.0, 50.0]])
+    assert np.array_equal(downsample_by_two(depths, pixels, "max")[1][0], [20, 30])
+
+
+def test_build_pyramid_levels():
+    depths = np.arange(1000, dtype=float)
+    pixels = np.random.default_rng(0).uniform(0, 255, size=(1000, 8))
+
+    levels = list(build_pyramid(depths, pixels, max_levels=20))
+
+    assert [level for level, _, _ in levels] == list(range(1, 11))
+    assert [len(level_depths) for _, level_depths, _ in levels][:3] == [500, 250, 125]
+    assert levels[-1][2].shape == (1, 8)
+
+
+def test_bin_rows_to_a_row_count():
+    depths = np.arange(10, dtype=float)
+    pixels = np.arange(20, dtype=np.uint8).reshape(10, 2)
+
+    starts, binned_depths, binned_pixels = bin_rows(depths, pixels, 4)
+
+    assert starts.tolist() == [0, 2, 5, 7]
+    assert binned_depths.tolist() == [0.5, 3.0, 5.5, 8.0]
+    assert binned_pixels[1].tolist() == [6.0, 7.0]
+    assert bin_rows(depths, pixels, 4, "max")[2][1].tolist() == [8, 9]
+    assert bin_rows(depths, pixels, 20)[2] is pixels
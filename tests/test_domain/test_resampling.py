@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from src.domain.entities.image import FrameBatch, ImageFrame
+from src.domain.services.resampling import RESAMPLE_METHODS, resample, resample_weights
+
+MATRIX = np.random.default_rng(0).uniform(0, 255, size=(3, 200))
+
+
+def test_linear_matches_np_interp():
+    expected = np.stack(
+        [np.interp(np.linspace(0, 199, 150), np.arange(200), row) for row in MATRIX]
+    )
+
+    assert np.allclose(resample(MATRIX, 150), expected)
+
+
+@pytest.mark.parametrize("method", RESAMPLE_METHODS)
+@pytest.mark.parametrize("target_size", [17, 150, 400])
+def test_methods_preserve_constants(method, target_size):
+    result = resample(np.full((2, 200), 42.0), target_size, method)
+
+    assert result.shape == (2, target_size)
+    assert np.allclose(result, 42.0)
+
+
+def test_area_averages_whole_bins():
+    assert np.array_equal(resample(np.arange(8.0), 4, "area"), [0.5, 2.5, 4.5, 6.5])
+
+
+def test_resample_along_depth_axis():
+    assert resample(MATRIX, 10, "lanczos", axis=0).shape == (10, 200)
+
+
+def test_weights_are_cached():
+    assert resample_weights(200, 150, "area") is resample_weights(200, 150, "area")
+
+
+def test_frame_batch_matches_per_frame_resize():
+    batch = FrameBatch(depths=np.arange(3.0), pixels=MATRIX).resize(150)
+    frames = [ImageFrame(depth=0.0, pixel_data=row).resize(150) for row in MATRIX]
+
+    assert np.allclose(batch.pixels, np.stack([f.pixel_data for f in frames]))
+    assert [frame.depth for frame in batch.to_frames()] == [0.0, 1.0, 2.0]
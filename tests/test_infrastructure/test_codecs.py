@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from src.infrastructure.database.codecs import (
+    decode_pixel_rows,
+    decode_pixels,
+    encode_pixels,
+)
+
+PIXELS = np.array([0.0, 12.4, 12.6, 254.9, 300.0, np.nan])
+
+
+def test_uint8_round_trip_zlib():
+    encoded = encode_pixels(PIXELS, "uint8", "zlib")
+    decoded = decode_pixels(
+        encoded["pixel_data"], encoded["dtype"], encoded["width"], encoded["codec"]
+    )
+
+    assert decoded.dtype == np.uint8
+    assert decoded.tolist() == [0, 12, 13, 255, 255, 0]
+
+
+def test_float16_keeps_nan():
+    encoded = encode_pixels(PIXELS, "float16", "raw")
+    decoded = decode_pixels(encoded["pixel_data"], "float16", 6, "raw")
+
+    assert len(encoded["pixel_data"]) == 12
+    assert np.isnan(decoded[-1])
+    assert not decoded.flags.writeable
+
+
+def test_legacy_rows_decode_as_float64():
+    assert np.array_equal(decode_pixels(PIXELS[:5].tobytes()), PIXELS[:5])
+
+
+def test_width_mismatch():
+    with pytest.raises(ValueError):
+        decode_pixels(bytes(10), "uint8", 12, "raw")
+
+
+def test_content_hash_ignores_codec():
+    raw = encode_pixels(PIXELS, "uint8", "raw")
+    compressed = encode_pixels(PIXELS, "uint8", "zlib")
+
+    assert raw["content_hash"] == compressed["content_hash"]
+    assert raw["content_hash"] != encode_pixels(PIXELS, "float16")["content_hash"]
+
+
+def _stored(pixels, dtype, codec):
+    encoded = encode_pixels(pixels, dtype, codec)
+    return encoded["pixel_data"], dtype, encoded["width"], codec
+
+
+def test_rows_decode_into_one_matrix():
+    rows = [_stored(PIXELS, "uint8", "zlib"), _stored(PIXELS[::-1], "uint8", "raw")]
+    matrix = decode_pixel_rows(rows)
+
+    assert matrix.shape == (2, 6)
+    assert matrix.dtype == np.uint8
+    assert matrix[1].tolist() == [0, 255, 255, 13, 12, 0]
+
+
+def test_mixed_row_dtypes_are_widened():
+    rows = [_stored(PIXELS, "uint8", "raw"), (PIXELS.tobytes(), None, None, None)]
+    matrix = decode_pixel_rows(rows)
+
+    assert matrix.dtype == np.float64
+    assert matrix[0, 1] == 12
+    assert np.isnan(matrix[1, -1])
+
+
+def test_rows_of_different_widths():
+    with pytest.raises(ValueError):
+        decode_pixel_rows(
+            [_stored(PIXELS, "uint8", "raw"), _stored(PIXELS[:5], "uint8", "raw")]
+        )
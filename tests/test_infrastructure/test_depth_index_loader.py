@@ -0,0 +1,33 @@
+import asyncio
+
+import numpy as np
+
+from src.domain.entities.image import DepthIndex
+from src.infrastructure.services.depth_index import DepthIndexLoader
+
+
+class RecordingRepository:
+    """Records whether each refresh was incremental or a full read."""
+
+    def __init__(self):
+        self.refreshes = []
+
+    async def refresh_depth_index(self, index=None):
+        self.refreshes.append("full" if index is None else "incremental")
+        return DepthIndex.build(len(self.refreshes), np.array([1.0]), np.array([1]))
+
+
+def test_index_is_read_in_full_every_reload_interval_and_on_reload():
+    loader = DepthIndexLoader(check_interval=0.0, reload_interval=3600.0)
+    repository = RecordingRepository()
+
+    async def main():
+        await loader.get(repository)
+        await loader.get(repository)
+        loader.reload()
+        await loader.get(repository)
+        loader.reload_interval = 0.0
+        await loader.get(repository)
+
+    asyncio.run(main())
+    assert repository.refreshes == ["full", "incremental", "full", "full"]
@@ -0,0 +1,24 @@
+import numpy as np
+import pytest
+
+from src.domain.services.color_map import CustomColorMap
+from src.infrastructure.services.executor import ProcessingExecutor
+
+
+@pytest.mark.parametrize("backend", ["inline", "thread", "process"])
+async def test_backends_match_inline_color_map(backend):
+    executor = ProcessingExecutor(backend, pool_size=2, inline_cutoff=0)
+    frames = [np.random.default_rng(i).uniform(0, 255, 150) for i in range(20)]
+    try:
+        rgb = await executor.apply_color_map("turbo", frames)
+    finally:
+        executor.shutdown()
+
+    assert np.array_equal(rgb, CustomColorMap("turbo").apply(np.stack(frames)))
+
+
+async def test_run_below_cutoff_stays_inline():
+    executor = ProcessingExecutor("thread", pool_size=2, inline_cutoff=100)
+
+    assert await executor.run(sum, [1, 2], work_size=10) == 3
+    assert executor._threads is None
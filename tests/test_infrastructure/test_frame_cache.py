@@ -0,0 +1,43 @@
+import numpy as np
+import pytest
+
+from src.infrastructure.services.frame_cache import ColoredFrame, FrameCache
+
+
+def make_frame(frame_id, width=10):
+    return ColoredFrame(
+        id=frame_id, depth=float(frame_id), rgb=np.zeros((width, 3), np.uint8)
+    )
+
+
+def test_lru_eviction_by_bytes():
+    cache = FrameCache(max_bytes=90)
+    for frame_id in range(3):
+        cache.put((frame_id, "viridis"), make_frame(frame_id))
+    cache.get((0, "viridis"))
+    cache.put((3, "viridis"), make_frame(3))
+
+    assert cache.get((1, "viridis")) is None
+    assert cache.get((0, "viridis")) is not None
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["bytes"] == 90
+
+
+def test_invalidate_all_color_maps_of_a_frame():
+    cache = FrameCache(max_bytes=1000)
+    cache.put((1, "viridis"), make_frame(1))
+    cache.put((1, "turbo"), make_frame(1))
+    cache.put((2, "turbo"), make_frame(2))
+    cache.invalidate([1])
+
+    assert cache.get((1, "viridis")) is None
+    assert cache.get((1, "turbo")) is None
+    assert cache.get((2, "turbo")) is not None
+
+
+def test_cached_arrays_are_read_only():
+    cache = FrameCache(max_bytes=1000)
+    frame = cache.put((1, "viridis"), make_frame(1))
+
+    with pytest.raises(ValueError):
+        frame.rgb[0, 0] = 1
@@ -0,0 +1,54 @@
+import asyncio
+
+import numpy as np
+
+from src.domain.entities.image import FrameBatch
+from src.domain.services.color_map import CustomColorMap
+from src.infrastructure.services.executor import ProcessingExecutor
+from src.infrastructure.services.frame_cache import FrameCache
+from src.infrastructure.services.frame_reader import CachedFrameReader
+
+
+def make_batch(ids, pixels):
+    return FrameBatch(
+        ids=np.array(ids, dtype=np.int64),
+        depths=np.array(ids, dtype=np.float64),
+        pixels=pixels,
+    )
+
+
+class StubRepository:
+    """Frames 1-3 in the database, with a stored magma rendition of 1 and 2."""
+
+    pixels = np.arange(12, dtype=np.uint8).reshape(3, 4) * 20
+
+    def __init__(self):
+        self.decoded = []
+
+    async def get_color_variants(self, ids, color_map):
+        stored = [i for i in ids if i in (1, 2)]
+        rgb = CustomColorMap(color_map).apply(self.pixels[[i - 1 for i in stored]])
+        return make_batch(stored, rgb)
+
+    async def get_batch_by_ids(self, ids):
+        self.decoded.extend(ids)
+        found = [i for i in ids if i in (1, 2, 3)]
+        return make_batch(found, self.pixels[[i - 1 for i in found]])
+
+
+def test_stored_renditions_are_served_without_decoding():
+    repository = StubRepository()
+    reader = CachedFrameReader(
+        repository,
+        cache=FrameCache(max_bytes=10_000),
+        executor=ProcessingExecutor("inline", pool_size=1, inline_cutoff=0),
+        materialized_color_maps=["magma"],
+    )
+
+    frames = asyncio.run(reader.get_by_ids([1, 2, 3, 4], "magma"))
+
+    assert repository.decoded == [3, 4]
+    assert 4 not in frames
+    expected = CustomColorMap("magma").apply(repository.pixels)
+    for frame_id in (1, 2, 3):
+        np.testing.assert_array_equal(frames[frame_id].rgb, expected[frame_id - 1])
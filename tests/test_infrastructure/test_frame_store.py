@@ -0,0 +1,85 @@
+import asyncio
+
+import numpy as np
+import pytest
+
+from src.core.exceptions import AppException, PayloadTooLargeError
+from src.infrastructure.storage.frame_store import (
+    CURRENT_FILE,
+    HASH_DTYPE,
+    FrameStoreLoader,
+)
+from src.infrastructure.storage.repositories import MemoryMappedImageRepository
+
+
+def write_build(root, version, depths, ids):
+    """Write a minimal store build with one pixel column holding the ID."""
+    frames = root / version / "frames"
+    frames.mkdir(parents=True)
+    ids = np.array(ids, dtype=np.int64)
+    order = np.argsort(ids)
+    np.save(frames / "ids.npy", ids)
+    np.save(frames / "depths.npy", np.array(depths, dtype=np.float64))
+    np.save(frames / "hashes.npy", np.array([b"%032d" % i for i in ids], HASH_DTYPE))
+    np.save(frames / "pixels.npy", ids.astype(np.uint8)[:, np.newaxis])
+    np.save(frames / "sorted_ids.npy", ids[order])
+    np.save(frames / "id_positions.npy", order)
+    (root / CURRENT_FILE).write_text(version)
+
+
+def test_depth_range_pages_by_depth_then_id(tmp_path):
+    # Frames 7 and 3 share a depth and are ordered by id
+    write_build(tmp_path, "v1", [1.0, 2.0, 2.0, 3.0], [5, 3, 7, 1])
+    repository = MemoryMappedImageRepository(FrameStoreLoader(tmp_path).get())
+
+    index = asyncio.run(repository.get_depth_index(1.5, 3.0, limit=2))
+    assert [row[0] for row in index] == [3, 7]
+    index = asyncio.run(repository.get_depth_index(1.5, 3.0, after=(2.0, 3)))
+    assert [row[0] for row in index] == [7, 1]
+    frames = asyncio.run(repository.get_by_depth_range(0.0, 1.5))
+    assert [frame.pixel_data.tolist() for frame in frames] == [[5]]
+
+
+def test_lookup_by_id(tmp_path):
+    write_build(tmp_path, "v1", [1.0, 2.0, 3.0], [10, 30, 20])
+    repository = MemoryMappedImageRepository(FrameStoreLoader(tmp_path).get())
+
+    frames = asyncio.run(repository.get_by_ids([20, 99, 10, 20]))
+    assert sorted(frame.id for frame in frames) == [10, 20]
+    assert asyncio.run(repository.get_version(30)) == (30, 2.0, "%032d" % 30)
+    assert asyncio.run(repository.get_by_id(99)) is None
+
+
+def test_full_resolution_fallback_respects_the_budget(tmp_path):
+    # The build has no pyramid levels, so every read is at full resolution
+    write_build(tmp_path, "v1", [1.0, 2.0, 3.0], [1, 2, 3])
+    repository = MemoryMappedImageRepository(FrameStoreLoader(tmp_path).get())
+
+    batch = asyncio.run(
+        repository.get_by_depth_range_at_resolution(0.0, 5.0, 2, max_frames=3)
+    )
+    assert batch.ids.tolist() == [1, 2, 3]
+    with pytest.raises(PayloadTooLargeError):
+        asyncio.run(
+            repository.get_by_depth_range_at_resolution(0.0, 5.0, 2, max_frames=2)
+        )
+
+
+def test_save_is_rejected(tmp_path):
+    write_build(tmp_path, "v1", [1.0], [1])
+    repository = MemoryMappedImageRepository(FrameStoreLoader(tmp_path).get())
+
+    frame = asyncio.run(repository.get_by_id(1))
+    with pytest.raises(AppException) as excinfo:
+        asyncio.run(repository.save(frame))
+    assert excinfo.value.status_code == 409
+
+
+def test_loader_follows_rebuilds(tmp_path):
+    write_build(tmp_path, "v1", [1.0], [1])
+    loader = FrameStoreLoader(tmp_path, check_interval=0)
+    assert loader.get().version == "v1"
+
+    write_build(tmp_path, "v2", [1.0, 2.0], [1, 2])
+    assert loader.get().version == "v2"
+    assert len(loader.get().frames) == 2
@@ -0,0 +1,36 @@
+import asyncio
+
+from src.infrastructure.services.csv_ingest import IngestCheckpoint
+from src.infrastructure.services.ingest_jobs import IngestJobManager
+
+
+async def run_jobs(manager, paths):
+    await manager.start()
+    jobs = [manager.submit(path, path.name) for path in paths]
+    await manager._queue.join()
+    await manager.stop()
+    return jobs
+
+
+def test_failed_job_removes_its_upload(tmp_path):
+    path = tmp_path / "upload.csv"
+    path.write_text("not,a\nframe,file\n")
+    IngestCheckpoint(path).save(0)
+
+    [job] = asyncio.run(run_jobs(IngestJobManager(1, 4), [path]))
+
+    assert job.status == "failed"
+    assert job.error
+    assert not path.exists()
+    assert not IngestCheckpoint(path).path.exists()
+
+
+def test_only_recent_finished_jobs_are_kept(tmp_path):
+    paths = [tmp_path / f"upload-{i}.csv" for i in range(3)]
+    for path in paths:
+        path.write_text("not,a\nframe,file\n")
+    manager = IngestJobManager(1, 4, history=2)
+
+    jobs = asyncio.run(run_jobs(manager, paths))
+
+    assert list(manager.jobs) == [job.id for job in jobs[1:]]
@@ -0,0 +1,26 @@
+from sqlalchemy import create_engine, inspect, text
+
+from src.infrastructure.database.schema import create_schema
+
+
+def test_create_schema_replaces_the_depth_index():
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        # Baseline table with its single-column depth index
+        connection.execute(
+            text(
+                "CREATE TABLE image_frames "
+                "(id INTEGER PRIMARY KEY, depth FLOAT NOT NULL, pixel_data BLOB)"
+            )
+        )
+        connection.execute(
+            text("CREATE INDEX ix_image_frames_depth ON image_frames (depth)")
+        )
+
+        create_schema(connection)
+        create_schema(connection)
+
+        indexes = {
+            index["name"] for index in inspect(connection).get_indexes("image_frames")
+        }
+    assert indexes == {"ix_image_frames_depth_id"}
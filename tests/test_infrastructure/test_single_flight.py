@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from src.core.metrics import COALESCED_REQUESTS
+from src.infrastructure.services.single_flight import SingleFlight
+
+
+def test_concurrent_callers_share_one_computation():
+    flights = SingleFlight("test_share")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def main():
+        return await asyncio.gather(*(flights.run("key", compute) for _ in range(5)))
+
+    results = asyncio.run(main())
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert COALESCED_REQUESTS.value("test_share", "leader") == 1
+    assert COALESCED_REQUESTS.value("test_share", "follower") == 4
+    assert not len(flights)
+
+
+def test_followers_receive_the_leaders_exception():
+    flights = SingleFlight("test_error")
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def main():
+        return await asyncio.gather(
+            *(flights.run("key", compute) for _ in range(3)), return_exceptions=True
+        )
+
+    assert [type(result) for result in asyncio.run(main())] == [ValueError] * 3
+
+
+def test_follower_takes_over_when_the_leader_is_cancelled():
+    flights = SingleFlight("test_cancel")
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def main():
+        leader = asyncio.create_task(flights.run("key", compute))
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(flights.run("key", compute))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == 2
+    assert not len(flights)